@@ -0,0 +1,194 @@
+"""Synthetic corpus of consultation reports for benchmarks
+
+The reports follow `templates/consultation-report.schema.json` and draw their roles, request types
+and communication platforms from the vocabularies of `cr_gui.constants`. Consultants and experts
+are affiliated with the center abbreviations stored by real reports (`center_abbreviations`). They
+pass `reporting lint` and `reporting validate`, and are reproducible for a given seed.
+
+    $ python benchmarks/corpus.py --size 10000 --destination .cache/benchmarks/corpus-10000
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import argparse
+import datetime
+import json
+import random
+import sys
+
+#: External modules, libraries
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+#: Internal modules, libraries
+from cr_analysis._constants import center_abbreviations
+from cr_gui.constants import (
+    available_communication_platforms,
+    consultation_roles,
+    consulting_types
+)
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Ticket number of the first report, the filenames start with the ticket number
+FIRST_TICKET = 100000
+
+#-- Increase whenever the generated reports change, older corpora are generated again
+CORPUS_VERSION = 2
+
+#-- File in the corpus directory describing the corpus, see `generating_corpus`
+MARKER_FILE = "corpus.json"
+
+#-- Years of the generated end dates
+YEARS = (2020, 2021, 2022, 2023, 2024)
+
+WORKLOAD_CATEGORIES = ("communication", "preparation", "teaching", "execution", "decision", "other")
+
+TAGS = (
+    "Python", "C++", "Fortran", "Julia", "R", "MATLAB", "Git", "GitLab CI", "Docker", "Singularity",
+    "CMake", "Conda", "pytest", "Sphinx", "Documentation", "Licensing", "Sustainability", "HPC",
+    "MPI", "CUDA", "Jupyter", "FAIR", "Onboarding", "Code review", "Packaging", "Testing",
+)
+
+TECHNOLOGIES = ("GitLab", "GitHub", "Jupyter", "Docker", "Mattermost", "Zenodo", "ReadTheDocs", "Sphinx")
+
+CLIENT_INSTITUTES = (
+    "Institute of Applied Physics, Berlin",
+    "Climate Research Group, Hamburg",
+    "Center for Structural Biology, Heidelberg",
+    "Laboratory for Materials, Dresden",
+    "Department of Geosciences, Potsdam",
+)
+
+ADJECTIVES = ("Adaptive", "Blue", "Coupled", "Deep", "Fast", "Global", "Hybrid", "Open", "Quantum", "Sparse")
+NOUNS = ("Ocean", "Solver", "Pipeline", "Toolkit", "Simulation", "Archive", "Model", "Workflow", "Atlas", "Engine")
+NAMES = ("Ada", "Alan", "Grace", "Emmy", "Carl", "Lise", "Max", "Marie", "Niels", "Rosalind", "Kurt", "Hedy")
+SURNAMES = ("Lovelace", "Turing", "Hopper", "Noether", "Gauss", "Meitner", "Planck", "Curie", "Bohr", "Franklin")
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class ReportDumper(yaml.SafeDumper):
+    """Dumper writing indented sequences, as required by the yamllint configuration"""
+
+    def increase_indent(self, flow=False, indentless=False):
+        return super().increase_indent(flow, False)
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def generating_person(generator: random.Random, affiliations) -> dict:
+    return {
+        "name": f"{generator.choice(NAMES)} {generator.choice(SURNAMES)}",
+        "affiliation": generator.choice(affiliations),
+    }
+
+#--
+def generating_workload(generator: random.Random) -> dict:
+    """Workload distribution in steps of 5 %, adding up to 100"""
+    cuts = sorted(generator.randint(0, 20) for _ in range(len(WORKLOAD_CATEGORIES) - 1))
+    shares = [upper - lower for lower, upper in zip([0, *cuts], [*cuts, 20])]
+    return {category: 5 * share for category, share in zip(WORKLOAD_CATEGORIES, shares)}
+
+#--
+def generating_report(number: int, generator: random.Random) -> tuple:
+    """Filename and content of the synthetic report with the ticket number `number`"""
+    name = f"{generator.choice(ADJECTIVES)} {generator.choice(NOUNS)} {number}"
+    end_date = datetime.date(generator.choice(YEARS), 1, 1) + datetime.timedelta(days=generator.randrange(365))
+    start_date = end_date - datetime.timedelta(days=generator.randint(1, 400))
+    estimated = generator.randint(1, 30)
+
+    report = {
+        "zammad_ticket_number": number,
+        "ticket_link": f"https://support.hifis.net/#ticket/zoom/{number}",
+        "project_name": name,
+        "project_website": f"https://example.org/{name.replace(' ', '-').lower()}",
+        "client_other_resources": [f"https://gitlab.example.org/project-{number}"],
+        "consultants": [generating_person(generator, center_abbreviations) for _ in range(generator.randint(1, 2))],
+        "experts": [generating_person(generator, center_abbreviations) for _ in range(generator.randint(0, 2))],
+        "clients": [generating_person(generator, CLIENT_INSTITUTES) for _ in range(generator.randint(1, 3))],
+        "used_consultation_roles": generator.sample(consultation_roles, generator.randint(1, len(consultation_roles))),
+        "start_date": start_date,
+        "end_date": end_date,
+        "survey_sent": generator.randint(0, 2),
+        "estimated_workload": estimated,
+        "final_workload": round(estimated * generator.uniform(0.5, 2.0), 1),
+        "workload_percentage_distribution": generating_workload(generator),
+        "internal_consulting_resources": [f"https://gitlab.example.org/consulting/report-{number}"],
+        "tags": generator.sample(TAGS, generator.randint(1, 8)),
+        "request_types": generator.sample(consulting_types, generator.randint(1, 4)),
+        "communication_platforms": generator.sample(available_communication_platforms, generator.randint(1, 3)),
+        "used_technologies": generator.sample(TECHNOLOGIES, generator.randint(0, 3)),
+        "used_consulting_resources": ["https://example.org/handbook"],
+        "other_identified_problems": [],
+        "remarks": f"Synthetic report {number} for benchmarks.",
+    }
+    filename = f"{number}_{name.title().replace(' ', '')}.yml"
+
+    return filename, report
+
+#--
+def generating_corpus(destination: Path, size: int, seed: int = 0) -> Path:
+    """Write `size` synthetic reports into `destination`, reusing a complete corpus of the same version, size and seed"""
+    destination = Path(destination)
+    marker = {"version": CORPUS_VERSION, "size": size, "seed": seed}
+    marker_file = destination / MARKER_FILE
+    try:
+        with open(marker_file, "r", encoding="utf-8") as file:
+            complete = json.load(file) == marker
+    except (OSError, ValueError):
+        complete = False
+    if complete and sum(1 for _ in destination.glob("*.yml")) == size:
+        return destination
+
+    destination.mkdir(parents=True, exist_ok=True)
+    marker_file.unlink(missing_ok=True)
+    for stale in destination.glob("*.yml"):
+        stale.unlink()
+
+    generator = random.Random(seed)
+    for number in range(FIRST_TICKET, FIRST_TICKET + size):
+        filename, report = generating_report(number, generator)
+        with open(destination / filename, "w", encoding="utf-8") as file:
+            yaml.dump(
+                report,
+                file,
+                Dumper=ReportDumper,
+                explicit_start=True,
+                sort_keys=False,
+                allow_unicode=True,
+                width=100
+            )
+
+    #-- Written last, an interrupted run is generated again
+    with open(marker_file, "w", encoding="utf-8") as file:
+        json.dump(marker, file)
+
+    return destination
+
+#--
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Number of reports, e.g. 1000, 10000 or 100000.")
+    parser.add_argument("--destination", type=Path, default=None, help="Default: .cache/benchmarks/corpus-<size>")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args()
+
+    destination = options.destination or ROOT / ".cache" / "benchmarks" / f"corpus-{options.size}"
+    generating_corpus(destination, options.size, seed=options.seed)
+    print(f"{options.size} reports in {destination}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Import and start-up time of the `reporting` subcommands
+
+Every command is run `--repeat` times in a fresh interpreter with `python -X importtime`.
+The best wall time, the total import time and the heavy libraries imported by the command
+are printed per command.
+
+    $ python benchmarks/import_time.py --repeat 5
+    $ python benchmarks/import_time.py --limit 1.0   # non-zero exit code if a command is slower
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+ROOT = Path(__file__).resolve().parents[1]
+
+#-- Libraries whose import time dominates the start-up
+HEAVY_MODULES = ('pandas', 'numpy', 'plotly', 'jsonschema', 'yamllint', 'pyarrow', 'streamlit')
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def listing_commands(report: Path, destination: Path) -> dict:
+    """Command lines of the benchmarked subcommands, working on the single `report`"""
+    return {
+        'help': ['--help'],
+        'lint': ['lint', '--reports', str(report), '--no-cache'],
+        'validate': ['validate', '--reports', str(report), '--no-cache'],
+        'check': ['check', '--reports', str(report)],
+        'analysis': ['analysis', '--reports', str(report), '--no-cache'],
+        'plot': ['plot', '--reports', str(report), '--no-cache', '--destination', str(destination)],
+    }
+
+#--
+def running_command(arguments: list) -> tuple:
+    """Run `reporting` once.
+
+    :returns: the wall time, the total import time in seconds and the imported top-level packages.
+    """
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(
+        path for path in (str(ROOT / 'src'), environment.get('PYTHONPATH')) if path
+    )
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'cr_cli', *arguments],
+        cwd=ROOT,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False
+    )
+    wall_time = time.perf_counter() - start
+
+    import_time = 0
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        packages.add(name.strip().split('.')[0])
+        #-- Only the top-level imports, the nested ones are part of their cumulative time
+        if not name.startswith('   '):
+            import_time += int(cumulative)
+
+    return wall_time, import_time / 1e6, packages
+
+#--
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per command, the best run is reported.')
+    parser.add_argument('--report', type=Path, default=ROOT / 'reports' / '56083_BlairWitchProject.yml')
+    parser.add_argument('--limit', type=float, default=None, help='Maximum wall time in seconds of `help` and `lint`.')
+    parser.add_argument('commands', nargs='*', help='Commands to benchmark, by default all.')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        commands = listing_commands(options.report.resolve(), Path(directory) / 'reports.html')
+        selected = options.commands or list(commands)
+
+        print(f"{'command':<10} {'wall [s]':>9} {'imports [s]':>12}  heavy libraries")
+        too_slow = []
+        for command in selected:
+            runs = [running_command(commands[command]) for _ in range(options.repeat)]
+            wall_time, import_time, packages = min(runs, key=lambda run: run[0])
+            heavy = ', '.join(module for module in HEAVY_MODULES if module in packages) or '-'
+            print(f"{command:<10} {wall_time:>9.3f} {import_time:>12.3f}  {heavy}")
+
+            if options.limit is not None and command in ('help', 'lint') and wall_time > options.limit:
+                too_slow.append(command)
+
+    if too_slow:
+        print(f"Slower than {options.limit} s: {', '.join(too_slow)}")
+        return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
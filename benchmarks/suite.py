@@ -0,0 +1,251 @@
+"""Benchmarks of the loader, validator, linter, KPIs and HTML plot on synthetic corpora
+
+Every benchmark runs `--repeat` times on a synthetic corpus of each `--sizes` (see `corpus.py`),
+by default 1k, 10k and 100k reports, without the on-disk caches and in a single process, and the
+best time is kept. The times are compared against the stored baselines of `baselines.json`, a
+benchmark slower than its baseline by more than `--tolerance` and by more than `MIN_SLACK`
+(50 ms) is a regression and gives a non-zero exit code. Sizes or benchmarks without baseline
+are reported, but not compared.
+
+The `memory` check loads each corpus with and without `--compact` and fails unless the compact
+dataframe retains less memory (measured with tracemalloc) than the normal one.
+
+    $ python benchmarks/suite.py                        # 1k, 10k and 100k reports
+    $ python benchmarks/suite.py --sizes 1000 --only load kpi
+    $ python benchmarks/suite.py --update               # record new baselines
+
+The baselines depend on the machine, record them again after changing it. The 100k corpus takes
+about 400 MB of disk and, on a single core, the full suite runs for about an hour, mostly linting:
+use `--sizes`, `--only` and `--repeat 1` for quick checks during development.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from contextlib import redirect_stdout
+from importlib.util import find_spec
+from pathlib import Path
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+#: Internal modules, libraries
+from corpus import generating_corpus
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+CORPUS_DIRECTORY = ROOT / ".cache" / "benchmarks"
+SCHEMA_FILE = ROOT / "templates" / "consultation-report.schema.json"
+LINTER_CONFIG = ROOT / ".yamllint.yml"
+
+#-- Corpus sizes checked by default
+SIZES = [1000, 10000, 100000]
+
+#-- Allowed slowdown relative to the baseline, 0.5 = 50 % slower
+TOLERANCE = 0.5
+
+#-- Allowed slowdown in seconds regardless of the tolerance: benchmarks of a few milliseconds
+#-- vary by more than 50 % with the scheduler, the garbage collector and the CPU frequency
+MIN_SLACK = 0.05
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def listing_benchmarks(reports: Path) -> dict:
+    """Benchmarks on the corpus `reports`, by name.
+
+    A benchmark is a pair of an untimed setup and the timed function, called with the result of the setup.
+    """
+    from cr_analysis._kpi import KPIResult
+    from cr_analysis._module_linting import reports_linting
+    from cr_analysis._module_validation import reports_validation
+    from cr_analysis._utils import (
+        counting_affiliations,
+        counting_main_types,
+        counting_occurrence,
+        loading_yaml_to_dataframe,
+        preparing_data,
+        tickets_per_month,
+        workload_distribution
+    )
+
+    #-- The KPIs work on the loaded and prepared reports of all years, as in `loading_data`
+    loaded = {}
+
+    def dataframe():
+        if 'dataframe' not in loaded:
+            loaded['dataframe'] = preparing_data(loading_yaml_to_dataframe(reports), year=None, center='all')
+        return loaded['dataframe']
+
+    def nothing():
+        return None
+
+    benchmarks = {
+        'load': (nothing, lambda _: loading_yaml_to_dataframe(reports)),
+        'validate': (nothing, lambda _: reports_validation(reports, schema_file=SCHEMA_FILE)),
+        'lint': (nothing, lambda _: reports_linting(reports, linter_config=LINTER_CONFIG)),
+        'kpi.affiliations': (dataframe, lambda df: counting_affiliations(df, 'consultants', add='experts')),
+        'kpi.occurrence': (dataframe, lambda df: counting_occurrence(df, 'tags')),
+        'kpi.main_types': (dataframe, counting_main_types),
+        'kpi.workload': (dataframe, workload_distribution),
+        'kpi.months': (dataframe, tickets_per_month),
+    }
+
+    if find_spec("plotly") is not None:
+        from cr_gui.ui_plot import plot_html_analysis
+
+        destination = Path(tempfile.mkdtemp()) / "reports.html"
+        #-- A fresh `KPIResult` per run, otherwise the memoized KPIs would be timed
+        benchmarks['plot'] = (dataframe, lambda df: plot_html_analysis(
+            destination=destination,
+            kpis=KPIResult(reports=reports, year=None, center='all', dataframe=df)
+        ))
+
+    return benchmarks
+
+#--
+def timing(benchmark: tuple, repeat: int) -> float:
+    """Best wall time of `repeat` runs of a benchmark, in seconds; its output is discarded"""
+    setup, function = benchmark
+    argument = setup()
+
+    best = float('inf')
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function(argument)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+#--
+def measuring_memory(reports: Path, compact: bool) -> int:
+    """Memory in bytes retained by the loaded and prepared reports, see `loading_data`"""
+    from cr_analysis._utils import loading_yaml_to_dataframe, preparing_data
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        dataframe = preparing_data(loading_yaml_to_dataframe(reports), year=None, center='all', compact=compact)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    del dataframe
+    return retained
+
+#--
+def checking_memory(reports: Path) -> bool:
+    """Print the memory of the normal and the compact representation; returns whether compact is not smaller"""
+    from cr_analysis._utils import loading_yaml_to_dataframe, preparing_data
+
+    #-- Warm up the imports and the table of interned strings untraced, they would be counted otherwise
+    preparing_data(loading_yaml_to_dataframe(reports), year=None, center='all', compact=True)
+
+    normal = measuring_memory(reports, compact=False)
+    compact = measuring_memory(reports, compact=True)
+    regressed = compact >= normal
+    verdict = "REGRESSION" if regressed else "ok"
+    print(f"  {'memory':<18} {compact / 2**20:9.2f} MiB compact, {normal / 2**20:.2f} MiB normal   {verdict}")
+    return regressed
+
+#--
+def loading_baselines(baseline_file: Path) -> dict:
+    if not baseline_file.is_file():
+        return {}
+    with open(baseline_file, "r", encoding="utf-8") as file:
+        return json.load(file).get('sizes', {})
+
+#--
+def saving_baselines(baseline_file: Path, baselines: dict) -> None:
+    content = {
+        'machine': f"{platform.system()} {platform.machine()}, Python {platform.python_version()}",
+        'sizes': {
+            size: {name: round(seconds, 5) for name, seconds in times.items()}
+            for size, times in baselines.items()
+        },
+    }
+    with open(baseline_file, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+#--
+def comparing(name: str, seconds: float, baseline: float | None, tolerance: float) -> bool:
+    """Print the time of a benchmark against its baseline; returns whether it regressed"""
+    if baseline is None:
+        print(f"  {name:<18} {seconds:9.4f} s   (no baseline)")
+        return False
+
+    change = seconds / baseline - 1 if baseline > 0 else 0.0
+    regressed = seconds > baseline * (1 + tolerance) and seconds - baseline > MIN_SLACK
+    verdict = "REGRESSION" if regressed else "ok"
+    print(f"  {name:<18} {seconds:9.4f} s   baseline {baseline:9.4f} s   {change:+7.1%}   {verdict}")
+    return regressed
+
+#--
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="Corpus sizes, by default 1000 10000 100000.")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark, the best one counts.")
+    parser.add_argument('--only', nargs='+', default=None, help="Benchmarks to run, by name or prefix, e.g. kpi.")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="Allowed slowdown, 0.5 = 50 %%.")
+    parser.add_argument('--baselines', type=Path, default=BASELINE_FILE)
+    parser.add_argument('--update', action='store_true', help="Store the measured times as new baselines.")
+    options = parser.parse_args()
+
+    baselines = loading_baselines(options.baselines)
+    regressions = []
+
+    for size in options.sizes:
+        reports = generating_corpus(CORPUS_DIRECTORY / f"corpus-{size}", size)
+        benchmarks = listing_benchmarks(reports)
+        if options.only:
+            benchmarks = {
+                name: benchmark for name, benchmark in benchmarks.items()
+                if any(name == only or name.startswith(f"{only}.") for only in options.only)
+            }
+
+        print(f"{size} reports:")
+        known = baselines.get(str(size), {})
+        measured = {}
+        for name, benchmark in benchmarks.items():
+            measured[name] = timing(benchmark, options.repeat)
+            if not options.update and comparing(name, measured[name], known.get(name), options.tolerance):
+                regressions.append(f"{name} ({size} reports)")
+        if not options.update and (not options.only or 'memory' in options.only) and checking_memory(reports):
+            regressions.append(f"memory ({size} reports)")
+        if options.update:
+            for name, seconds in measured.items():
+                print(f"  {name:<18} {seconds:9.4f} s")
+
+        baselines[str(size)] = {**known, **measured}
+
+    if options.update:
+        saving_baselines(options.baselines, baselines)
+        print(f"Baselines stored in {options.baselines}")
+        return 0
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+
+    print("No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,54 @@
 #: Std. libraries, modules
+from importlib import import_module as _import_module
 from typing import Tuple as _Tuple
 
 #: Internal libraries, modules
-from ._module_linting import reports_linting
-from ._module_validation import reports_validation
-from ._module_analysis import reports_analysis
+#-- Imported on first access, so that e.g. linting does not import pandas
+_SYMBOL_MODULES = {
+    'reports_linting': '._module_linting',
+    'reports_validation': '._module_validation',
+    'reports_analysis': '._module_analysis',
+    'reports_batch_analysis': '._module_analysis',
+    'reports_store': '._module_store',
+    'reports_check': '._module_check',
+    'loading_data': '._utils',
+    'streaming_reports': '._utils',
+    'streaming_data': '._utils',
+    'KPIResult': '._kpi',
+    'StreamingKPIResult': '._kpi',
+    'KPIState': '._state',
+    'aggregating_reports': '._state',
+    'filtering_centers': '._tables',
+    'grouping_centers': '._tables',
+}
 
-from ._utils import (
-    loading_data
-)
+def __getattr__(name: str):
+    if name not in _SYMBOL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(_import_module(_SYMBOL_MODULES[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_SYMBOL_MODULES))
 
 #: specifying importable symbols
 __all__: _Tuple[str, ...] = (
     'reports_linting',
     'reports_validation',
     'reports_analysis',
+    'reports_batch_analysis',
+    'reports_store',
+    'reports_check',
     'loading_data',
+    'streaming_reports',
+    'streaming_data',
+    'KPIResult',
+    'StreamingKPIResult',
+    'KPIState',
+    'aggregating_reports',
+    'filtering_centers',
+    'grouping_centers',
 )
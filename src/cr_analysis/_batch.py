@@ -0,0 +1,190 @@
+"""Groupby based KPIs for many (year, center) combinations at once"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: External modules, libraries
+import pandas
+
+#: Internal modules, libraries
+from ._constants import month_names
+from ._tables import (
+    affiliation_table,
+    exploding_people,
+    exploding_values,
+    flattening_mappings,
+    mapping_columns
+)
+from ._utils import classifying_request_types
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+GROUP_KEYS = ['year', 'center']
+BATCH_COLUMNS = GROUP_KEYS + ['kpi', 'key', 'value']
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def membership_table(
+    dataframe: pandas.DataFrame,
+    years=None,
+    centers=None,
+    role: str = 'lead'
+) -> pandas.DataFrame:
+    """Assignment of the reports to (year, center) groups.
+
+    Every report belongs to the center 'all' and to the centers of its affiliations in
+    the given `role`, the year is the year of `end_date` (the start date, see `preparing_data`).
+
+    :returns: dataframe with the columns `row` (row label in `dataframe`), `year` and `center`.
+    """
+    years_of_reports = dataframe['end_date'].dt.year
+
+    overall = pandas.DataFrame({
+        'row': dataframe.index,
+        'year': years_of_reports.to_numpy(),
+        'center': 'all',
+    })
+
+    affiliations = affiliation_table(dataframe, role=role).dropna()
+    per_center = pandas.DataFrame({
+        'row': affiliations.index,
+        'year': years_of_reports.loc[affiliations.index].to_numpy(),
+        'center': affiliations.astype(str).to_numpy(),
+    }).drop_duplicates()
+
+    membership = pandas.concat([overall, per_center], ignore_index=True)
+
+    if years is not None:
+        membership = membership[membership['year'].isin(years)]
+    if centers is not None:
+        membership = membership[membership['center'].isin(list(centers) + ['all'])]
+
+    return membership.reset_index(drop=True)
+
+#--
+def joining_groups(membership: pandas.DataFrame, values) -> pandas.DataFrame:
+    """Join per-report values (indexed by the row labels) to their (year, center) groups"""
+    values = values.rename_axis('row').reset_index()
+    return membership.merge(values, on='row')
+
+#--
+def sharing_grouped(membership: pandas.DataFrame, items: pandas.Series, kpi: str) -> pandas.DataFrame:
+    """Relative occurrence of the long format `items` within each group"""
+    frame = joining_groups(membership, items.astype(str).rename('key'))
+    counts = frame.groupby(GROUP_KEYS + ['key'], sort=True).size()
+    shares = counts / counts.groupby(level=GROUP_KEYS).transform('sum')
+
+    result = shares.rename('value').reset_index()
+    result['kpi'] = kpi
+
+    return result[BATCH_COLUMNS]
+
+#--
+def scalar_grouped(membership: pandas.DataFrame, values: pandas.Series, kpi: str, how: str) -> pandas.DataFrame:
+    """Aggregate a per-report value within each group"""
+    frame = joining_groups(membership, values.rename('key'))
+    result = frame.groupby(GROUP_KEYS, sort=True)['key'].agg(how).rename('value').reset_index()
+    result['kpi'] = kpi
+    result['key'] = ''
+
+    return result[BATCH_COLUMNS]
+
+#--
+def batch_kpis(
+    dataframe: pandas.DataFrame,
+    years=None,
+    centers=None,
+    role: str = 'lead'
+) -> pandas.DataFrame:
+    """All KPIs of the analysis for every (year, center) combination in one pass.
+
+    Counting KPIs are given relative to their group, as printed by `reports_analysis`.
+
+    :param dataframe: Reports of all years, as loaded by `loading_data(year=None, center='all')`.
+    :param years: Years to include, by default all years.
+    :param centers: Centers to include, by default all centers. The center 'all' is always included.
+    :param role: Role of the center in a report, see `filtering_centers`.
+    :returns: dataframe with the columns `year`, `center`, `kpi`, `key` and `value`.
+    """
+    dataframe = flattening_mappings(dataframe)
+    membership = membership_table(dataframe, years=years, centers=centers, role=role)
+
+    results = [
+        scalar_grouped(membership, pandas.Series(1, index=dataframe.index), 'tickets', 'sum'),
+        scalar_grouped(membership, dataframe['final_workload'], 'workload_mean', 'mean'),
+        scalar_grouped(membership, dataframe['final_workload'], 'workload_median', 'median'),
+    ]
+
+    #-- Affiliations of consultants, experts and overall
+    consultants = exploding_people(dataframe, 'consultants')['affiliation'].dropna()
+    experts = exploding_people(dataframe, 'experts')['affiliation'].dropna()
+    results += [
+        sharing_grouped(membership, consultants, 'affiliations_consultants'),
+        sharing_grouped(membership, experts, 'affiliations_experts'),
+        sharing_grouped(
+            membership,
+            pandas.concat([consultants.astype(str), experts.astype(str)]),
+            'affiliations_overall'
+        ),
+    ]
+
+    #-- Request types and main request types
+    results.append(
+        sharing_grouped(membership, exploding_values(dataframe, 'request_types'), 'request_types')
+    )
+    main_types = joining_groups(membership, classifying_request_types(dataframe))
+    main_counts = (
+        main_types
+        .drop(columns='row')
+        .groupby(GROUP_KEYS, sort=True)
+        .sum()
+        .rename_axis(columns='key')
+        .stack()
+    )
+    main_shares = main_counts / main_counts.groupby(level=GROUP_KEYS).transform('sum')
+    main_shares = main_shares.rename('value').reset_index()
+    main_shares['kpi'] = 'main_request_types'
+    results.append(main_shares[BATCH_COLUMNS])
+
+    #-- Average workload distribution in %
+    workload_columns = mapping_columns(dataframe, 'workload_percentage_distribution')
+    workload = (
+        joining_groups(membership, dataframe[workload_columns])
+        .drop(columns='row')
+        .groupby(GROUP_KEYS, sort=True)
+        .mean()
+        .rename(columns=lambda column: column.split('.', 1)[1])
+        .rename_axis(columns='key')
+        .stack()
+        .rename('value')
+        .reset_index()
+    )
+    workload['kpi'] = 'workload_distribution'
+    results.append(workload[BATCH_COLUMNS])
+
+    #-- Ticket requests per month, including months without requests
+    months = joining_groups(membership, dataframe['start_date'].dt.month.rename('month'))
+    per_month = (
+        months
+        .groupby(GROUP_KEYS + ['month'], sort=True)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=range(1, 13), fill_value=0)
+        .rename(columns=month_names)
+        .rename_axis(columns='key')
+        .stack()
+        .rename('value')
+        .reset_index()
+    )
+    per_month['kpi'] = 'tickets_per_month'
+    results.append(per_month[BATCH_COLUMNS])
+
+    return (
+        pandas.concat(results, ignore_index=True)
+        .sort_values(GROUP_KEYS, kind='stable')
+        .reset_index(drop=True)
+    )
@@ -0,0 +1,344 @@
+"""Persistent on-disk cache of parsed reports
+
+The caches are stored as JSON, so loading a cache never runs code, whoever wrote the file.
+Values JSON cannot hold, e.g. dates or mappings with other than string keys, are tagged,
+see `encoding_value`.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from dataclasses import asdict
+from pathlib import Path
+import datetime
+import hashlib
+import json
+
+#: Internal modules, libraries
+from ._parallel import streaming_parallel
+from ._profile import profiling
+from ._results import Diagnostic
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Increase whenever the layout of the cached entries changes
+CACHE_VERSION = 2
+
+#-- Keys of the single key objects standing for values JSON cannot hold, see `encoding_value`
+VALUE_TAGS = ("__date__", "__datetime__", "__tuple__", "__diagnostic__", "__items__")
+
+#-- Caches kept in memory by this process, see `ReportCache.shared`
+SHARED_CACHES: dict = {}
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def hashing_content(content: bytes) -> str:
+    """Content hash used to detect changed files"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+#--
+def encoding_value(value):
+    """JSON compatible form of a cached record, `decoding_value` restores it.
+
+    Dates, tuples, `Diagnostic`s and mappings with other than string keys become single key
+    objects tagged with one of `VALUE_TAGS`; so do mappings looking like such an object.
+
+    :raises TypeError: if the record holds any other type, e.g. a binary YAML value.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [encoding_value(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and not (len(value) == 1 and next(iter(value)) in VALUE_TAGS):
+            return {key: encoding_value(item) for key, item in value.items()}
+        return {"__items__": [[encoding_value(key), encoding_value(item)] for key, item in value.items()]}
+    #-- `datetime` is a subclass of `date`
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, tuple):
+        return {"__tuple__": [encoding_value(item) for item in value]}
+    if isinstance(value, Diagnostic):
+        return {"__diagnostic__": encoding_value(asdict(value))}
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+#--
+def decoding_value(obj: dict):
+    """Restore a tagged object of `encoding_value`, used as `object_hook` of `json.load`"""
+    if len(obj) != 1:
+        return obj
+    (tag, value), = obj.items()
+    if tag == "__datetime__":
+        return datetime.datetime.fromisoformat(value)
+    if tag == "__date__":
+        return datetime.date.fromisoformat(value)
+    if tag == "__tuple__":
+        return tuple(value)
+    if tag == "__diagnostic__":
+        return Diagnostic.from_dict(value)
+    if tag == "__items__":
+        return {key: item for key, item in value}
+    return obj
+
+#--
+def streaming_cached(function, filenames, cache=None, **options):
+    """Yield `function(filename)` for all `filenames` in order, like `streaming_parallel`.
+
+    With a `ResultCache` only the files without a valid cache entry are passed to
+    `function`; their results are added to the cache, which is saved at the end.
+    `options` are passed on to `streaming_parallel`.
+    """
+    filenames = list(filenames)
+
+    if cache is None:
+        yield from streaming_parallel(function, filenames, **options)
+        return
+
+    lookups = [cache.looking_up(filename) for filename in filenames]
+    misses = [filename for filename, (hit, _) in zip(filenames, lookups) if not hit]
+    computed = streaming_parallel(function, misses, **options)
+
+    try:
+        for filename, (hit, result) in zip(filenames, lookups):
+            if not hit:
+                result = next(computed)
+                cache.storing(filename, result)
+            yield result
+    finally:
+        #-- Also keep the results computed so far if the consumer stops early
+        computed.close()
+        cache.evicting(filenames)
+        cache.saving()
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class ReportCache:
+    """Cache of parsed report records, keyed by file path, mtime, size and content hash.
+
+    A cache entry is reused without reading the file as long as mtime and size are unchanged.
+    If only the mtime or size differ, the file content is hashed; an unchanged hash still
+    reuses the entry. Otherwise the file is parsed again.
+
+    :param cache_file: JSON file holding the cached entries. Created on `saving`.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self.entries: dict = {}
+        self.modified = False
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_file.is_file():
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as file:
+                    content = json.load(file, object_hook=decoding_value)
+                if content.get("version") == CACHE_VERSION:
+                    self.entries = content["entries"]
+            except (OSError, ValueError, TypeError, AttributeError, KeyError):
+                #-- A broken cache is simply rebuilt
+                self.entries = {}
+        self.stamp = self.stamping()
+
+    #--
+    @classmethod
+    def shared(cls, cache_file: Path, **options) -> "ReportCache":
+        """Cache of `cache_file` kept in memory by this process, e.g. between the requests of `reporting serve`.
+
+        The file is only read again if another process changed it in the meantime.
+        `options` are the further parameters of the cache, see `reusing`.
+        """
+        key = (cls, str(Path(cache_file).resolve()))
+        cache = SHARED_CACHES.get(key)
+        if cache is None or cache.stamp != cache.stamping():
+            cache = cls(cache_file, **options)
+            SHARED_CACHES[key] = cache
+        else:
+            cache.reusing(**options)
+        return cache
+
+    #--
+    def reusing(self, **options) -> None:
+        """Prepare a shared cache for the next caller"""
+        for name, value in options.items():
+            setattr(self, name, value)
+
+    #--
+    def stamping(self):
+        """mtime and size of the cache file, None if it does not exist"""
+        try:
+            stat = self.cache_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    #--
+    def loading(self, filename: Path, parser):
+        """Return the parsed record of `filename`, calling `parser(content)` on a cache miss"""
+        return self.loading_many([filename], parser=parser)[0]
+
+    #--
+    def loading_many(self, filenames, parser, mapper=map) -> list:
+        """Return the parsed records of all `filenames` in the given order.
+
+        The contents of the cache misses are parsed via `mapper(parser, contents)`,
+        which allows to spread the parsing over a process pool.
+        """
+        records = []
+        pending = {}
+
+        for position, filename in enumerate(filenames):
+            key = str(Path(filename).resolve())
+            stat = Path(filename).stat()
+            entry = self.entries.get(key)
+
+            if entry is not None and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                self.hits += 1
+                records.append(entry["record"])
+                continue
+
+            with profiling("read"), open(filename, "rb") as file:
+                content = file.read()
+            digest = hashing_content(content)
+
+            if entry is not None and entry["hash"] == digest:
+                #-- Touched but unchanged file, only refresh the stat information
+                self.hits += 1
+                entry["mtime"] = stat.st_mtime_ns
+                entry["size"] = stat.st_size
+                self.modified = True
+                records.append(entry["record"])
+                continue
+
+            self.misses += 1
+            pending[position] = (key, stat, digest, content)
+            records.append(None)
+
+        parsed = mapper(parser, [content for _, _, _, content in pending.values()])
+        for (position, (key, stat, digest, _)), record in zip(pending.items(), parsed):
+            self.entries[key] = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest,
+                "record": record,
+            }
+            records[position] = record
+            self.modified = True
+
+        return records
+
+    #--
+    def evicting(self, seen) -> int:
+        """Drop entries of deleted files; `seen` holds the files of the current scan"""
+        seen_keys = {str(Path(filename).resolve()) for filename in seen}
+        stale = [
+            key for key in self.entries
+            if key not in seen_keys and not Path(key).exists()
+        ]
+        for key in stale:
+            del self.entries[key]
+
+        if stale:
+            self.modified = True
+
+        return len(stale)
+
+    #--
+    def saving(self) -> None:
+        """Write the cache back to disk if anything changed.
+
+        Entries whose record cannot be stored as JSON are left out, their files are parsed
+        or checked again by the next process.
+        """
+        if not self.modified:
+            return
+
+        entries = {}
+        for key, entry in self.entries.items():
+            try:
+                entries[key] = encoding_value(entry)
+            except TypeError:
+                continue
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+        with open(temporary_file, "w", encoding="utf-8") as file:
+            json.dump({"version": CACHE_VERSION, "entries": entries}, file)
+        temporary_file.replace(self.cache_file)
+        self.modified = False
+        self.stamp = self.stamping()
+
+#--
+class ResultCache(ReportCache):
+    """Cache of per file check results, e.g. validation messages or linter problems.
+
+    An entry is only reused as long as the content of its file and the `configuration`
+    are unchanged; `configuration` identifies the check, e.g. by the hash of the schema
+    or of the linter configuration. As for `ReportCache`, files with unchanged mtime
+    and size are not even read.
+
+    :param cache_file: JSON file holding the cached entries. Created on `saving`.
+    :param configuration: Identifier of the check and its configuration.
+    """
+
+    def __init__(self, cache_file: Path, configuration: str):
+        super().__init__(cache_file)
+        self.configuration = configuration
+        self.pending: dict = {}
+
+    #--
+    def reusing(self, **options) -> None:
+        super().reusing(**options)
+        #-- Files looked up but never stored, e.g. after an early stop
+        self.pending = {}
+
+    #--
+    def looking_up(self, filename: Path) -> tuple:
+        """Return whether the result of `filename` is cached, and the cached result"""
+        key = str(Path(filename).resolve())
+        stat = Path(filename).stat()
+        entry = self.entries.get(key)
+
+        if entry is not None and entry["configuration"] == self.configuration:
+            if entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                self.hits += 1
+                return True, entry["record"]
+
+        with open(filename, "rb") as file:
+            digest = hashing_content(file.read())
+
+        if entry is not None and entry["configuration"] == self.configuration and entry["hash"] == digest:
+            #-- Touched but unchanged file, only refresh the stat information
+            self.hits += 1
+            entry["mtime"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self.modified = True
+            return True, entry["record"]
+
+        self.misses += 1
+        self.pending[key] = (stat, digest)
+        return False, None
+
+    #--
+    def storing(self, filename: Path, result) -> None:
+        """Store the result of a file that was looked up before"""
+        key = str(Path(filename).resolve())
+        stat, digest = self.pending.pop(key)
+        self.entries[key] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": digest,
+            "configuration": self.configuration,
+            "record": result,
+        }
+        self.modified = True
@@ -0,0 +1,111 @@
+"""Cross-report consistency checks on hash indexes of the report index entries"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import re
+
+#: Internal modules, libraries
+from ._constants import REPORT_INDEX_FILE
+from ._index import indexing_report
+from ._files import indexing_reports, loading_yaml_to_pathlib_glob
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Fields that have to be unique among all reports
+UNIQUE_FIELDS = ('zammad_ticket_number', 'ticket_link', 'project_name')
+
+#-- Reports are named `<zammad_ticket_number>_<project name>.yml`
+FILENAME_TICKET_PATTERN = re.compile(r"^(\d+)")
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def normalizing_project_name(name: str) -> str:
+    """Project name ignoring case, punctuation and whitespace differences"""
+    return " ".join(re.sub(r"[\W_]+", " ", name).casefold().split())
+
+#--
+def unique_key(entry: dict, field: str) -> str | None:
+    """Key of a unique field in the hash index, None if the field is not set"""
+    value = entry.get(field)
+    if value is None or value == "":
+        return None
+    if field == 'project_name':
+        return normalizing_project_name(str(value)) or None
+    return str(value)
+
+#--
+def ticket_from_filename(filename: Path) -> str | None:
+    """Ticket number in the filename of a report, None if the filename does not start with one"""
+    match = FILENAME_TICKET_PATTERN.match(Path(filename).name)
+    return None if match is None else match.group(1)
+
+#--
+def checking_consistency(entries, selected=None) -> list:
+    """Check reports against each other, in linear time.
+
+    One hash index per field of `UNIQUE_FIELDS` flags duplicated ticket numbers, ticket links
+    and (normalized) project names. Filenames whose ticket number differs from
+    `zammad_ticket_number` are flagged as well.
+
+    :param entries: pairs of report file and index entry (see `indexing_report`) of all reports.
+    :param selected: only report problems involving these files, by default all files.
+    :returns: the problems as plain text messages.
+    """
+    entries = list(entries)
+    if selected is not None:
+        selected = {Path(filename).resolve() for filename in selected}
+
+    def is_selected(filename):
+        return selected is None or Path(filename).resolve() in selected
+
+    messages = []
+    indexes: dict = {field: {} for field in UNIQUE_FIELDS}
+    for filename, entry in entries:
+        for field in UNIQUE_FIELDS:
+            key = unique_key(entry, field)
+            if key is not None:
+                indexes[field].setdefault(key, []).append(filename)
+
+        ticket = ticket_from_filename(filename)
+        number = entry.get('zammad_ticket_number')
+        if ticket is not None and number is not None and ticket != str(number) and is_selected(filename):
+            messages.append(
+                f"{filename}: ticket number {ticket} in the filename does not match zammad_ticket_number {number}"
+            )
+
+    for field in UNIQUE_FIELDS:
+        for key, filenames in indexes[field].items():
+            if len(filenames) > 1 and any(is_selected(filename) for filename in filenames):
+                messages.append(
+                    f"Duplicate {field} {key!r} in {', '.join(str(filename) for filename in filenames)}"
+                )
+
+    return messages
+
+#--
+def checking_new_report(
+    report: dict,
+    filename: Path,
+    corpus: Path,
+    index_file: Path = REPORT_INDEX_FILE
+) -> list:
+    """Cross-report problems a new or edited report would introduce into `corpus`, e.g. before saving it.
+
+    The other reports are taken from the sidecar index `index_file`, see `checking_consistency`.
+    """
+    index = indexing_reports(corpus, index_file=index_file)
+    entries = []
+    for other in loading_yaml_to_pathlib_glob(corpus):
+        entry = index.looking_up(other)
+        if entry is not None and Path(other).resolve() != Path(filename).resolve():
+            entries.append((other, entry))
+    entries.append((filename, indexing_report(report)))
+
+    return checking_consistency(entries, selected=[filename])
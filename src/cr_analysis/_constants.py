@@ -1,4 +1,6 @@
 import datetime
+import os
+from pathlib import Path
 
 #=======================================#
 #== INITALISATION VALUES AND CONTANTS ==#
@@ -37,7 +39,43 @@ WORKLOAD_CATEGORY = [
     'workload_percentage_distribution.other'
 ]
 
+#-- Helmholtz centers; reports store the abbreviation before the first comma
+consultant_centers = [
+    "AWI, Alfred-Wegener-Institut, Bremerhaven",
+    "CISPA, Helmholtz-Zentrum für Informationssicherheit, Saarbrücken",
+    "DESY, Deutsches Elektronen-Synchrotron, Hamburg",
+    "DKFZ, Deutsches Krebsforschungszentrum, Heidelberg",
+    "DLR, Deutsches Zentrum für Luft- und Raumfahrt, Köln",
+    "DZNE, Deutsches Zentrum für Neurodegenerative Erkrankungen e. V., Bonn",
+    "FZJ, Forschungszentrum Jülich, Jülich",
+    "GEOMAR, Helmholtz-Zentrum für Ozeanforschung Kiel, Kiel",
+    "GFZ, Helmholtz-Zentrum Potsdam, Potsdam",
+    "GSI, Helmholtzzentrum für Schwerionenforschung, Darmstadt",
+    "Hereon, Helmholtz-Zentrum Hereon, Geesthacht",
+    "HMGU, Helmholtz-Zentrum München, Neuherberg bei München",
+    "HZB, Helmholtz-Zentrum Berlin",
+    "HZDR, Helmholtz-Zentrum Dresden-Rossendorf",
+    "HZI, Helmholtz-Zentrum für Infektionsforschung, Braunschweig",
+    "KIT, Karlsruher Institut für Technologie, Karlsruhe",
+    "MDC, Max-Delbrück-Centrum, Berlin-Buch",
+    "UFZ, Helmholtz-Zentrum für Umweltforschung, Leipzig",
+]
+
+center_abbreviations = [center.split(",", 1)[0] for center in consultant_centers]
+
 REQUEST_MAIN_TYPES = {'SE': TYPE_CATEGORY_SE, 'LEGAL': TYPE_CATEGORY_LEGAL, 'PRAC': TYPE_CATEGORY_PRAC}
+#-- Default location of the on-disk cache of parsed reports
+REPORT_CACHE_FILE = Path(".cache/reports.json")
+#-- Default location of the sidecar index used to skip non-matching reports
+REPORT_INDEX_FILE = Path(".cache/index.json")
+#-- Compiled schema validators, see `cr_analysis._validator`. Kept per user, outside of the
+#-- working tree, as the cached code is executed
+USER_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "consulting-reporting"
+VALIDATOR_CACHE_DIR = USER_CACHE_DIR / "validators"
+#-- Default locations of the cached validation and linter results
+VALIDATION_CACHE_FILE = Path(".cache/validation.json")
+LINT_CACHE_FILE = Path(".cache/lint.json")
+
 current_year = int(datetime.date.today().strftime("%Y"))
 current_date = datetime.datetime.now().strftime("%Y-%m-%d")
 
@@ -0,0 +1,79 @@
+"""Finding and parsing the report files
+
+Kept free of pandas, so that linting and validating the reports do not pay its import time.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+
+#: External modules,libraries
+import yaml
+
+try:
+    # Attempt to use CLoader
+    from yaml import CLoader as YAML_Loader
+except ImportError:
+    # Fallback to regular Loader if CLoader is not available
+    from yaml import BaseLoader as YAML_Loader
+
+#: Internal modules,libraries
+from ._index import ReportIndex
+from ._parallel import mapping_parallel
+from ._profile import profiling
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#-- Loading the yaml file
+def loading_yaml_to_pathlib_glob(reports: Path):
+
+    #-- In case where an explicit selection of files is provided
+    if isinstance(reports, (list, tuple)):
+        return list(reports)
+
+    reports = Path(reports)
+
+    #-- In case where a single file is provided
+    if reports.is_file():
+        yaml_files = [reports]
+    else:
+        #-- Sorted to keep the order of the reports deterministic
+        with profiling("glob"):
+            yaml_files = sorted(reports.glob("*.yml"))
+
+    return yaml_files
+
+#-- Parsing the content of a single yaml file
+def parsing_yaml(content):
+    with profiling("parse"):
+        return yaml.load(content, Loader=YAML_Loader)
+
+#-- Loading a single yaml file
+def loading_yaml_file(filename: Path):
+    with profiling("read"), open(filename, "r", encoding="utf-8") as file:
+        content = file.read()
+    return parsing_yaml(content)
+
+#-- Bringing the sidecar index up to date
+def indexing_reports(
+    reports: Path,
+    index_file: Path | None,
+    jobs: int = 1
+) -> ReportIndex:
+    """Index of all reports, parsing only the reports without a valid index entry"""
+    yaml_files = loading_yaml_to_pathlib_glob(reports)
+
+    index = ReportIndex(index_file)
+    index.evicting(yaml_files)
+
+    unindexed = [filename for filename in yaml_files if index.looking_up(filename) is None]
+    for filename, data in zip(unindexed, mapping_parallel(loading_yaml_file, unindexed, jobs=jobs)):
+        if isinstance(data, dict):
+            index.updating(filename, data)
+    index.saving()
+
+    return index
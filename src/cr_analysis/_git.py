@@ -0,0 +1,60 @@
+"""Selection of the reports changed in git"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import subprocess
+
+#: Internal modules, libraries
+from ._files import loading_yaml_to_pathlib_glob
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def running_git(*arguments: str, cwd: Path) -> list:
+    """Run a git command and return the NUL separated paths of its output"""
+    try:
+        result = subprocess.run(
+            ["git", *arguments],
+            cwd=cwd,
+            capture_output=True,
+            check=False
+        )
+    except FileNotFoundError as error:
+        raise ValueError("git is not available") from error
+
+    if result.returncode != 0:
+        raise ValueError(f"git {' '.join(arguments)} failed: {result.stderr.decode().strip()}")
+
+    return [path for path in result.stdout.decode("utf-8").split("\0") if path]
+
+#--
+def changed_reports(reports: Path, ref: str) -> list:
+    """Reports added, modified or renamed since the git revision `ref`.
+
+    Uncommitted changes and untracked (not ignored) reports count as changed.
+    :returns: the changed report files, in the order of `loading_yaml_to_pathlib_glob`.
+    :raises ValueError: if git fails, e.g. for an unknown `ref`.
+    """
+    reports = Path(reports)
+    directory = reports if reports.is_dir() else reports.parent
+
+    #-- `ref` is user input, e.g. `--output=FILE` must not be read as an option
+    changed = running_git(
+        "diff", "--name-only", "--relative", "--diff-filter=AMR", "-z", "--end-of-options", ref, "--", ".",
+        cwd=directory
+    )
+    changed += running_git(
+        "ls-files", "--others", "--exclude-standard", "-z", "--", ".",
+        cwd=directory
+    )
+    changed = {(directory / path).resolve() for path in changed}
+
+    return [
+        filename for filename in loading_yaml_to_pathlib_glob(reports)
+        if Path(filename).resolve() in changed
+    ]
@@ -0,0 +1,174 @@
+"""Lightweight sidecar index of the reports for predicate pushdown"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import json
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Increase whenever the layout of the index entries changes
+INDEX_VERSION = 2
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def indexing_report(report: dict) -> dict:
+    """Index entry of a parsed report: ticket number and link, project name, dates and consultant/expert affiliations"""
+    def affiliations(column):
+        people = report.get(column)
+        if not isinstance(people, list):
+            return []
+        return [person.get('affiliation') for person in people if isinstance(person, dict)]
+
+    return {
+        'zammad_ticket_number': report.get('zammad_ticket_number'),
+        'ticket_link': report.get('ticket_link'),
+        'project_name': report.get('project_name'),
+        'start_date': str(report.get('start_date')),
+        'end_date': str(report.get('end_date')),
+        'consultants': affiliations('consultants'),
+        'experts': affiliations('experts'),
+    }
+
+#--
+def matching_entry(
+    entry: dict,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead'
+) -> bool:
+    """Whether the report of an index entry can pass the year and center filters of `loading_data`"""
+    if year is not None and not entry['start_date'].startswith(f"{year}-"):
+        return False
+
+    if isinstance(center, str):
+        if center == 'all':
+            return True
+        center = [center]
+
+    if role == 'lead':
+        affiliations = entry['consultants'][:1]
+    elif role == 'experts':
+        affiliations = entry['experts']
+    else:
+        affiliations = entry['consultants']
+
+    return any(affiliation in center for affiliation in affiliations)
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class ReportIndex:
+    """Sidecar index of the reports, keyed by file path.
+
+    An entry is only trusted as long as mtime and size of its file are unchanged.
+    Files without a valid entry are never skipped.
+
+    :param index_file: JSON file holding the index. Created on `saving`. With None the index
+                       is only kept in memory, e.g. when the on-disk caches are disabled.
+    """
+
+    def __init__(self, index_file: Path | None):
+        self.index_file = None if index_file is None else Path(index_file)
+        self.entries: dict = {}
+        self.modified = False
+
+        if self.index_file is not None and self.index_file.is_file():
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as file:
+                    content = json.load(file)
+                if content.get("version") == INDEX_VERSION:
+                    self.entries = content["entries"]
+            except (OSError, ValueError, KeyError):
+                #-- A broken index is simply rebuilt
+                self.entries = {}
+
+    #--
+    def looking_up(self, filename: Path) -> dict | None:
+        """Index entry of `filename` or None if unknown or outdated"""
+        entry = self.entries.get(str(Path(filename).resolve()))
+        if entry is None:
+            return None
+
+        stat = Path(filename).stat()
+        if entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            return None
+
+        return entry
+
+    #--
+    def filtering(
+        self,
+        filenames,
+        year: int | None = None,
+        center = 'all',
+        role: str = 'lead'
+    ) -> tuple:
+        """Drop all files whose index entry cannot match the year and center filters.
+
+        :returns: the remaining files and, among them, the files without a valid index entry.
+        """
+        selected = []
+        unindexed = []
+        for filename in filenames:
+            entry = self.looking_up(filename)
+            if entry is None:
+                unindexed.append(filename)
+                selected.append(filename)
+            elif matching_entry(entry, year=year, center=center, role=role):
+                selected.append(filename)
+
+        return selected, unindexed
+
+    #--
+    def updating(self, filename: Path, report: dict) -> None:
+        """Store the entry of a freshly parsed report"""
+        self.storing(filename, indexing_report(report))
+
+    #--
+    def storing(self, filename: Path, entry: dict) -> None:
+        """Store an entry built by `indexing_report`, e.g. in a worker process"""
+        stat = Path(filename).stat()
+        self.entries[str(Path(filename).resolve())] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            **entry,
+        }
+        self.modified = True
+
+    #--
+    def evicting(self, seen) -> int:
+        """Drop entries of deleted files; `seen` holds the files of the current scan"""
+        seen_keys = {str(Path(filename).resolve()) for filename in seen}
+        stale = [
+            key for key in self.entries
+            if key not in seen_keys and not Path(key).exists()
+        ]
+        for key in stale:
+            del self.entries[key]
+
+        if stale:
+            self.modified = True
+
+        return len(stale)
+
+    #--
+    def saving(self) -> None:
+        """Write the index back to disk if anything changed"""
+        if not self.modified or self.index_file is None:
+            return
+
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file = self.index_file.with_suffix(self.index_file.suffix + ".tmp")
+        with open(temporary_file, "w", encoding="utf-8") as file:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries}, file)
+        temporary_file.replace(self.index_file)
+        self.modified = False
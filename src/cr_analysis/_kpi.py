@@ -0,0 +1,257 @@
+"""Lazily computed, memoized KPIs of one (year, center) selection"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from functools import cached_property
+from pathlib import Path
+
+#: External modules, libraries
+import pandas
+
+#: Internal modules, libraries
+from ._state import SHARD_SIZE, KPIState, aggregating_reports
+from ._utils import (
+    loading_data,
+    counting_affiliations,
+    counting_occurrence,
+    counting_main_types,
+    workload_distribution,
+    formatting_workload,
+    tickets_per_month,
+    formatting_months
+)
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class KPIResult:
+    """KPIs of the reports of `year` and `center`.
+
+    The reports are loaded on first access, every KPI is computed on first request and
+    memoized afterwards. The CLI analysis, the HTML plot and any other exporter can share
+    one instance, so that the data is loaded and aggregated only once.
+
+    The parameters are the ones of `loading_data`. Alternatively, an already loaded
+    and filtered `dataframe` can be given.
+    """
+
+    def __init__(
+        self,
+        reports: Path = Path('reports/'),
+        year: int | None = None,
+        center = 'all',
+        role: str = 'lead',
+        cache_file: Path | None = None,
+        jobs: int = 1,
+        store: Path | None = None,
+        index_file: Path | None = None,
+        compact: bool = False,
+        dataframe: pandas.DataFrame | None = None
+    ):
+        self.reports = reports
+        self.year = year
+        self.center = center
+        self.role = role
+        self.cache_file = cache_file
+        self.jobs = jobs
+        self.store = store
+        self.index_file = index_file
+        self.compact = compact
+        self._memo: dict = {}
+
+        if dataframe is not None:
+            self.dataframe = dataframe
+
+    #--
+    def _memoized(self, key: tuple, function):
+        if key not in self._memo:
+            self._memo[key] = function()
+        return self._memo[key]
+
+    #--
+    @staticmethod
+    def _output(counts: pandas.Series, output: str) -> pandas.Series:
+        if output == 'relative':
+            return counts/counts.sum()
+        elif output == 'absolute':
+            return counts
+        else:
+            raise TypeError("Wrong given output. Available output types are: relative|absolute")
+
+    #--
+    @cached_property
+    def dataframe(self) -> pandas.DataFrame:
+        """The loaded and filtered reports"""
+        return loading_data(
+            reports=self.reports,
+            year=self.year,
+            center=self.center,
+            cache_file=self.cache_file,
+            jobs=self.jobs,
+            store=self.store,
+            index_file=self.index_file,
+            role=self.role,
+            compact=self.compact
+        )
+
+    #--
+    @cached_property
+    def tickets(self) -> int:
+        return len(self.dataframe)
+
+    #--
+    @cached_property
+    def workload_mean(self):
+        return self.dataframe['final_workload'].mean()
+
+    #--
+    @cached_property
+    def workload_median(self):
+        return self.dataframe['final_workload'].median()
+
+    #--
+    def affiliations(self, column: str, add: str = "None", output: str = "relative") -> pandas.Series:
+        """See `counting_affiliations`"""
+        counts = self._memoized(
+            ('affiliations', column, add),
+            lambda: counting_affiliations(dataframe=self.dataframe, column=column, add=add, output='absolute')
+        )
+        return self._output(counts, output)
+
+    #--
+    def occurrence(self, column: str, output: str = "relative") -> pandas.Series:
+        """See `counting_occurrence`"""
+        counts = self._memoized(
+            ('occurrence', column),
+            lambda: counting_occurrence(dataframe=self.dataframe, column=column, output='absolute')
+        )
+        return self._output(counts, output)
+
+    #--
+    def main_types(self, output: str = "relative") -> pandas.Series:
+        """See `counting_main_types`"""
+        counts = self._memoized(
+            ('main_types',),
+            lambda: counting_main_types(dataframe=self.dataframe, output='absolute')
+        )
+        return self._output(counts, output)
+
+    #--
+    @cached_property
+    def workload(self) -> pandas.DataFrame:
+        """See `workload_distribution`"""
+        return workload_distribution(self.dataframe)
+
+    #--
+    @cached_property
+    def months(self) -> pandas.Series:
+        """See `tickets_per_month`"""
+        return tickets_per_month(self.dataframe)
+
+#--
+class StreamingKPIResult(KPIResult):
+    """KPIs of the reports of `year` and `center`, aggregated shard by shard.
+
+    The report files are parsed and aggregated in shards of `chunk_size` reports (see
+    `aggregating_reports`), in parallel with `jobs` > 1. Only the mergeable `KPIState` is
+    kept, so the memory does not grow with the number of reports.
+
+    Alternatively, an already aggregated `state` can be given.
+
+    As the reports are never held at once, `dataframe` is None. The store, the cache and the
+    compact mode are not used. Entries with equal counts may be listed in a different order.
+    """
+
+    dataframe = None
+
+    def __init__(
+        self,
+        reports: Path = Path('reports/'),
+        year: int | None = None,
+        center = 'all',
+        role: str = 'lead',
+        jobs: int = 1,
+        index_file: Path | None = None,
+        chunk_size: int = SHARD_SIZE,
+        state: KPIState | None = None
+    ):
+        super().__init__(
+            reports=reports,
+            year=year,
+            center=center,
+            role=role,
+            jobs=jobs,
+            index_file=index_file
+        )
+        self.chunk_size = chunk_size
+
+        if state is not None:
+            self.state = state
+
+    #--
+    @cached_property
+    def state(self) -> KPIState:
+        """The `KPIState` of the selected reports"""
+        return aggregating_reports(
+            reports=self.reports,
+            year=self.year,
+            center=self.center,
+            role=self.role,
+            jobs=self.jobs,
+            shard_size=self.chunk_size,
+            index_file=self.index_file
+        )
+
+    #--
+    @cached_property
+    def tickets(self) -> int:
+        return self.state.tickets
+
+    #--
+    @cached_property
+    def workload_mean(self):
+        return self.state.workload_mean()
+
+    #--
+    @cached_property
+    def workload_median(self):
+        return self.state.workload_median()
+
+    #--
+    def affiliations(self, column: str, add: str = "None", output: str = "relative") -> pandas.Series:
+        """See `counting_affiliations`"""
+        counts = self._memoized(
+            ('affiliations', column, add),
+            lambda: self.state.counting_affiliations(column, add=add)
+        )
+        return self._output(counts, output)
+
+    #--
+    def occurrence(self, column: str, output: str = "relative") -> pandas.Series:
+        """See `counting_occurrence`"""
+        counts = self._memoized(
+            ('occurrence', column),
+            lambda: self.state.counting_occurrence(column)
+        )
+        return self._output(counts, output)
+
+    #--
+    def main_types(self, output: str = "relative") -> pandas.Series:
+        """See `counting_main_types`"""
+        return self._output(self._memoized(('main_types',), self.state.counting_main_types), output)
+
+    #--
+    @cached_property
+    def workload(self) -> pandas.DataFrame:
+        """See `workload_distribution`"""
+        return formatting_workload(self.state.workload_averages())
+
+    #--
+    @cached_property
+    def months(self) -> pandas.Series:
+        """See `tickets_per_month`"""
+        return formatting_months(self.state.monthly_requests())
@@ -7,17 +7,14 @@ from pathlib import Path
 
 #: External modules, libraries
 from rich import print
+from rich.console import Console
+from rich.table import Table
 
 #: Internal modules, libraries
-from ._utils import (
-    loading_data,
-    counting_affiliations,
-    counting_occurrence,
-    counting_main_types,
-    workload_distribution,
-    tickets_per_month
-)
+from ._utils import loading_data
 
+from ._batch import batch_kpis
+from ._kpi import KPIResult
 from ._constants import current_year
 
 #===============#
@@ -28,14 +25,40 @@ from ._constants import current_year
 def reports_analysis(
     reports: Path,
     year: int = current_year,
-    center: str = 'all'
+    center: str = 'all',
+    cache_file: Path | None = None,
+    jobs: int = 1,
+    store: Path | None = None,
+    index_file: Path | None = None,
+    role: str = 'lead',
+    compact: bool = False,
+    kpis: KPIResult | None = None
 ):
-    """Extract KPI's based on center and year. Only output."""
+    """Extract KPI's based on center and year. Only output.
+
+    Passing a `KPIResult` as `kpis` reuses its loaded data and already computed KPIs,
+    the remaining parameters are ignored in this case. With a `StreamingKPIResult`
+    no dataframe is kept and None is returned.
+    """
     #===== Initialization =============================#
+    if kpis is None:
+        kpis = KPIResult(
+            reports=reports,
+            year=year,
+            center=center,
+            role=role,
+            cache_file=cache_file,
+            jobs=jobs,
+            store=store,
+            index_file=index_file,
+            compact=compact
+        )
+    year = kpis.year
+    center = kpis.center
     #===== Sub-Functions ==============================#
 
     #===== Routine ====================================#
-    df = loading_data(reports=reports, year=year, center=center)
+    df = kpis.dataframe
     #===== End Routine ================================#
     
     #===== Output =====================================#
@@ -46,30 +69,78 @@ def reports_analysis(
         #-- Affiliation count by consultant and expert centers
         print("\n----------------------------------------------\n")
         print(f"[bold]Affiliation Counts for Consultants in {year}:[/bold]\n")
-        print(counting_affiliations(dataframe=df, column='consultants'))
+        print(kpis.affiliations(column='consultants'))
         print("\n----------------------------------------------\n")
         print(f"[bold]Affiliation Counts for Experts in {year}:[/bold]\n")
-        print(counting_affiliations(dataframe=df, column='experts'))
+        print(kpis.affiliations(column='experts'))
         print("\n----------------------------------------------\n")
         print(f"[bold]Affiliation Counts Overall in {year}:[/bold]\n")
-        print(counting_affiliations(dataframe=df, column='consultants', add="experts", output='relative'))
+        print(kpis.affiliations(column='consultants', add="experts", output='relative'))
 
     print("\n----------------------------------------------\n")
     print( "[bold]Average/Median workload per ticket in days[/bold]",
-          f"{df['final_workload'].mean().round(2)} | {df['final_workload'].median().round(2)}"
+          f"{kpis.workload_mean.round(2)} | {kpis.workload_median.round(2)}"
     ) 
     print("\n----------------------------------------------\n")
     print(f"[bold]Request Types in {year} for [green]{center}[/green]:[/bold]\n")
-    print(counting_occurrence(dataframe=df, column='request_types', output='relative'))
+    print(kpis.occurrence(column='request_types', output='relative'))
     print("\n----------------------------------------------\n")
     print(f"[bold]Main Request Types in {year} for [green]{center}[/green]:[/bold]\n")
-    print(counting_main_types(dataframe=df, output='relative'))
+    print(kpis.main_types(output='relative'))
     print("\n----------------------------------------------\n")
     print(f"[bold]Average workload distribution, % in {year} for [green]{center}[/green]:[/bold]\n")
-    print(workload_distribution(df)[['category','percentage']])
+    print(kpis.workload[['category','percentage']])
     print("\n----------------------------------------------\n")
     print(f"[bold]Ticket request distribution per month in {year} for [green]{center}[/green]:[/bold]\n")
-    print(tickets_per_month(df))
+    print(kpis.months)
     #=== End Output ===================================#
 
     return df
+
+#--
+def reports_batch_analysis(
+    reports: Path,
+    years=None,
+    centers=None,
+    role: str = 'lead',
+    destination: Path | None = None,
+    cache_file: Path | None = None,
+    jobs: int = 1,
+    store: Path | None = None,
+    compact: bool = False
+):
+    """Extract all KPI's for every combination of years and centers, loading the reports once.
+
+    :param years: Years to analyse, by default all years found in the reports.
+    :param centers: Centers to analyse, by default all centers found in the reports. 'all' is always included.
+    :param destination: CSV file for the combined result table. If not given, the table is printed.
+    :returns: dataframe with the columns `year`, `center`, `kpi`, `key` and `value`.
+    """
+    #===== Routine ====================================#
+    df = loading_data(
+        reports=reports,
+        year=None,
+        center='all',
+        cache_file=cache_file,
+        jobs=jobs,
+        store=store,
+        compact=compact
+    )
+    kpis = batch_kpis(df, years=years, centers=centers, role=role)
+    #===== End Routine ================================#
+
+    #===== Output =====================================#
+    if destination is not None:
+        kpis.to_csv(destination, index=False)
+        print(f"[green bold]>>> KPIs of {kpis[['year', 'center']].drop_duplicates().shape[0]} "
+              f"year/center combinations written to {destination} <<<[/green bold]")
+    else:
+        table = Table(title="Batch analysis")
+        for column in kpis.columns:
+            table.add_column(column, justify="right" if column in ('year', 'value') else "left")
+        for row in kpis.itertuples(index=False):
+            table.add_row(str(row.year), str(row.center), row.kpi, str(row.key), f"{row.value:.4g}")
+        Console().print(table)
+    #=== End Output ===================================#
+
+    return kpis
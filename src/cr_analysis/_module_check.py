@@ -0,0 +1,148 @@
+"""Linting, validation and analysis in a single pass over the reports"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from functools import partial
+from pathlib import Path
+
+#: External modules, libraries
+from yamllint.config import YamlLintConfig
+
+#: Internal modules, libraries
+from ._constants import current_year
+from ._files import loading_yaml_to_pathlib_glob
+from ._index import indexing_report
+from ._kpi import StreamingKPIResult
+from ._module_linting import linting_content
+from ._module_validation import (
+    checking_corpus,
+    loading_problem_diagnostics,
+    parsing_report,
+    validating_report
+)
+from ._parallel import chunking, streaming_parallel
+from ._profile import profiling
+from ._results import Diagnostic, FileResult, LintResult, ValidationResult
+from ._state import SHARD_SIZE, KPIState
+from ._validator import building_validator
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def checking_file(filename: Path, configuration: YamlLintConfig, schema_text: str) -> tuple:
+    """Lint, parse and validate a single report, reading the file only once.
+
+    :returns: the linter and validation `Diagnostic`s and the parsed report
+              (None if the report could not be parsed).
+    """
+    with profiling("read"), open(filename, "rb") as file:
+        content = file.read().decode("utf-8")
+
+    problems = [Diagnostic.from_lint_problem(problem) for problem in linting_content(content, configuration)]
+
+    report, problem = parsing_report(content)
+    if problem is not None:
+        diagnostics = loading_problem_diagnostics(problem)
+    else:
+        diagnostics = validating_report(report, building_validator(schema_text))
+
+    return problems, diagnostics, report
+
+#--
+def checking_shard(
+    yaml_files: list,
+    configuration: YamlLintConfig,
+    schema_text: str,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead'
+) -> tuple:
+    """Check a shard of reports and aggregate their KPIs, e.g. in a worker process.
+
+    Only valid reports are aggregated.
+
+    :returns: the linter and validation diagnostics per file, the index entries of the
+              files for the cross-report checks and the `KPIState` of the shard.
+    """
+    results = [checking_file(filename, configuration, schema_text) for filename in yaml_files]
+    records = [report for _, diagnostics, report in results if not diagnostics]
+    state = KPIState.from_reports(records, year=year, center=center, role=role)
+    entries = [
+        indexing_report(report) if isinstance(report, dict) else None
+        for _, _, report in results
+    ]
+
+    return [(problems, diagnostics) for problems, diagnostics, _ in results], entries, state
+
+#-------------------#
+#-- check_reports --#
+#-------------------#
+def reports_check(
+    reports: Path,
+    schema_file: Path,
+    linter_config: Path,
+    year: int = current_year,
+    center: str = 'all',
+    role: str = 'lead',
+    jobs: int = 1,
+    shard_size: int = SHARD_SIZE
+):
+    """Lint, validate and analyse the reports in one pass.
+
+    Every report file is read once; the same content is linted, parsed once, validated
+    against the JSON schema and, if valid, aggregated into the KPIs of `year` and `center`.
+    Nothing is printed and the process is not exited, see `reports_linting`,
+    `reports_validation` and `reports_analysis` for the parts.
+
+    :param reports: A path to a single YAML file or a directory containing YAML files.
+    :param schema_file: A path to the JSON schema file used for validation.
+    :param linter_config: A path to the YAML lint configuration file.
+    :param jobs: Number of worker processes, each checking whole shards of `shard_size` reports.
+    :returns: the `LintResult`, the `ValidationResult` and the `StreamingKPIResult` of the
+              valid reports.
+    """
+    configuration = YamlLintConfig(file=linter_config)
+
+    with open(schema_file, "r", encoding="utf-8") as schema_file_object:
+        schema_text = schema_file_object.read()
+
+    yaml_files = list(loading_yaml_to_pathlib_glob(reports))
+    shards = list(chunking(yaml_files, shard_size))
+
+    #-- Check and aggregate shard by shard, the diagnostics stay in file order
+    results = streaming_parallel(
+        partial(
+            checking_shard,
+            configuration=configuration,
+            schema_text=schema_text,
+            year=year,
+            center=center,
+            role=role
+        ),
+        shards,
+        jobs=jobs,
+        chunksize=1
+    )
+
+    state = KPIState()
+    linting = LintResult()
+    validation = ValidationResult()
+    entries = []
+    for shard, (shard_diagnostics, shard_entries, partial_state) in zip(shards, results):
+        state += partial_state
+        for yaml_path, (problems, diagnostics), entry in zip(shard, shard_diagnostics, shard_entries):
+            linting.files.append(FileResult(filename=yaml_path, diagnostics=problems))
+            validation.files.append(FileResult(filename=yaml_path, diagnostics=diagnostics))
+            if entry is not None:
+                entries.append((yaml_path, entry))
+
+    #-- Cross-report checks
+    validation.consistency = checking_corpus(entries)
+
+    kpis = StreamingKPIResult(reports=reports, year=year, center=center, role=role, state=state)
+
+    return linting, validation, kpis
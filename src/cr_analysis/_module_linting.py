@@ -3,63 +3,115 @@
 #=============#
 
 #: Std. libraries
+from functools import lru_cache
 from pathlib import Path
 
 #: External modules, libraries
 from yamllint.config import YamlLintConfig
-from yamllint import linter
-from rich import print
-from rich.table import Table
-from rich.console import Console
+from yamllint import linter, APP_VERSION as YAMLLINT_VERSION
 
 #: Internal modules, libraries
-from ._utils import loading_yaml_to_pathlib_glob
+from ._cache import ResultCache, hashing_content, streaming_cached
+from ._files import loading_yaml_to_pathlib_glob
+from ._profile import profiling
+from ._results import Diagnostic, FileResult, LintResult
 
 #===============#
 #== FUNCTIONS ==#
 #===============#
 
+#--
+def linting_content(content: str, configuration: YamlLintConfig) -> list:
+    """Return the linter problems of the content of a single YAML file"""
+    with profiling("lint"):
+        return list(linter.run(content, configuration))
+
+#--
+def linting_file(yaml_path: Path, configuration: YamlLintConfig) -> list:
+    """Return the linter problems of a single YAML file"""
+    with profiling("read"), open(yaml_path, "r", encoding="utf-8") as yaml_file:
+        content = yaml_file.read()
+    return linting_content(content, configuration)
+
+#-- Linter configuration of the current (worker) process, see `initializing_linter`
+_configuration = None
+
+#--
+@lru_cache(maxsize=8)
+def loading_linter_config(linter_config: str, stamp: tuple) -> YamlLintConfig:
+    """Parsed linter configuration, kept per process as long as the file is unchanged (`stamp`)"""
+    return YamlLintConfig(file=linter_config)
+
+#--
+def initializing_linter(linter_config: Path) -> None:
+    """Parse the linter configuration of a worker process once, before it lints any report"""
+    global _configuration
+    stat = Path(linter_config).stat()
+    _configuration = loading_linter_config(str(Path(linter_config).resolve()), (stat.st_mtime_ns, stat.st_size))
+
+#--
+def linting_report(yaml_path: Path) -> list:
+    """Return the `Diagnostic`s of a single YAML file, using the configuration of the current process"""
+    return [Diagnostic.from_lint_problem(problem) for problem in linting_file(yaml_path, _configuration)]
+
 #-----------------#
 #-- lint_report --#
 #-----------------#
 def reports_linting(
     reports: Path,
-    linter_config: Path
-):
+    linter_config: Path,
+    jobs: int = 1,
+    cache_file: Path | None = None,
+    max_errors: int | None = None,
+    on_result = None
+) -> LintResult:
     """Lint report files using a specified YAML linter configuration.
 
     This function checks the correctness of YAML report files using a specified YAML lint configuration.
-    A table of linter errors is displayed for each file containing errors.
-    The function exits with a non-zero exit code if any errors are found.
+    Nothing is printed and the process is not exited, the problems are returned instead.
 
     :param reports: A path to a single YAML file or a directory containing YAML files to be linted.
                     The default is the 'reports/' directory.
     :param linter_config: A path to the YAML lint configuration file. The default is '.yamllint.yml'.
-    :raises: typer.Exit with a non-zero exit code if any linter errors are found.
+    :param jobs: Number of processes running the linter, each parses the configuration once.
+    :param cache_file: Cache of the linter results. Reports whose content and linter configuration
+                       are unchanged are reported from the cache without being linted.
+    :param max_errors: Stop after this number of linter errors, the remaining files are not linted.
+                       Warnings are reported, but not counted.
+    :param on_result: Called with the `FileResult` of every file in file order, as soon as it is
+                      available, e.g. to print the problems while the remaining files are linted.
+    :returns: the `LintResult` with the linter problems per file.
     """
-    table = Table(title="Linter errors")
-    table.add_column("File", justify="right", style="cyan", no_wrap=True)
-    table.add_column("Messages", style="magenta")
-    configuration = YamlLintConfig(file=linter_config)
-
-    #-- In case where a single file is provided
-
-    yaml_files = loading_yaml_to_pathlib_glob(reports)
-
-    #-- Read and parse yaml linter output
-    for yaml_path in yaml_files:
-        with open(yaml_path, "r", encoding="utf-8") as yaml_file:
-            gen = linter.run(yaml_file, configuration)
-            res = list(gen)
-            if len(res) > 0:
-                table.add_row(str(yaml_path), str(res))
-
-    if table.rows:
-        console = Console()
-        console.print(table)
-        exit(code=1)
-        #raise typer.Exit(code=1)
-    else:
-        print("[green bold]>>> No linting errors found! <<<[/green bold]")
-
-    return table
+    yaml_files = list(loading_yaml_to_pathlib_glob(reports))
+
+    cache = None
+    if cache_file is not None:
+        with open(linter_config, "rb") as file:
+            configuration_hash = hashing_content(YAMLLINT_VERSION.encode("utf-8") + b":" + file.read())
+        cache = ResultCache.shared(cache_file, configuration=configuration_hash)
+
+    #-- Lint in file order, every worker parses the configuration once
+    results = streaming_cached(
+        linting_report,
+        yaml_files,
+        cache=cache,
+        jobs=jobs,
+        initializer=initializing_linter,
+        initargs=(linter_config,)
+    )
+
+    result = LintResult()
+    error_count = 0
+    for yaml_path, diagnostics in zip(yaml_files, results, strict=True):
+        file_result = FileResult(filename=yaml_path, diagnostics=list(diagnostics))
+        result.files.append(file_result)
+        if on_result is not None:
+            on_result(file_result)
+
+        error_count += file_result.error_count
+        if max_errors is not None and error_count >= max_errors:
+            results.close()
+            result.stopped = True
+            break
+
+    return result
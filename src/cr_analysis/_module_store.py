@@ -0,0 +1,47 @@
+"""Compiling the reports into a columnar store"""
+#=============#
+#== IMPORTS ==#
+#=============#
+#: Std. modules, libraries
+from pathlib import Path
+
+#: External modules, libraries
+from rich import print
+
+#: Internal modules, libraries
+from ._utils import loading_yaml_to_dataframe
+from ._store import writing_store
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def reports_store(
+    reports: Path,
+    store: Path,
+    fmt: str = 'parquet',
+    cache_file: Path | None = None,
+    jobs: int = 1
+) -> dict:
+    """Compile the reports into a columnar snapshot.
+
+    Scalar fields are stored as typed columns, list fields as exploded child tables
+    keyed by `zammad_ticket_number`. The store can be used instead of the reports
+    directory by `loading_data`, `reports_analysis` and `plot_html_analysis`.
+
+    :param reports: A path to a single YAML file or a directory containing YAML files.
+    :param store: Destination directory of the store.
+    :param fmt: Table format, `parquet` or `arrow` (Arrow IPC, memory-mapped when loaded).
+    :param cache_file: On-disk cache of parsed reports.
+    :param jobs: Number of processes parsing the reports.
+    :returns: the written tables by name.
+    """
+    df = loading_yaml_to_dataframe(reports=reports, cache_file=cache_file, jobs=jobs)
+    tables = writing_store(dataframe=df, store=store, fmt=fmt)
+
+    print(f"[green bold]>>> Store with {len(df)} reports written to {store} <<<[/green bold]")
+    for name, table in tables.items():
+        print(f"  {name}: {len(table)} rows")
+
+    return tables
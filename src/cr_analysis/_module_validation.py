@@ -3,97 +3,242 @@
 #=============#
 
 #: Std. libraries
+from importlib.metadata import version
 from pathlib import Path
 import datetime
 
 #: External modules, libraries
-import json
-import jsonschema
 import yaml
-from rich import print
+
+try:
+    from yaml import CSafeLoader as YAML_SafeLoader
+except ImportError:
+    from yaml import SafeLoader as YAML_SafeLoader
 
 #: Internal modules, libraries
-from ._utils import loading_yaml_to_pathlib_glob
+from ._cache import ResultCache, hashing_content, streaming_cached
+from ._consistency import checking_consistency
+from ._constants import REPORT_INDEX_FILE
+from ._files import indexing_reports, loading_yaml_to_pathlib_glob
+from ._index import indexing_report
+from ._profile import profiled, profiling
+from ._results import Diagnostic, FileResult, ValidationResult
+from ._validator import ReportValidator, building_validator, validator_backend
+
 
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Increase whenever the layout of the cached validation results changes
+VALIDATION_RESULT_VERSION = 3
 
 #===============#
 #== FUNCTIONS ==#
 #===============#
 
+#--
+def parsing_report(content):
+    """Safely parse the content of a single report.
+
+    :returns: the report and, if the content could not be parsed, the error position
+              as (line, column) or (None, None) when the position is unknown.
+    """
+    try:
+        with profiling("parse"):
+            return yaml.load(content, Loader=YAML_SafeLoader), None
+    except yaml.YAMLError as e:
+        if hasattr(e, "problem_mark"):
+            mark = e.problem_mark
+            return None, (mark.line, mark.column + 1)
+        return None, (None, None)
+
+#--
+def loading_report(filename: Path):
+    """Safely load a single report, see `parsing_report`"""
+    with profiling("read"), open(filename, "r", encoding="utf-8") as file:
+        content = file.read()
+    return parsing_report(content)
+
+#--
+@profiled("validate")
+def validating_report(report: dict, validator: ReportValidator) -> list:
+    """Check a parsed report against the schema and the workload distribution.
+
+    :returns: the `Diagnostic`s, empty if the report is valid.
+    """
+    diagnostics = []
+
+    # Convert datetime objects to ISO8601 string
+    # Other documents, e.g. an empty file (None), are reported by the schema
+    if isinstance(report, dict):
+        report = {
+            key: report[key]
+            if not isinstance(report[key], (datetime.date, datetime.datetime))
+            else report[key].isoformat()
+            for key in list(report)
+        }
+
+    for error in validator.collecting_errors(report):
+        diagnostics.append(
+            Diagnostic(
+                message=error.message,
+                rule='schema',
+                schema_path=tuple(error.absolute_schema_path),
+                context=tuple((c.message, tuple(c.absolute_schema_path)) for c in error.context)
+            )
+        )
+
+    # Check if workload_percentage_distribution sums up to 100
+    # A missing or malformed distribution is already reported by the schema
+    workload = report.get("workload_percentage_distribution") if isinstance(report, dict) else None
+    if not isinstance(workload, dict) or not all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) for value in workload.values()
+    ):
+        return diagnostics
+
+    sum_workload = sum(workload.values())
+    if sum_workload != 100:
+        diagnostics.append(
+            Diagnostic(
+                message=f"Workload % distribution doesn't add up to 100 (current sum: {sum_workload})",
+                rule='workload'
+            )
+        )
+
+    return diagnostics
+
+#--
+def loading_problem_diagnostics(problem: tuple) -> list:
+    """Diagnostics of a report that could not be parsed, see `parsing_report`"""
+    line, column = problem
+    return [Diagnostic(message="Error while loading", rule='syntax', line=line, column=column)]
+
+#-- Validator of the current (worker) process, see `initializing_validator`
+_validator = None
+
+#--
+def initializing_validator(schema_text: str, cache_dir: Path | None = None) -> None:
+    """Build the validator of a worker process once, before it validates any report"""
+    global _validator
+    _validator = building_validator(schema_text, cache_dir=cache_dir)
+
+#--
+def validating_file(filename: Path) -> tuple:
+    """Load and validate a single report with the validator of the current process.
+
+    :returns: the `Diagnostic`s, empty if the report is valid, and the index entry of the
+              report for the cross-report checks (None if it could not be loaded).
+    """
+    report, problem = loading_report(filename)
+    if problem is not None:
+        return loading_problem_diagnostics(problem), None
+
+    entry = indexing_report(report) if isinstance(report, dict) else None
+    return validating_report(report, _validator), entry
+
+#--
+def checking_corpus(
+    entries: list,
+    corpus: Path | None = None,
+    index_file: Path | None = REPORT_INDEX_FILE,
+    jobs: int = 1
+) -> list:
+    """Cross-report checks of the given reports, see `checking_consistency`.
+
+    :param entries: pairs of report file and index entry of the checked reports.
+    :param corpus: Directory of all reports, if `entries` only cover a selection of them. The entries
+                   of the other reports are taken from the sidecar index `index_file`, only reports
+                   without a valid index entry are parsed.
+    :returns: the problems as plain text messages, empty if the reports are consistent.
+    """
+    selected = None
+    if corpus is not None:
+        selected = [filename for filename, _ in entries]
+        checked = {Path(filename).resolve() for filename in selected}
+        index = indexing_reports(corpus, index_file=index_file, jobs=jobs)
+        for filename in loading_yaml_to_pathlib_glob(corpus):
+            entry = index.looking_up(filename)
+            if entry is not None and Path(filename).resolve() not in checked:
+                entries.append((filename, entry))
+
+    return checking_consistency(entries, selected=selected)
+
 #----------------------#
 #-- validate_reports --#
 #----------------------#
 def reports_validation(
     reports: Path,
     schema_file: Path,
-    ):
+    jobs: int = 1,
+    cache_file: Path | None = None,
+    corpus: Path | None = None,
+    index_file: Path | None = REPORT_INDEX_FILE,
+    on_result = None,
+    validator_cache_dir: Path | None = None
+    ) -> ValidationResult:
     """
     Validate report files against a JSON schema.
 
     This function checks the correctness and validity of report YAML files against a JSON schema.
-    It prints validation results and exits with a non-zero exit code if any errors are found.
+    Afterwards the reports are checked against each other for duplicated ticket numbers, ticket
+    links and project names and for filenames not matching the ticket number, see `checking_consistency`.
+    Nothing is printed and the process is not exited, the problems are returned instead.
 
     :param reports: A path to a single YAML file or a directory containing YAML files to be validated.
                     The default is the 'reports/' directory.
     :param schema_file: A path to the JSON schema file used for validation.
                     The default is './templates/consultation-report.schema.json'.
-    :returns: error id, if set to 1 it it indicate an error.
+    :param jobs: Number of processes parsing and validating the report files.
+    :param cache_file: Cache of the validation results. Reports whose content, schema and validator
+                    (see `validator_backend`) are unchanged are reported from the cache without
+                    being parsed.
+    :param corpus: Directory of all reports, if `reports` is only a selection of them, e.g. the
+                    changed reports. The selected reports are checked against all reports of
+                    the corpus via the sidecar index `index_file`.
+    :param index_file: Sidecar index of the corpus. With None the corpus is indexed in memory
+                    and nothing is written.
+    :param on_result: Called with the `FileResult` of every file in file order, as soon as it is
+                    available, e.g. to print the problems while the remaining files are validated.
+    :param validator_cache_dir: Cache of the compiled schema validators, see `compiling_schema`.
+                    With None the validator is compiled in memory and nothing is written.
+    :returns: the `ValidationResult` with the problems per file and between the reports.
     """
-
-    errors = False
-
-    yaml_files = loading_yaml_to_pathlib_glob(reports)
+    yaml_files = list(loading_yaml_to_pathlib_glob(reports))
 
     with open(schema_file, "r", encoding="utf-8") as schema_file_object:
-        schema = json.load(schema_file_object)
-
-    validator = jsonschema.Draft7Validator(schema)
-
-    for filename in yaml_files:
-        #-- open each file
-        with open(filename, "r", encoding="utf-8") as file:
-            try:
-                report = yaml.safe_load(file)
-            except yaml.YAMLError as e:
-                errors = True
-                print(f"[bold red]Error while loading {filename}[/bold red]")
-                if hasattr(e, "problem_mark"):
-                    mark = e.problem_mark
-                    print(f"  Error position: (Line {mark.line}:Column {mark.column + 1})")
-
-            # Convert datetime objects to ISO8601 string
-            report = {
-                key: report[key]
-                if not isinstance(report[key], (datetime.date, datetime.datetime))
-                else report[key].isoformat()
-                for key in list(report)
-            }
-
-            if not validator.is_valid(report):
-                errors = True
-                print(f"[bold red]{filename}: Validation failed[/bold red]")
-                for error in validator.iter_errors(report):
-                    print(
-                        f"[bold red]  * {error.message} at {error.absolute_schema_path}[/bold red]"
-                    )
-                    for c in error.context:
-                        print(
-                            f"[bold red]\t\tContext: {c.message} at {c.absolute_schema_path}[/bold red]"
-                        )
-
-            # Check if workload_percentage_distribution sums up to 100
-            sum_workload = sum(report["workload_percentage_distribution"].values())
-            if sum_workload != 100:
-                errors = True
-                print(
-                    f"[bold red]{filename}: Workload % distribution doesn't add up to 100 (current sum: {sum_workload})[/bold red]"
-                )
-
-    #-- Error handling
-    if errors == 0:
-        print("[green bold]>>> No validation errors found! <<<[/green bold]")
-    else:
-        exit(code=1)
-        #raise typer.Exit(code=1)
-
-    return 0
+        schema_text = schema_file_object.read()
+
+    cache = None
+    if cache_file is not None:
+        cache = ResultCache.shared(
+            cache_file,
+            configuration=hashing_content(
+                f"{VALIDATION_RESULT_VERSION}:{version('jsonschema')}:{validator_backend()}:{schema_text}".encode("utf-8")
+            )
+        )
+
+    #-- Every worker builds its validator once; the results stay in file order
+    results = streaming_cached(
+        validating_file,
+        yaml_files,
+        cache=cache,
+        jobs=jobs,
+        initializer=initializing_validator,
+        initargs=(schema_text, validator_cache_dir)
+    )
+
+    result = ValidationResult()
+    entries = []
+    for filename, (diagnostics, entry) in zip(yaml_files, results, strict=True):
+        if entry is not None:
+            entries.append((filename, entry))
+        #-- A copy, the diagnostics may be shared with the cache
+        file_result = FileResult(filename=filename, diagnostics=list(diagnostics))
+        result.files.append(file_result)
+        if on_result is not None:
+            on_result(file_result)
+
+    #-- Cross-report checks
+    result.consistency = checking_corpus(entries, corpus=corpus, index_file=index_file, jobs=jobs)
+
+    return result
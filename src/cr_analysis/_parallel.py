@@ -0,0 +1,106 @@
+"""Process pool helpers"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import math
+import os
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Items per task when streaming, the total number of items is unknown in advance
+STREAMING_CHUNKSIZE = 16
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def resolving_jobs(jobs: int) -> int:
+    """Number of worker processes; zero or negative values use all available cores"""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+#--
+def mapping_parallel(
+    function,
+    items,
+    jobs: int = 1,
+    chunksize: int | None = None,
+    initializer=None,
+    initargs: tuple = ()
+) -> list:
+    """Apply `function` to all `items` and return the results in the order of `items`.
+
+    With `jobs` > 1 the items are spread in chunks over a process pool, `function`
+    and the items have to be picklable in this case. `initializer(*initargs)` is called
+    once per worker process, or once in the current process without a pool.
+    """
+    items = list(items)
+    jobs = min(resolving_jobs(jobs), len(items))
+
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [function(item) for item in items]
+
+    if chunksize is None:
+        #-- A few chunks per worker balance the load without too much overhead
+        chunksize = max(1, math.ceil(len(items) / (jobs * 4)))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(function, items, chunksize=chunksize))
+
+#--
+def chunking(items, size: int):
+    """Yield lists of up to `size` consecutive items"""
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+#--
+def _applying(function, chunk: list) -> list:
+    return [function(item) for item in chunk]
+
+#--
+def streaming_parallel(
+    function,
+    items,
+    jobs: int = 1,
+    chunksize: int = STREAMING_CHUNKSIZE,
+    initializer=None,
+    initargs: tuple = ()
+):
+    """Apply `function` to all `items` and yield the results in the order of `items`.
+
+    Unlike `mapping_parallel` the items are consumed lazily and the results are handed
+    out as soon as they are available. With `jobs` > 1 at most two chunks per worker are
+    in flight, so that the memory stays bounded for arbitrarily long inputs.
+    `initializer(*initargs)` is called once per worker process, see `mapping_parallel`.
+    """
+    jobs = resolving_jobs(jobs)
+
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(function, items)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+    try:
+        pending = deque()
+        for chunk in chunking(items, chunksize):
+            pending.append(executor.submit(_applying, function, chunk))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        #-- A consumer stopping early (e.g. fail-fast) drops the chunks not yet started
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,244 @@
+"""Wall and CPU time of the stages of a run, see `reporting --profile`
+
+The library marks its stages (globbing, reading, parsing, building the dataframe, filtering,
+every KPI function, the figures and the HTML output, linting and validating) with `profiling`.
+Without an enabled profiler this is a no-op. The times of a stage exclude the times of the
+stages nested in it, so the stages add up to the total time of the run.
+
+Only the stages of the current process are recorded: with `--jobs` > 1 the work done in the
+worker processes shows up as time outside of the stages.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+import os
+import time
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- The profiler of the process, set by `enabling_profiler`
+PROFILER = None
+
+#-- Shared by all stages while no profiler is enabled
+NO_STAGE = nullcontext()
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+@dataclass
+class StageRecord:
+    """Accumulated times of all calls of a stage.
+
+    :param wall: Wall time in seconds, without the nested stages.
+    :param cpu: CPU time of the process in seconds, without the nested stages.
+    :param peak: Largest increase of the traced memory during a call, in bytes (only with dumps).
+    """
+    name: str
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak: int = 0
+    profile: object = None
+    snapshot: object = None
+
+#--
+@dataclass
+class StageFrame:
+    """A running call of a stage"""
+    record: StageRecord
+    start_memory: int = 0
+    peak_memory: int = 0
+    nested_wall: float = 0.0
+    nested_cpu: float = 0.0
+
+#--
+class Profiler:
+    """Recorder of the stages of the current process.
+
+    :param dump_directory: Write a cProfile dump (`<stage>.prof`) and a tracemalloc snapshot
+                           (`<stage>.tracemalloc`) per stage into this directory, see `dumping`.
+                           Tracing the memory slows the run down noticeably.
+    """
+
+    def __init__(self, dump_directory: Path | None = None):
+        self.pid = os.getpid()
+        self.dump_directory = None if dump_directory is None else Path(dump_directory)
+        self.records: dict = {}
+        self.stack: list = []
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.process_time()
+
+        if self.dump_directory is not None:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    #--
+    @property
+    def dumping_enabled(self) -> bool:
+        return self.dump_directory is not None
+
+    #--
+    @contextmanager
+    def stage(self, name: str):
+        """Record the enclosed code as a call of the stage `name`"""
+        if os.getpid() != self.pid:
+            #-- A forked worker process, its records would be lost
+            yield
+            return
+
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = StageRecord(name=name)
+        parent = self.stack[-1] if self.stack else None
+
+        frame = StageFrame(record=record)
+        if self.dumping_enabled:
+            self.entering_dump(frame, parent)
+        self.stack.append(frame)
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            self.stack.pop()
+
+            record.calls += 1
+            record.wall += wall - frame.nested_wall
+            record.cpu += cpu - frame.nested_cpu
+
+            if self.dumping_enabled:
+                self.leaving_dump(frame, parent)
+
+            if parent is not None:
+                #-- Including the time of the dumps, which is no time of the parent
+                parent.nested_wall += time.perf_counter() - start_wall
+                parent.nested_cpu += time.process_time() - start_cpu
+
+    #--
+    def entering_dump(self, frame: StageFrame, parent: StageFrame | None) -> None:
+        """Switch the cProfile profiler and the memory peak from the parent stage to `frame`"""
+        import cProfile
+        import tracemalloc
+
+        if parent is not None:
+            #-- Only one profiler can be active at a time
+            parent.record.profile.disable()
+            parent.peak_memory = max(parent.peak_memory, tracemalloc.get_traced_memory()[1])
+
+        tracemalloc.reset_peak()
+        frame.start_memory = tracemalloc.get_traced_memory()[0]
+        if frame.record.profile is None:
+            frame.record.profile = cProfile.Profile()
+        frame.record.profile.enable()
+
+    #--
+    def leaving_dump(self, frame: StageFrame, parent: StageFrame | None) -> None:
+        """Switch the cProfile profiler and the memory peak back from `frame` to the parent stage"""
+        import tracemalloc
+
+        frame.record.profile.disable()
+        peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+
+        #-- The snapshot of the call with the highest peak, taken at its end
+        if peak_memory - frame.start_memory > frame.record.peak or frame.record.snapshot is None:
+            frame.record.peak = max(frame.record.peak, peak_memory - frame.start_memory)
+            frame.record.snapshot = tracemalloc.take_snapshot()
+
+        if parent is not None:
+            parent.peak_memory = max(parent.peak_memory, peak_memory)
+            tracemalloc.reset_peak()
+            parent.record.profile.enable()
+
+    #--
+    def summary(self) -> list:
+        """`StageRecord`s in the order of their first call, followed by the time outside of the stages"""
+        records = list(self.records.values())
+        wall = time.perf_counter() - self.started_wall
+        cpu = time.process_time() - self.started_cpu
+        records.append(StageRecord(
+            name='other',
+            wall=max(wall - sum(record.wall for record in records), 0.0),
+            cpu=max(cpu - sum(record.cpu for record in records), 0.0)
+        ))
+        return records
+
+    #--
+    def dumping(self) -> list:
+        """Write the cProfile dumps and tracemalloc snapshots of all stages.
+
+        The dumps are read with `python -m pstats <stage>.prof` (or e.g. snakeviz) and
+        `tracemalloc.Snapshot.load('<stage>.tracemalloc')`.
+
+        :returns: the written files.
+        """
+        if self.dump_directory is None:
+            return []
+
+        self.dump_directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        for record in self.records.values():
+            if record.profile is not None:
+                record.profile.dump_stats(self.dump_directory / f"{record.name}.prof")
+                written.append(self.dump_directory / f"{record.name}.prof")
+            if record.snapshot is not None:
+                record.snapshot.dump(str(self.dump_directory / f"{record.name}.tracemalloc"))
+                written.append(self.dump_directory / f"{record.name}.tracemalloc")
+        return written
+
+    #--
+    def stopping(self) -> None:
+        if self.dumping_enabled:
+            import tracemalloc
+
+            tracemalloc.stop()
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def enabling_profiler(dump_directory: Path | None = None) -> Profiler:
+    """Start recording the stages of this process, see `Profiler`"""
+    global PROFILER
+    PROFILER = Profiler(dump_directory=dump_directory)
+    return PROFILER
+
+#--
+def disabling_profiler() -> Profiler | None:
+    """Stop recording the stages and return the profiler with the records, if one was enabled"""
+    global PROFILER
+    profiler, PROFILER = PROFILER, None
+    if profiler is not None:
+        profiler.stopping()
+    return profiler
+
+#--
+def profiling(stage: str):
+    """Context manager recording the enclosed code as a call of `stage`, a no-op without profiler"""
+    if PROFILER is None:
+        return NO_STAGE
+    return PROFILER.stage(stage)
+
+#--
+def profiled(stage: str):
+    """Decorator recording every call of the function as a call of `stage`, see `profiling`"""
+    def decorating(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with profiling(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorating
@@ -0,0 +1,180 @@
+"""Structured results of linting and validating the reports
+
+The library functions return these objects instead of printing and exiting, so they can be
+called repeatedly in one process, e.g. by daemons, notebooks or batch drivers. Rendering
+and exit codes are left to the caller, see `cr_cli`.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+@dataclass(frozen=True)
+class Diagnostic:
+    """A single problem of a report.
+
+    :param message: Human-readable description of the problem.
+    :param rule: What detected the problem: the yamllint rule, or `syntax`, `schema` and
+                 `workload` for the validation.
+    :param line: Line of the problem, if known.
+    :param column: Column of the problem, if known.
+    :param level: `error` or `warning`.
+    :param schema_path: Path of the failing keyword in the JSON schema, for `schema` problems.
+    :param context: Messages and schema paths of the sub-schemas that failed, for `schema` problems.
+    """
+    message: str
+    rule: str | None = None
+    line: int | None = None
+    column: int | None = None
+    level: str = 'error'
+    schema_path: tuple = ()
+    context: tuple = ()
+
+    #--
+    @classmethod
+    def from_lint_problem(cls, problem) -> "Diagnostic":
+        """Diagnostic of a `yamllint.linter.LintProblem`"""
+        return cls(
+            message=problem.message,
+            rule=problem.rule,
+            line=problem.line,
+            column=problem.column,
+            level=problem.level or 'error'
+        )
+
+    #--
+    @classmethod
+    def from_dict(cls, data: dict) -> "Diagnostic":
+        """Diagnostic of the JSON representation `asdict(diagnostic)`"""
+        return cls(**{
+            **data,
+            'schema_path': tuple(data.get('schema_path', ())),
+            'context': tuple((message, tuple(path)) for message, path in data.get('context', ())),
+        })
+
+#--
+@dataclass
+class FileResult:
+    """Diagnostics of a single report file, empty if the report passed"""
+    filename: Path
+    diagnostics: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.diagnostics
+
+    @property
+    def error_count(self) -> int:
+        return sum(diagnostic.level == 'error' for diagnostic in self.diagnostics)
+
+    #--
+    def to_dict(self) -> dict:
+        return {
+            'filename': str(self.filename),
+            'diagnostics': [asdict(diagnostic) for diagnostic in self.diagnostics],
+        }
+
+    #--
+    @classmethod
+    def from_dict(cls, data: dict) -> "FileResult":
+        return cls(
+            filename=Path(data['filename']),
+            diagnostics=[Diagnostic.from_dict(diagnostic) for diagnostic in data['diagnostics']]
+        )
+
+#--
+@dataclass
+class CheckResult:
+    """Diagnostics of all checked report files, in file order.
+
+    :param files: `FileResult` of every checked report file.
+    :param stopped: The check stopped early, the remaining files were not checked.
+    """
+    files: list = field(default_factory=list)
+    stopped: bool = False
+
+    @property
+    def failed(self) -> list:
+        """The `FileResult`s with diagnostics"""
+        return [result for result in self.files if not result.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def error_count(self) -> int:
+        return sum(result.error_count for result in self.files)
+
+    #--
+    def summary(self) -> dict:
+        """Summary counts, e.g. for logs or JSON output"""
+        return {
+            'files': len(self.files),
+            'failed_files': len(self.failed),
+            'diagnostics': sum(len(result.diagnostics) for result in self.files),
+            'errors': self.error_count,
+            'stopped': self.stopped,
+        }
+
+    #--
+    def to_dict(self) -> dict:
+        """JSON compatible representation, e.g. for `reporting serve`"""
+        return {
+            'files': [result.to_dict() for result in self.files],
+            'stopped': self.stopped,
+        }
+
+    #--
+    @classmethod
+    def from_dict(cls, data: dict) -> "CheckResult":
+        """Result of the representation of `to_dict`"""
+        return cls(
+            files=[FileResult.from_dict(result) for result in data['files']],
+            stopped=data['stopped']
+        )
+
+#--
+@dataclass
+class LintResult(CheckResult):
+    """Result of `reports_linting`"""
+
+#--
+@dataclass
+class ValidationResult(CheckResult):
+    """Result of `reports_validation`.
+
+    :param consistency: Problems between reports, e.g. duplicated ticket numbers, see `checking_consistency`.
+    """
+    consistency: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.consistency
+
+    @property
+    def error_count(self) -> int:
+        return super().error_count + len(self.consistency)
+
+    #--
+    def summary(self) -> dict:
+        return {**super().summary(), 'consistency': len(self.consistency)}
+
+    #--
+    def to_dict(self) -> dict:
+        return {**super().to_dict(), 'consistency': list(self.consistency)}
+
+    #--
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationResult":
+        result = super().from_dict(data)
+        result.consistency = list(data['consistency'])
+        return result
@@ -0,0 +1,336 @@
+"""Mergeable partial KPI states for map-reduce aggregation over shards of reports"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from collections import Counter
+from functools import partial
+from pathlib import Path
+import copy
+
+#: External modules, libraries
+import numpy
+import pandas
+
+#: Internal modules, libraries
+from ._files import loading_yaml_to_pathlib_glob
+from ._index import indexing_report
+from ._parallel import chunking, streaming_parallel
+from ._tables import CATEGORICAL_FIELDS, PEOPLE_FIELDS, mapping_columns
+from ._profile import profiling
+from ._utils import (
+    building_dataframe,
+    loading_yaml_file,
+    preparing_data,
+    selecting_reports,
+    counting_affiliations,
+    counting_occurrence,
+    counting_main_types
+)
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- List fields whose occurrence is counted
+OCCURRENCE_FIELDS = tuple(column for column in CATEGORICAL_FIELDS if column not in PEOPLE_FIELDS)
+
+#-- Reports per shard if not given otherwise
+SHARD_SIZE = 1000
+
+#-- Reports per shard of `IncrementalKPIState`, small shards keep the updates cheap
+UPDATE_SHARD_SIZE = 64
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class KPIState:
+    """Partial aggregate of the KPIs of a set of reports.
+
+    Only counts and sums are kept: counters for the affiliations, the list fields
+    (`OCCURRENCE_FIELDS`), the main request types and the starting months, sums and counts
+    of the workload distribution and a histogram of the final workloads. The states of
+    disjoint sets of reports are merged with `+`, so the KPIs can be computed per shard,
+    chunk or worker process and combined afterwards, or updated by single new reports.
+    """
+
+    def __init__(self):
+        self.tickets = 0
+        self.affiliations = {column: Counter() for column in PEOPLE_FIELDS}
+        self.occurrence = {column: Counter() for column in OCCURRENCE_FIELDS}
+        self.main_types = Counter()
+        self.workload_sums = Counter()
+        self.workload_counts = Counter()
+        self.months = Counter()
+        self.final_workload = Counter()
+
+    #--
+    @classmethod
+    def from_dataframe(cls, dataframe: pandas.DataFrame) -> "KPIState":
+        """State of already loaded and filtered reports, see `loading_data`"""
+        state = cls()
+        state.tickets = len(dataframe)
+        if not len(dataframe):
+            return state
+
+        for column in PEOPLE_FIELDS:
+            state.affiliations[column].update(
+                counting_affiliations(dataframe=dataframe, column=column, output='absolute').to_dict()
+            )
+        for column in OCCURRENCE_FIELDS:
+            state.occurrence[column].update(
+                counting_occurrence(dataframe=dataframe, column=column, output='absolute').to_dict()
+            )
+        state.main_types.update(counting_main_types(dataframe=dataframe, output='absolute').to_dict())
+
+        with profiling("kpi.workload"):
+            workload = dataframe[mapping_columns(dataframe, 'workload_percentage_distribution')]
+            state.workload_sums.update(workload.sum().to_dict())
+            state.workload_counts.update(workload.count().to_dict())
+
+        with profiling("kpi.months"):
+            starts = dataframe['start_date'].dropna()
+            state.months.update(starts.dt.month.value_counts().sort_index().to_dict())
+        state.final_workload.update(dataframe['final_workload'].dropna().tolist())
+
+        return state
+
+    #--
+    @classmethod
+    def from_reports(
+        cls,
+        records: list,
+        year: int | None = None,
+        center = 'all',
+        role: str = 'lead'
+    ) -> "KPIState":
+        """State of parsed reports, only counting the reports passing the filters of `loading_data`"""
+        dataframe = preparing_data(building_dataframe(records), year=year, center=center, role=role)
+        return cls.from_dataframe(dataframe)
+
+    #--
+    def __iadd__(self, other: "KPIState") -> "KPIState":
+        #-- `update` instead of `+=`, which would drop zero counts
+        self.tickets += other.tickets
+        for column, counts in other.affiliations.items():
+            self.affiliations.setdefault(column, Counter()).update(counts)
+        for column, counts in other.occurrence.items():
+            self.occurrence.setdefault(column, Counter()).update(counts)
+        self.main_types.update(other.main_types)
+        self.workload_sums.update(other.workload_sums)
+        self.workload_counts.update(other.workload_counts)
+        self.months.update(other.months)
+        self.final_workload.update(other.final_workload)
+        return self
+
+    #--
+    def __add__(self, other: "KPIState") -> "KPIState":
+        state = copy.deepcopy(self)
+        state += other
+        return state
+
+    #--
+    def counting_affiliations(self, column: str, add: str = "None") -> pandas.Series:
+        """Absolute affiliation counts, see `counting_affiliations`"""
+        counts = Counter(self.affiliations[column])
+        if add != "None":
+            counts.update(self.affiliations[add])
+        return ranking(counts)
+
+    #--
+    def counting_occurrence(self, column: str) -> pandas.Series:
+        """Absolute occurrence counts, see `counting_occurrence`"""
+        return ranking(self.occurrence[column])
+
+    #--
+    def counting_main_types(self) -> pandas.Series:
+        """Absolute main request type counts, see `counting_main_types`"""
+        return pandas.Series(self.main_types, dtype='int64', name='count')
+
+    #--
+    def workload_averages(self) -> pandas.Series:
+        """Average of each `workload_percentage_distribution` column"""
+        return pandas.Series(
+            {column: total / self.workload_counts[column] for column, total in self.workload_sums.items()},
+            dtype=float
+        )
+
+    #--
+    def monthly_requests(self) -> pandas.Series:
+        """Ticket count per month number"""
+        return pandas.Series(self.months, dtype='int64').sort_index()
+
+    #--
+    def workload_mean(self) -> float:
+        histogram = pandas.Series(self.final_workload, dtype='int64')
+        if histogram.empty:
+            return numpy.float64('nan')
+        return numpy.float64(numpy.average(histogram.index.to_numpy(dtype=float), weights=histogram.to_numpy()))
+
+    #--
+    def workload_median(self) -> float:
+        """Exact median, from the histogram of the final workloads"""
+        histogram = pandas.Series(self.final_workload, dtype='int64').sort_index()
+        if histogram.empty:
+            return numpy.float64('nan')
+
+        cumulative = histogram.cumsum().to_numpy()
+        count = cumulative[-1]
+        lower = histogram.index[cumulative.searchsorted((count + 1) // 2)]
+        upper = histogram.index[cumulative.searchsorted(count // 2 + 1)]
+
+        return numpy.float64((lower + upper) / 2)
+
+#--
+class IncrementalKPIState:
+    """`KPIState` of a changing set of report files, e.g. while watching the reports directory.
+
+    The files are kept in small shards with one `KPIState` each. `updating` re-aggregates
+    only the shards holding changed, new or deleted files and merges the shard states again,
+    instead of parsing and aggregating all reports.
+
+    :param reports: A path to a single YAML file or a directory containing YAML files.
+    :param shard_size: Maximum number of files per shard.
+    """
+
+    def __init__(
+        self,
+        reports: Path,
+        year: int | None = None,
+        center = 'all',
+        role: str = 'lead',
+        jobs: int = 1,
+        shard_size: int = UPDATE_SHARD_SIZE
+    ):
+        self.reports = reports
+        self.year = year
+        self.center = center
+        self.role = role
+        self.jobs = jobs
+        self.shard_size = shard_size
+        self.shards: list = [list(shard) for shard in chunking(loading_yaml_to_pathlib_glob(reports), shard_size)]
+        self.states: list = [None] * len(self.shards)
+        #-- Shards to aggregate again, kept until an update succeeded
+        self.dirty = set(range(len(self.shards)))
+        self.updating()
+
+    #--
+    def aggregating(self, positions) -> None:
+        """Aggregate the shards at `positions` again"""
+        positions = list(positions)
+        results = streaming_parallel(
+            partial(aggregating_shard, year=self.year, center=self.center, role=self.role),
+            [self.shards[position] for position in positions],
+            jobs=self.jobs,
+            chunksize=1
+        )
+        for position, (state, _) in zip(positions, results):
+            self.states[position] = state
+
+    #--
+    def updating(self, changed=()) -> None:
+        """Account for the changed report files, new and deleted files are found by a scan of `reports`"""
+        files = {Path(filename) for filename in loading_yaml_to_pathlib_glob(self.reports)}
+        changed = {Path(filename) for filename in changed}
+
+        known = set()
+        for position, shard in enumerate(self.shards):
+            kept = [filename for filename in shard if filename in files]
+            if len(kept) != len(shard) or changed.intersection(shard):
+                self.dirty.add(position)
+            self.shards[position] = kept
+            known.update(kept)
+
+        for filename in sorted(files - known):
+            if not self.shards or len(self.shards[-1]) >= self.shard_size:
+                self.shards.append([])
+                self.states.append(None)
+            self.shards[-1].append(filename)
+            self.dirty.add(len(self.shards) - 1)
+
+        self.aggregating(sorted(self.dirty))
+        self.dirty.clear()
+
+    #--
+    @property
+    def state(self) -> KPIState:
+        """The merged `KPIState` of all reports"""
+        state = KPIState()
+        for partial_state in self.states:
+            state += partial_state
+        return state
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def ranking(counts: Counter) -> pandas.Series:
+    """Counts as series, ordered like `value_counts`"""
+    return (
+        pandas.Series(counts, dtype='int64', name='count')
+        .sort_values(ascending=False, kind='stable')
+    )
+
+#--
+def aggregating_shard(
+    yaml_files: list,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead'
+) -> tuple:
+    """Parse and aggregate a shard of report files, e.g. in a worker process.
+
+    :returns: the `KPIState` of the shard and the index entries of its files (None for unparsable files).
+    """
+    records = [loading_yaml_file(filename) for filename in yaml_files]
+    entries = [indexing_report(record) if isinstance(record, dict) else None for record in records]
+
+    return KPIState.from_reports(records, year=year, center=center, role=role), entries
+
+#--
+def aggregating_reports(
+    reports: Path,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead',
+    jobs: int = 1,
+    shard_size: int = SHARD_SIZE,
+    index_file: Path | None = None
+) -> KPIState:
+    """Map-reduce aggregation of the KPIs of the reports of `year` and `center`.
+
+    The report files are split into shards of `shard_size` files. Every shard is parsed and
+    aggregated into a `KPIState`, in parallel with `jobs` > 1, and the states are merged
+    in order. Only the reports of the shards in flight are held in memory.
+
+    With an `index_file` reports that cannot match are not parsed, see `loading_yaml_filtered`.
+    """
+    index, yaml_files, unindexed = selecting_reports(
+        reports,
+        index_file=index_file,
+        year=year,
+        center=center,
+        role=role
+    )
+    shards = list(chunking(yaml_files, shard_size))
+
+    state = KPIState()
+    results = streaming_parallel(
+        partial(aggregating_shard, year=year, center=center, role=role),
+        shards,
+        jobs=jobs,
+        chunksize=1
+    )
+    for shard, (partial_state, entries) in zip(shards, results):
+        state += partial_state
+        for filename, entry in zip(shard, entries):
+            if filename in unindexed and entry is not None:
+                index.storing(filename, entry)
+
+    if index is not None:
+        index.saving()
+
+    return state
@@ -0,0 +1,243 @@
+"""Columnar snapshot (store) of the reports directory
+
+The store is a directory holding one table with the scalar fields of all reports
+and one exploded child table per list field, keyed by the row of the report (`report_row`).
+Ticket numbers are not unique, several reports may share one (see `checking_consistency`).
+Tables are written as Parquet or Arrow IPC files. Arrow IPC files are memory-mapped when loaded.
+
+Requires the optional dependency `pyarrow`.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import json
+
+#: External modules, libraries
+import pandas
+
+#: Internal modules, libraries
+from ._tables import (
+    MAPPING_FIELDS,
+    PEOPLE_FIELDS,
+    PEOPLE_COLUMNS,
+    exploding_people,
+    exploding_values,
+    flattening_mappings
+)
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+STORE_VERSION = 2
+STORE_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+STORE_MANIFEST = 'manifest.json'
+STORE_MAIN_TABLE = 'reports'
+STORE_KEY = 'report_row'
+
+DATE_FIELDS = ('start_date', 'end_date')
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def _importing_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "The report store requires pyarrow. Install it via `poetry install --with store`."
+        ) from error
+    return pyarrow
+
+#--
+def exploding_list_field(dataframe: pandas.DataFrame, column: str) -> pandas.DataFrame:
+    """Long format child table of a list field, keyed by the row position of the report in `dataframe`.
+
+    Person lists are split into the columns `name` and `affiliation`, all other lists
+    into a `value` column. `position` keeps the order within each report.
+    """
+    if column in PEOPLE_FIELDS:
+        child = exploding_people(dataframe, column)
+        child[PEOPLE_COLUMNS] = child[PEOPLE_COLUMNS].astype('string')
+    else:
+        values = exploding_values(dataframe, column)
+        child = pandas.DataFrame({
+            'position': values.groupby(level=0).cumcount(),
+            'value': values.astype('string'),
+        })
+    child.insert(0, STORE_KEY, dataframe.index.get_indexer(child.index))
+
+    return child.reset_index(drop=True)
+
+#--
+def splitting_reports(dataframe: pandas.DataFrame) -> dict:
+    """Split the report dataframe into the main table and one child table per list field"""
+    list_fields = [
+        column for column in dataframe.columns
+        if column not in MAPPING_FIELDS
+        and dataframe[column].map(lambda value: isinstance(value, list)).any()
+    ]
+
+    main = flattening_mappings(dataframe.drop(columns=list_fields))
+    main.insert(0, STORE_KEY, range(len(main)))
+
+    for column in DATE_FIELDS:
+        if column in main:
+            main[column] = pandas.to_datetime(main[column])
+
+    tables = {STORE_MAIN_TABLE: main.convert_dtypes().reset_index(drop=True)}
+    for column in list_fields:
+        tables[column] = exploding_list_field(dataframe, column)
+
+    return tables
+
+#--
+def writing_store(
+    dataframe: pandas.DataFrame,
+    store: Path,
+    fmt: str = 'parquet'
+) -> dict:
+    """Write the report dataframe as columnar store.
+
+    :param dataframe: Reports as loaded by `loading_yaml_to_dataframe`.
+    :param store: Destination directory of the store.
+    :param fmt: Table format, `parquet` or `arrow` (Arrow IPC).
+    :returns: the written tables by name.
+    """
+    pyarrow = _importing_pyarrow()
+
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"Unknown store format {fmt}. Available formats are: {'|'.join(STORE_FORMATS)}")
+
+    tables = splitting_reports(dataframe)
+
+    store = Path(store)
+    store.mkdir(parents=True, exist_ok=True)
+    for name, table in tables.items():
+        arrow_table = pyarrow.Table.from_pandas(table, preserve_index=False)
+        filename = store / f"{name}{STORE_FORMATS[fmt]}"
+        if fmt == 'parquet':
+            pyarrow.parquet.write_table(arrow_table, filename)
+        else:
+            #-- Uncompressed, so that the tables can be memory-mapped
+            pyarrow.feather.write_feather(arrow_table, filename, compression='uncompressed')
+
+    manifest = {
+        'version': STORE_VERSION,
+        'format': fmt,
+        'tables': list(tables),
+        'people_fields': [name for name in tables if name in PEOPLE_FIELDS],
+    }
+    with open(store / STORE_MANIFEST, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+    return tables
+
+#--
+def is_store(path: Path) -> bool:
+    """Whether `path` points to a report store"""
+    return (Path(path) / STORE_MANIFEST).is_file()
+
+#--
+def loading_store_manifest(store: Path) -> dict:
+    with open(Path(store) / STORE_MANIFEST, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    if manifest.get('version') != STORE_VERSION:
+        raise ValueError(f"{store} was built by an incompatible version, please rebuild it.")
+
+    return manifest
+
+#--
+def loading_store_table(
+    store: Path,
+    name: str,
+    manifest: dict | None = None,
+    filters=None
+) -> pandas.DataFrame:
+    """Load a single table of the store as dataframe, optionally only the rows matching `filters`"""
+    pyarrow = _importing_pyarrow()
+    manifest = manifest or loading_store_manifest(store)
+
+    filename = Path(store) / f"{name}{STORE_FORMATS[manifest['format']]}"
+    if manifest['format'] == 'parquet':
+        table = pyarrow.parquet.read_table(filename, filters=filters)
+    else:
+        table = pyarrow.feather.read_table(filename, memory_map=True)
+        if filters is not None:
+            table = table.filter(filters)
+
+    return table.to_pandas()
+
+#--
+def loading_store(
+    store: Path,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead'
+) -> pandas.DataFrame:
+    """Load the store as dataframe with the layout of `loading_data`.
+
+    Mapping fields like `workload_percentage_distribution` stay flat columns, list fields are
+    rebuilt from the child tables.
+
+    The filters of `loading_data` are pushed down into the scan: only reports starting
+    in `year` and, unless `center` is 'all', with one of the centers in the given `role`
+    are read (see `filtering_centers`).
+    """
+    pyarrow = _importing_pyarrow()
+    manifest = loading_store_manifest(store)
+    key = pyarrow.compute.field(STORE_KEY)
+
+    filters = None
+    if year is not None:
+        filters = (
+            (pyarrow.compute.field('start_date') >= pandas.Timestamp(year=year, month=1, day=1))
+            & (pyarrow.compute.field('start_date') < pandas.Timestamp(year=year + 1, month=1, day=1))
+        )
+    if isinstance(center, str) and center != 'all':
+        center = [center]
+    if not isinstance(center, str):
+        people_filter = pyarrow.compute.field('affiliation').isin(list(center))
+        if role == 'lead':
+            people_filter = people_filter & (pyarrow.compute.field('position') == 0)
+        people_table = 'experts' if role == 'experts' else 'consultants'
+        if people_table in manifest['tables']:
+            people = loading_store_table(store, people_table, manifest, filters=people_filter)
+            center_filter = key.isin(people[STORE_KEY].tolist())
+        else:
+            center_filter = key.isin([])
+        filters = center_filter if filters is None else filters & center_filter
+
+    dataframe = loading_store_table(store, STORE_MAIN_TABLE, manifest, filters=filters)
+    rows = dataframe[STORE_KEY].tolist()
+
+    for name in manifest['tables']:
+        if name == STORE_MAIN_TABLE:
+            continue
+        child = loading_store_table(
+            store,
+            name,
+            manifest,
+            filters=None if filters is None else key.isin(rows)
+        ).sort_values([STORE_KEY, 'position'])
+        if name in manifest['people_fields']:
+            items = pandas.Series(
+                child[PEOPLE_COLUMNS].to_dict('records'),
+                index=child[STORE_KEY]
+            )
+        else:
+            items = pandas.Series(child['value'].tolist(), index=child[STORE_KEY])
+        grouped = items.groupby(level=0).agg(list)
+        dataframe[name] = [
+            grouped.get(row, []) for row in dataframe[STORE_KEY]
+        ]
+
+    return dataframe.drop(columns=STORE_KEY)
@@ -0,0 +1,263 @@
+"""Normalized (long format) tables of the nested report fields"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+import sys
+
+#: External modules, libraries
+import numpy
+import pandas
+
+#: Internal modules, libraries
+from ._constants import (
+    REQUEST_MAIN_TYPES,
+    center_abbreviations
+)
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Fields holding a list of persons ({name, affiliation})
+PEOPLE_FIELDS = ('consultants', 'experts', 'clients')
+PEOPLE_COLUMNS = ['name', 'affiliation']
+
+#-- Fields holding a mapping that is flattened into columns `<field>.<key>`
+MAPPING_FIELDS = ('workload_percentage_distribution',)
+
+#-- Roles of a center within a report, see `filtering_centers`
+CENTER_ROLES = ('lead', 'any', 'experts')
+
+#-- Vocabulary fields and the shared dictionary (categories) they use in compact mode,
+#-- the persons of all `PEOPLE_FIELDS` share the dictionaries `name` and `affiliation`
+CATEGORICAL_FIELDS = {
+    'request_types': 'request_types',
+    'tags': 'tags',
+    'communication_platforms': 'communication_platforms',
+    'used_consultation_roles': 'used_consultation_roles',
+}
+#-- Known vocabulary, extended by the values found in the reports
+CATEGORICAL_VOCABULARIES = {
+    'affiliation': center_abbreviations,
+    'request_types': [kind for kinds in REQUEST_MAIN_TYPES.values() for kind in kinds],
+}
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def flattening_mappings(dataframe: pandas.DataFrame) -> pandas.DataFrame:
+    """Replace the mapping fields by flat columns `<field>.<key>`, e.g. the `WORKLOAD_CATEGORY` columns.
+
+    Dataframes that are already flat are returned unchanged.
+    """
+    for column in MAPPING_FIELDS:
+        if column not in dataframe:
+            continue
+        flat = pandas.DataFrame(
+            [value if isinstance(value, dict) else {} for value in dataframe[column]],
+            index=dataframe.index
+        ).add_prefix(f"{column}.")
+        dataframe = pandas.concat([dataframe.drop(columns=column), flat], axis=1)
+
+    return dataframe
+
+#--
+def mapping_columns(dataframe: pandas.DataFrame, column: str) -> list:
+    """Flat columns of a mapping field, see `flattening_mappings`"""
+    return [name for name in dataframe.columns if name.startswith(f"{column}.")]
+
+#--
+def interning(value):
+    """Intern all strings of a (nested) report value, so that repeated strings are stored once"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [interning(item) for item in value]
+    if isinstance(value, dict):
+        return {interning(key): interning(item) for key, item in value.items()}
+    return value
+
+#--
+def compacting_data(dataframe: pandas.DataFrame) -> pandas.DataFrame:
+    """Compact representation of the reports.
+
+    The list fields (`PEOPLE_FIELDS` and `CATEGORICAL_FIELDS`) are exploded once and stored as
+    positional categorical columns `<field>.<position>`, resp. `<field>.<position>.<key>` for the
+    persons, e.g. `consultants.0.affiliation` is the affiliation of the lead consultant. The columns
+    of a vocabulary share one `CategoricalDtype`, e.g. consultants, experts and clients share the
+    affiliations. The remaining strings, like URLs, are interned.
+    """
+    #-- Field -> (positions, key -> values), the key of a list of values is None
+    tables = {}
+    for column in PEOPLE_FIELDS:
+        if column in dataframe:
+            people = exploding_people(dataframe, column)
+            tables[column] = (people['position'], {key: people[key] for key in PEOPLE_COLUMNS})
+    for column in CATEGORICAL_FIELDS:
+        if column in dataframe:
+            values = exploding_values(dataframe, column)
+            tables[column] = (values.groupby(level=0).cumcount(), {None: values})
+
+    #-- One dictionary per vocabulary: the found values in the order of their first occurrence,
+    #-- as in the counts of the normal representation, followed by the rest of the known ones
+    vocabularies = {}
+    for column, (_, items) in tables.items():
+        for key, values in items.items():
+            vocabularies.setdefault(CATEGORICAL_FIELDS.get(column, key), []).append(values.dropna().astype(object))
+    for name, values in CATEGORICAL_VOCABULARIES.items():
+        vocabularies.setdefault(name, []).append(pandas.Series(values, dtype=object))
+    dtypes = {
+        name: pandas.CategoricalDtype(pandas.unique(pandas.concat(values)))
+        for name, values in vocabularies.items()
+    }
+
+    flat = {}
+    for column, (positions, items) in tables.items():
+        for key, values in items.items():
+            values = values.astype(dtypes[CATEGORICAL_FIELDS.get(column, key)])
+            for position in range(positions.max() + 1 if len(positions) else 0):
+                selected = (positions == position).to_numpy()
+                flat[flat_column(column, position, key)] = values[selected].reindex(dataframe.index)
+
+    dataframe = pandas.concat(
+        [dataframe.drop(columns=list(tables)), pandas.DataFrame(flat, index=dataframe.index)],
+        axis=1
+    )
+    for column in dataframe.columns[dataframe.dtypes == object]:
+        dataframe[column] = dataframe[column].map(interning)
+
+    return dataframe
+
+#--
+def flat_column(column: str, position: int, key: str | None = None) -> str:
+    """Positional column of a list field in compact mode, see `compacting_data`"""
+    return f"{column}.{position}" if key is None else f"{column}.{position}.{key}"
+
+#--
+def stacking_flat(dataframe: pandas.DataFrame, column: str, keys: list) -> pandas.DataFrame:
+    """Long format table of a list field from its positional columns, see `compacting_data`.
+
+    One row per item in the order of `explode`, with the columns `position` and `keys`
+    (None for a list of values). The index holds the row labels of `dataframe`.
+    """
+    width = 0
+    while flat_column(column, width, keys[0]) in dataframe:
+        width += 1
+    if not width:
+        return pandas.DataFrame(columns=['position'] + keys)
+
+    codes = {
+        key: numpy.column_stack([
+            dataframe[flat_column(column, position, key)].cat.codes.to_numpy()
+            for position in range(width)
+        ])
+        for key in keys
+    }
+    #-- Row major, as `explode`: the items of a report follow each other
+    rows, positions = numpy.nonzero(numpy.logical_or.reduce([key_codes >= 0 for key_codes in codes.values()]))
+
+    return pandas.DataFrame(
+        {
+            'position': positions,
+            **{
+                key: pandas.Categorical.from_codes(
+                    codes[key][rows, positions],
+                    dtype=dataframe[flat_column(column, 0, key)].dtype
+                )
+                for key in keys
+            },
+        },
+        index=dataframe.index[rows]
+    )
+
+#--
+def exploding_people(dataframe: pandas.DataFrame, column: str) -> pandas.DataFrame:
+    """Long format table of a person list field.
+
+    One row per person with the columns `position`, `name` and `affiliation`.
+    The index holds the row labels of `dataframe`, `position` the order within each report.
+    """
+    if column not in dataframe:
+        return stacking_flat(dataframe, column, PEOPLE_COLUMNS)
+
+    exploded = dataframe[column].explode()
+    exploded = exploded[exploded.map(lambda person: isinstance(person, dict))]
+
+    people = pandas.DataFrame(exploded.tolist(), index=exploded.index)
+    people = people.reindex(columns=PEOPLE_COLUMNS)
+    people.insert(0, 'position', people.groupby(level=0).cumcount())
+
+    return people
+
+#--
+def exploding_values(dataframe: pandas.DataFrame, column: str) -> pandas.Series:
+    """Long format series of a list field, indexed by the row labels of `dataframe`"""
+    if column not in dataframe:
+        if flat_column(column, 0) in dataframe:
+            return stacking_flat(dataframe, column, [None])[None].rename(column)
+        return pandas.Series(dtype=object, name=column)
+
+    return dataframe[column].explode().dropna()
+
+#--
+def affiliation_table(dataframe: pandas.DataFrame, role: str = 'lead') -> pandas.Series:
+    """Affiliations per report for a center role.
+
+    :param role: `lead` (first consultant), `any` (any consultant) or `experts` (any expert).
+    :returns: series of affiliations, indexed by the row labels of `dataframe`.
+    """
+    if role not in CENTER_ROLES:
+        raise ValueError(f"Unknown role {role}. Available roles are: {'|'.join(CENTER_ROLES)}")
+
+    people = exploding_people(dataframe, 'experts' if role == 'experts' else 'consultants')
+    if role == 'lead':
+        people = people[people['position'] == 0]
+
+    return people['affiliation']
+
+#--
+def filtering_centers(
+    dataframe: pandas.DataFrame,
+    center,
+    role: str = 'lead'
+) -> pandas.DataFrame:
+    """Reports with at least one of the given centers in the given role.
+
+    :param center: a center, a list of centers or 'all' (no filtering).
+    :param role: `lead` (first consultant), `any` (any consultant) or `experts` (any expert).
+    """
+    if isinstance(center, str):
+        if center == 'all':
+            return dataframe
+        center = [center]
+
+    affiliations = affiliation_table(dataframe, role=role)
+    matches = affiliations.index[affiliations.isin(center)].unique()
+
+    return dataframe[dataframe.index.isin(matches)]
+
+#--
+def grouping_centers(
+    dataframe: pandas.DataFrame,
+    centers=None,
+    role: str = 'lead'
+) -> dict:
+    """Split the reports per center in a single pass.
+
+    :param centers: centers to return, by default all centers found in the reports.
+    :param role: `lead` (first consultant), `any` (any consultant) or `experts` (any expert).
+    :returns: the reports of each center, a report may belong to several centers for `any` and `experts`.
+    """
+    affiliations = affiliation_table(dataframe, role=role)
+    labels = affiliations.groupby(affiliations, sort=True, observed=True).groups
+
+    if centers is None:
+        centers = list(labels)
+
+    return {
+        center: dataframe[dataframe.index.isin(labels.get(center, []))]
+        for center in centers
+    }
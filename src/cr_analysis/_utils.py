@@ -3,88 +3,297 @@
 #=============#
 
 #: Std. libraries
+from functools import lru_cache, partial
 from pathlib import Path
+import re
 
 #: External modules,libraries
 import pandas
-import yaml
-
-try:
-    # Attempt to use CLoader
-    from yaml import CLoader as YAML_Loader
-except ImportError:
-    # Fallback to regular Loader if CLoader is not available
-    from yaml import BaseLoader as YAML_Loader
 
 #: Internal modules,libraries
+from ._cache import ReportCache
+from ._files import (
+    loading_yaml_file,
+    loading_yaml_to_pathlib_glob,
+    parsing_yaml
+)
+from ._index import ReportIndex
+from ._parallel import chunking, mapping_parallel, streaming_parallel
+from ._profile import profiled, profiling
+from ._store import loading_store
+from ._tables import (
+    compacting_data,
+    exploding_people,
+    exploding_values,
+    filtering_centers,
+    flattening_mappings,
+    mapping_columns
+)
 from ._constants import (
     REQUEST_MAIN_TYPES,
     month_names
 )
 
+#-- Precompiled patterns of the main request types (SE, LEGAL, PRAC)
+REQUEST_MAIN_TYPE_PATTERNS = {
+    category: re.compile('|'.join(types))
+    for category, types in REQUEST_MAIN_TYPES.items()
+}
+
 #===============#
 #== FUNCTIONS ==#
 #===============#
 
-#-- Loading the yaml file
-def loading_yaml_to_pathlib_glob(reports: Path):
+#-- Loading the yaml files to a list of records
+def loading_yaml_records(
+    yaml_files,
+    cache_file: Path | None = None,
+    jobs: int = 1
+) -> list:
+    """Parse the given files, in the order of `yaml_files`.
+
+    With a given `cache_file` only new or changed reports are parsed,
+    the remaining records are taken from the on-disk cache.
+    With `jobs` > 1 the parsing is spread over a process pool.
+    """
+    yaml_files = list(yaml_files)
+
+    if cache_file is None:
+        return mapping_parallel(loading_yaml_file, yaml_files, jobs=jobs)
+
+    cache = ReportCache.shared(cache_file)
+    data_list = cache.loading_many(
+        yaml_files,
+        parser=parsing_yaml,
+        mapper=partial(mapping_parallel, jobs=jobs)
+    )
+    cache.evicting(yaml_files)
+    cache.saving()
 
-    reports = Path(reports)
+    return data_list
 
-    #-- In case where a single file is provided
-    if reports.is_file():
-        yaml_files = [reports]
-    else:
-        yaml_files = reports.glob("*.yml")
+#-- Loading the yaml to a pandas dataframe
+def loading_yaml_to_dataframe(
+    reports: Path,
+    cache_file: Path | None = None,
+    jobs: int = 1
+):
+    """Parse all reports into a dataframe.
 
-    return yaml_files
+    With a given `cache_file` only new or changed reports are parsed,
+    the remaining records are taken from the on-disk cache.
+    With `jobs` > 1 the parsing is spread over a process pool, the row order
+    of the dataframe stays the same.
+    """
+    yaml_files = loading_yaml_to_pathlib_glob(reports)
+    data_list = loading_yaml_records(yaml_files, cache_file=cache_file, jobs=jobs)
 
-#-- Loading the yaml to a pandas dataframe
-def loading_yaml_to_dataframe(reports: Path):
+    return building_dataframe(data_list)
 
-    data_list = []
+#--
+def building_dataframe(data_list: list) -> pandas.DataFrame:
+    """Dataframe of parsed reports, one row per report"""
+    with profiling("dataframe"):
+        return pandas.DataFrame(data_list)
 
+#-- Selecting the yaml files that can match year and center
+def selecting_reports(
+    reports: Path,
+    index_file: Path | None = None,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead'
+) -> tuple:
+    """Report files that may pass the year and center filters, decided on the sidecar index `index_file`.
+
+    :returns: the index (None without `index_file`), the selected files and the set of
+              selected files without a valid index entry. The latter have to be parsed and
+              added to the index via `ReportIndex.updating`.
+    """
     yaml_files = loading_yaml_to_pathlib_glob(reports)
 
-    #-- Read and parse yaml linter output
-    for filename in yaml_files:
-        with open(filename, "r", encoding="utf-8") as file:
-            data = yaml.load(file,Loader=YAML_Loader)
-            data_list.append(data)
+    if index_file is None:
+        return None, yaml_files, set()
+
+    index = ReportIndex(index_file)
+    index.evicting(yaml_files)
+    selected, unindexed = index.filtering(yaml_files, year=year, center=center, role=role)
 
-    return pandas.DataFrame(data_list)
+    return index, selected, set(unindexed)
+
+#-- Loading the yaml files, skipping files that cannot match year and center
+def loading_yaml_filtered(
+    reports: Path,
+    index_file: Path,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead',
+    cache_file: Path | None = None,
+    jobs: int = 1
+) -> pandas.DataFrame:
+    """Parse only the reports that may pass the year and center filters.
+
+    Whether a report can match is decided on the sidecar index `index_file`, files
+    with unknown or outdated index entries are always parsed and added to the index.
+    """
+    index, selected, unindexed = selecting_reports(
+        reports,
+        index_file=index_file,
+        year=year,
+        center=center,
+        role=role
+    )
+
+    data_list = loading_yaml_records(selected, cache_file=cache_file, jobs=jobs)
+
+    for filename, data in zip(selected, data_list):
+        if filename in unindexed and isinstance(data, dict):
+            index.updating(filename, data)
+    index.saving()
+
+    return building_dataframe(data_list)
 
 #--
 def loading_data(
     reports: Path,
-    year: int, 
-    center: str
+    year: int | None, 
+    center,
+    cache_file: Path | None = None,
+    jobs: int = 1,
+    store: Path | None = None,
+    index_file: Path | None = None,
+    role: str = 'lead',
+    compact: bool = False
 ):
-    #-- Loading the dataset
-    df = loading_yaml_to_dataframe(reports=reports)
+    """Load the reports of `year` with one of the given centers in the given role.
+
+    With `year` set to None, reports of all years are loaded.
+    `center` is a single center, a list of centers or 'all'. `role` selects whether the
+    lead consultant (`lead`), any consultant (`any`) or any expert (`experts`) has to match.
+    The year and center filters are pushed down into the scan: with an `index_file`
+    reports that cannot match are not parsed, with a `store` only matching rows are read.
+    With `compact` strings are interned and vocabulary fields become categorical, see `compacting_data`.
+    """
+    #-- Loading the dataset, from the columnar store if given
+    if store is not None:
+        df = loading_store(store, year=year, center=center, role=role)
+    elif index_file is not None:
+        df = loading_yaml_filtered(
+            reports=reports,
+            index_file=index_file,
+            year=year,
+            center=center,
+            role=role,
+            cache_file=cache_file,
+            jobs=jobs
+        )
+    else:
+        df = loading_yaml_to_dataframe(reports=reports, cache_file=cache_file, jobs=jobs)
+
+    return preparing_data(df, year=year, center=center, role=role, compact=compact)
+
+#--
+@profiled("filter")
+def preparing_data(
+    df: pandas.DataFrame,
+    year: int | None,
+    center,
+    role: str = 'lead',
+    compact: bool = False
+) -> pandas.DataFrame:
+    """Flatten, type and filter freshly loaded reports, see `loading_data`"""
+    #-- Flatten nested mappings once, e.g. into the WORKLOAD_CATEGORY columns
+    df = flattening_mappings(df)
+    if compact:
+        df = compacting_data(df)
+
+    #-- Ensure the filtered columns exist, even if no report was loaded
+    df = df.reindex(columns=df.columns.union(['start_date', 'end_date'], sort=False))
 
     #-- Setting datetime to the pandas datetime format
+    #-- `end_date` is taken from `start_date`, so a report counts for the year it started in;
+    #-- the pushed down filters (`matching_entry`, `loading_store`) use the start year as well
     df['start_date'] = pandas.to_datetime(df['start_date'])
     df['end_date']   = pandas.to_datetime(df['start_date'])
 
     #-- Filtering tickets based on the year
     #df = df[(df['start_date'].dt.year == report_year) | (df['end_date'].dt.year == report_year)]
-    df = df[df['end_date'].dt.year == year]
+    if year is not None:
+        df = df[df['end_date'].dt.year == year]
 
     #-- Filtering per affiliation
-    if center != 'all':
-        #----- Statistics about consultants center --------#
-        center_consultant_list = []
-        for i in range(len(df)):
-            if len(df['consultants'].iloc[i]) > 0:
-                if df['consultants'].iloc[i][0]['affiliation'] == center :
-                    center_consultant_list.append(i)
-
-        df = df.iloc[center_consultant_list]
+    df = filtering_centers(df, center, role=role)
 
     return df
 
+#-- Streaming the yaml files
+def streaming_reports(
+    reports: Path,
+    chunk_size: int | None = None,
+    jobs: int = 1,
+    index_file: Path | None = None,
+    year: int | None = None,
+    center = 'all',
+    role: str = 'lead'
+):
+    """Yield the parsed reports one at a time or, with `chunk_size`, as lists of up to `chunk_size` reports.
+
+    Only the reports in flight are held in memory. With an `index_file` reports that
+    cannot pass the year and center filters are skipped, see `loading_yaml_filtered`.
+    With `jobs` > 1 the parsing is spread over a process pool, the order is kept.
+    """
+    index, yaml_files, unindexed = selecting_reports(
+        reports,
+        index_file=index_file,
+        year=year,
+        center=center,
+        role=role
+    )
+
+    def records():
+        parsed = streaming_parallel(loading_yaml_file, yaml_files, jobs=jobs)
+        for filename, data in zip(yaml_files, parsed):
+            if filename in unindexed and isinstance(data, dict):
+                index.updating(filename, data)
+            yield data
+        if index is not None:
+            index.saving()
+
+    if chunk_size is None:
+        yield from records()
+    else:
+        yield from chunking(records(), chunk_size)
+
+#--
+def streaming_data(
+    reports: Path,
+    year: int | None,
+    center,
+    chunk_size: int = 1000,
+    jobs: int = 1,
+    index_file: Path | None = None,
+    role: str = 'lead'
+):
+    """Yield the reports of `loading_data` as dataframes of up to `chunk_size` reports.
+
+    Chunks without a matching report are skipped.
+    """
+    chunks = streaming_reports(
+        reports,
+        chunk_size=chunk_size,
+        jobs=jobs,
+        index_file=index_file,
+        year=year,
+        center=center,
+        role=role
+    )
+    for chunk in chunks:
+        df = preparing_data(building_dataframe(chunk), year=year, center=center, role=role)
+        if len(df):
+            yield df
+
 #------------------------------------------------------#
+@profiled("kpi.affiliations")
 def counting_affiliations(
     dataframe: pandas.DataFrame,
     column: str,
@@ -92,22 +301,14 @@ def counting_affiliations(
     output: str = "relative"
 ) -> pandas.Series:
     """Counts affiliations absolute, relative"""
-    ##----- Initialization ----------------------------#
-    affiliations = []
-
     #----- Routine ------------------------------------#
-    for entry in dataframe[column]:
-        if isinstance(entry, list):
-            for person in entry:
-                affiliations.append(person['affiliation'])
+    affiliations = [exploding_people(dataframe, column)['affiliation']]
 
     if add != "None":
-        for entry in dataframe[add]:
-            if isinstance(entry, list):
-                for person in entry:
-                    affiliations.append(person['affiliation'])
+        affiliations.append(exploding_people(dataframe, add)['affiliation'])
 
-    count_dict = pandas.Series(affiliations).value_counts()
+    count_dict = pandas.concat(affiliations).value_counts().rename_axis(None)
+    count_dict = count_dict[count_dict > 0]
     #----- End Routine --------------------------------#
 
     #----- Output -------------------------------------#
@@ -119,13 +320,15 @@ def counting_affiliations(
         raise TypeError("Wrong given output. Available output types are: relative|absolute")
 
 #------------------------------------------------------#
+@profiled("kpi.occurrence")
 def counting_occurrence(
     dataframe: pandas.DataFrame,
     column: str,
     output: str = 'relative'
 ) -> pandas.Series:
     """Counts based on tags; absolute, relative output"""
-    tags = pandas.Series([tag for sublist in dataframe[column].dropna() for tag in sublist]).value_counts()
+    tags = exploding_values(dataframe, column).value_counts().rename_axis(None)
+    tags = tags[tags > 0]
 
     if output == 'relative':
         return tags/tags.sum()
@@ -134,22 +337,54 @@ def counting_occurrence(
     else:
         raise TypeError("Wrong given output. Available output types are: relative|absolute")
 
+#-- Main request types of a single request type
+@lru_cache(maxsize=None)
+def classifying_request_type(request_type) -> tuple:
+    """Membership of a request type in each main request type, in the order of `REQUEST_MAIN_TYPES`"""
+    if not isinstance(request_type, str):
+        return tuple(False for _ in REQUEST_MAIN_TYPE_PATTERNS)
+    return tuple(
+        pattern.search(request_type) is not None
+        for pattern in REQUEST_MAIN_TYPE_PATTERNS.values()
+    )
+
+#--
+def classifying_request_types(
+    dataframe: pandas.DataFrame
+) -> pandas.DataFrame:
+    """Main request type membership per ticket.
+
+    The request types are exploded and classified once per distinct request type.
+    :returns: boolean dataframe with one column per main request type (SE, LEGAL, PRAC),
+              indexed by the row labels of `dataframe`.
+    """
+    request_types = exploding_values(dataframe, 'request_types')
+    vocabulary = request_types.unique()
+
+    lookup = pandas.DataFrame(
+        [classifying_request_type(request_type) for request_type in vocabulary],
+        index=vocabulary,
+        columns=list(REQUEST_MAIN_TYPE_PATTERNS),
+        dtype=bool
+    )
+    membership = lookup.reindex(request_types.to_numpy())
+    membership.index = request_types.index
+
+    return (
+        membership
+        .groupby(level=0)
+        .any()
+        .reindex(dataframe.index, fill_value=False)
+    )
+
 #--
+@profiled("kpi.main_types")
 def counting_main_types(
     dataframe: pandas.DataFrame,
     output: str = 'relative'
 ) -> pandas.Series:
     """Counts based on main request types (SE, LEGAL, PRAC)"""
-    request_main_types_counts = {category: 0 for category in REQUEST_MAIN_TYPES}
-    for i, val in enumerate(REQUEST_MAIN_TYPES):
-        #-- create a regular expression pattern and apply it to the pandas.Series
-        mypattern = '|'.join(REQUEST_MAIN_TYPES[val])
-        request_main_types_counts[val] = sum(
-            dataframe['request_types'].apply(
-                lambda x: any(pandas.Series(x).str.contains(mypattern))
-                )
-            )
-    maintypes = pandas.Series(request_main_types_counts)
+    maintypes = classifying_request_types(dataframe).sum()
 
     maintypes.name = 'count'
 
@@ -161,11 +396,20 @@ def counting_main_types(
         raise TypeError("Wrong given output. Available output types are: relative|absolute")
 
 #--
+@profiled("kpi.workload")
 def workload_distribution(df):
     """Calculate the workload distribution"""
-    workload_data = df["workload_percentage_distribution"].apply(pandas.Series)
+    workload_data = flattening_mappings(df)
+    columns = mapping_columns(workload_data, 'workload_percentage_distribution')
+
+    return formatting_workload(workload_data[columns].mean())
+
+#--
+def formatting_workload(averages: pandas.Series) -> pandas.DataFrame:
+    """Workload distribution table from the average of each `workload_percentage_distribution` column"""
     workload_average = (
-        workload_data.mean()
+        averages
+        .rename(lambda column: column.split('.', 1)[1])
         .reset_index()
         .rename(columns={"index": "category", 0: "value"})
     )
@@ -177,12 +421,11 @@ def workload_distribution(df):
     return workload_average
 
 #--
+@profiled("kpi.months")
 def tickets_per_month(
     dataframe: pandas.DataFrame
 ) -> pandas.Series:
     """Ticket starting count per month"""
-    months = pandas.Series(0, index=range(1, 13), name="Counts")
-
     monthly_requests = (
         dataframe["start_date"]
         .groupby([dataframe["start_date"].dt.month])
@@ -191,6 +434,13 @@ def tickets_per_month(
         .rename(columns={"start_date": "Months"})
     ).set_index("Months")["Count"]
 
+    return formatting_months(monthly_requests)
+
+#--
+def formatting_months(monthly_requests: pandas.Series) -> pandas.Series:
+    """Ticket count per month name from the counts per month number"""
+    months = pandas.Series(0, index=range(1, 13), name="Counts")
+
     for month in monthly_requests.index:
         months[month] = monthly_requests[month]
 
@@ -0,0 +1,138 @@
+"""JSON schema validator of the reports, optionally compiled to Python code
+
+With the optional dependency `fastjsonschema` the schema is compiled into specialized
+validation code. The generated code can be cached on disk, keyed by the hash of the schema,
+so that it is only generated once per schema.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from functools import lru_cache
+from pathlib import Path
+import json
+import re
+
+#: External modules, libraries
+import jsonschema
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+#: Internal modules, libraries
+from ._cache import hashing_content
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- Increase whenever the options of the generated code change
+VALIDATOR_VERSION = 1
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def compiling_schema(schema_text: str, cache_dir: Path | None = None):
+    """Compiled validation function of a JSON schema, None if `fastjsonschema` is not installed.
+
+    With a `cache_dir` the generated code is stored as `<cache_dir>/<schema hash>-<code hash>.py`
+    and reused as long as the schema is unchanged. A stored file is only executed if its content
+    matches the code hash of its name, otherwise the code is generated again. Like
+    `jsonschema.Draft7Validator`, formats are not checked and no defaults are inserted.
+    """
+    if fastjsonschema is None:
+        return None
+
+    key = hashing_content(
+        f"{VALIDATOR_VERSION}:{fastjsonschema.VERSION}:{schema_text}".encode("utf-8")
+    )
+
+    code = None
+    filename = None
+    if cache_dir is not None:
+        for stored in sorted(Path(cache_dir).glob(f"{key}-*.py")):
+            try:
+                content = stored.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            if stored.stem == f"{key}-{hashing_content(content.encode('utf-8'))}":
+                code, filename = content, stored
+                break
+
+    if code is None:
+        code = fastjsonschema.compile_to_code(
+            json.loads(schema_text),
+            use_default=False,
+            use_formats=False
+        )
+        if cache_dir is not None:
+            filename = Path(cache_dir) / f"{key}-{hashing_content(code.encode('utf-8'))}.py"
+            try:
+                filename.parent.mkdir(parents=True, exist_ok=True)
+                temporary_file = filename.with_suffix(".tmp")
+                temporary_file.write_text(code, encoding="utf-8")
+                temporary_file.replace(filename)
+            except OSError:
+                #-- A read-only cache only costs the code generation
+                pass
+
+    namespace: dict = {}
+    exec(compile(code, str(filename or "<schema>"), "exec"), namespace)
+
+    #-- The validation function of the root schema is generated first
+    name = re.search(r"^def (validate\w*)\(", code, flags=re.MULTILINE).group(1)
+
+    return namespace[name]
+
+#--
+def validator_backend() -> str:
+    """Identifier of the code accepting the valid reports, e.g. for the keys of cached results"""
+    if fastjsonschema is None:
+        return "jsonschema"
+    return f"fastjsonschema {fastjsonschema.VERSION}, generated code version {VALIDATOR_VERSION}"
+
+#--
+@lru_cache(maxsize=None)
+def building_validator(schema_text: str, cache_dir: Path | None = None) -> "ReportValidator":
+    """Validator of a JSON schema, built once per schema and process"""
+    return ReportValidator(schema_text, cache_dir=cache_dir)
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class ReportValidator:
+    """Validator of the reports against a JSON schema.
+
+    Valid reports are accepted by the compiled code of `compiling_schema`, if available.
+    The compiled code stops at the first error, so the errors of invalid reports are
+    collected by `jsonschema.Draft7Validator` afterwards: invalid reports are validated
+    twice, but the messages do not depend on the compiled code.
+
+    :param schema_text: Content of the JSON schema file.
+    :param cache_dir: Directory of the compiled validators, None disables the disk cache.
+    """
+
+    def __init__(self, schema_text: str, cache_dir: Path | None = None):
+        self.validator = jsonschema.Draft7Validator(json.loads(schema_text))
+        self.compiled = compiling_schema(schema_text, cache_dir=cache_dir)
+
+    #--
+    def collecting_errors(self, report: dict) -> list:
+        """All validation errors of `report`, empty if it is valid.
+
+        Only reports rejected by the compiled code are traversed by `jsonschema`.
+        """
+        if self.compiled is not None:
+            try:
+                self.compiled(report)
+                return []
+            except fastjsonschema.JsonSchemaException:
+                pass
+
+        return list(self.validator.iter_errors(report))
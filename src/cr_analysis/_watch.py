@@ -0,0 +1,185 @@
+"""Watching the reports directory for changed report files
+
+On Linux the directory is watched with inotify (via ctypes, no further dependency), elsewhere
+or if inotify is not available the modification times are polled.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from ctypes.util import find_library
+from pathlib import Path
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+#-- inotify event masks, see inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+
+#-- struct inotify_event without the name
+INOTIFY_EVENT = struct.Struct("iIII")
+
+#-- Seconds between two scans of the polling watcher
+POLL_INTERVAL = 0.5
+
+#-- Seconds to wait for further events after a change, editors often write a file in several steps
+DEBOUNCE = 0.1
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class InotifyWatcher:
+    """Watcher of a directory using the inotify API of the Linux kernel.
+
+    :raises OSError: if inotify is not available.
+    """
+
+    def __init__(self, directory: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self.directory = Path(directory)
+        self.libc = ctypes.CDLL(find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        watch = self.libc.inotify_add_watch(self.fd, os.fsencode(self.directory), WATCH_MASK)
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {self.directory}")
+
+    #--
+    def waiting(self, timeout: float | None = None) -> set:
+        """Files of the directory changed, created or deleted within `timeout` seconds, empty on timeout"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(buffer):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                changed.add(self.directory / os.fsdecode(name))
+        return changed
+
+    #--
+    def close(self) -> None:
+        os.close(self.fd)
+
+#--
+class PollingWatcher:
+    """Watcher of a directory comparing the modification times and sizes of its files"""
+
+    def __init__(self, directory: Path, interval: float = POLL_INTERVAL):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.snapshot = self.scanning()
+
+    #--
+    def scanning(self) -> dict:
+        snapshot = {}
+        for filename in self.directory.iterdir():
+            try:
+                stat = filename.stat()
+            except OSError:
+                continue
+            snapshot[filename] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    #--
+    def waiting(self, timeout: float | None = None) -> set:
+        """Files of the directory changed, created or deleted within `timeout` seconds, empty on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.scanning()
+            changed = {
+                filename for filename in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(filename) != self.snapshot.get(filename)
+            }
+            self.snapshot = snapshot
+            if changed:
+                return changed
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            pause = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(pause)
+
+    #--
+    def close(self) -> None:
+        pass
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def opening_watcher(directory: Path, polling: bool = False):
+    """inotify watcher of `directory`, or the polling watcher if inotify is not available or `polling` is set"""
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            #-- AttributeError: libc without inotify
+            pass
+    return PollingWatcher(directory)
+
+#--
+def watching_reports(reports: Path, polling: bool = False, debounce: float = DEBOUNCE):
+    """Yield the sets of report files changed, created or deleted, until the generator is closed.
+
+    :param reports: A single report file or a directory of reports, like `loading_yaml_to_pathlib_glob`.
+    :param polling: Poll the modification times even if inotify is available.
+    :param debounce: Seconds to collect further changes, so that one save yields one set.
+    """
+    reports = Path(reports)
+    directory = reports.parent if reports.is_file() else reports
+
+    def is_report(filename: Path) -> bool:
+        if reports.is_file() or not directory.exists():
+            return filename == reports
+        return filename.suffix == ".yml"
+
+    watcher = opening_watcher(directory, polling=polling)
+    try:
+        while True:
+            changed = watcher.waiting()
+            while True:
+                more = watcher.waiting(timeout=debounce)
+                if not more:
+                    break
+                changed |= more
+
+            changed = {filename for filename in changed if is_report(filename)}
+            if changed:
+                yield sorted(changed)
+    finally:
+        watcher.close()
@@ -0,0 +1,64 @@
+""" Thin client of a `reporting serve` process, see `_server` """
+#=============#
+#== IMPORTS ==#
+#=============#
+#-- Std. libraries
+from http.client import HTTPConnection, HTTPException
+from urllib.parse import urlsplit
+import json
+import socket
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class UnixHTTPConnection(HTTPConnection):
+    """`HTTPConnection` to a server listening on a Unix socket"""
+
+    def __init__(self, socket_file: str, timeout: float | None = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_file = socket_file
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_file)
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def connecting(server: str, timeout: float | None = None) -> HTTPConnection:
+    """Connection to `server`, given as `http://HOST:PORT` or `unix:PATH`"""
+    if server.startswith('unix:'):
+        return UnixHTTPConnection(server[len('unix:'):], timeout=timeout)
+
+    address = urlsplit(server if '://' in server else f"http://{server}")
+    if address.scheme != 'http' or address.hostname is None:
+        raise ValueError(f"Invalid server address {server}, expected http://HOST:PORT or unix:PATH")
+    return HTTPConnection(address.hostname, address.port, timeout=timeout)
+
+#--
+def requesting(server: str, command: str, parameters: dict) -> dict:
+    """Run `command` with `parameters` on `server` and return its response.
+
+    :raises ValueError: if the server cannot be reached or the command failed.
+    """
+    connection = connecting(server)
+    body = json.dumps(parameters).encode('utf-8')
+    try:
+        connection.request('POST', f"/{command}", body=body, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        content = json.loads(response.read() or b'{}')
+    except (OSError, HTTPException, ValueError) as error:
+        raise ValueError(f"No reporting server at {server}: {error}") from error
+    finally:
+        connection.close()
+
+    if response.status != 200:
+        raise ValueError(f"The reporting server failed: {content.get('error', response.reason)}")
+
+    return content
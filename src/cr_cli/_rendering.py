@@ -0,0 +1,150 @@
+""" Terminal output of the lint, validation and profiling results """
+#=============#
+#== IMPORTS ==#
+#=============#
+#-- Std. libraries
+from collections import deque
+
+#-- External libraries
+from rich import print
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#-- lint --#
+def formatting_lint_file(file_result) -> list:
+    """Printable lines of the linter problems of a single report"""
+    lines = [f"[bold red]{escape(str(file_result.filename))}[/bold red]"]
+    for diagnostic in file_result.diagnostics:
+        lines.append(
+            f"  [magenta]{diagnostic.line}:{diagnostic.column} {diagnostic.level}[/magenta] {escape(diagnostic.message)}"
+        )
+    return lines
+
+def printing_lint_file(file_result) -> None:
+    """Print the linter problems of a single report, used while the remaining reports are linted"""
+    if file_result.ok:
+        return
+    for line in formatting_lint_file(file_result):
+        print(line)
+
+def printing_linting(result, max_errors: int | None = None) -> None:
+    """Print the closing lines of `lint`, the problems are printed by `printing_lint_file`"""
+    if result.stopped:
+        count = result.error_count
+        print(f"[bold red]>>> Stopped after {count} linting errors (--max-errors {max_errors}) <<<[/bold red]")
+    if result.ok:
+        print("[green bold]>>> No linting errors found! <<<[/green bold]")
+
+def building_lint_table(result) -> Table:
+    """Table of the reports with linter problems"""
+    table = Table(title="Linter errors")
+    table.add_column("File", justify="right", style="cyan", no_wrap=True)
+    table.add_column("Messages", style="magenta")
+    for file_result in result.failed:
+        problems = ", ".join(
+            f"{diagnostic.line}:{diagnostic.column}: {diagnostic.message}"
+            for diagnostic in file_result.diagnostics
+        )
+        table.add_row(str(file_result.filename), escape(f"[{problems}]"))
+    return table
+
+#-- validate --#
+def formatting_validation_file(file_result) -> list:
+    """Printable lines of the validation problems of a single report"""
+    filename = escape(str(file_result.filename))
+    lines = []
+    schema_failed = False
+    for diagnostic in file_result.diagnostics:
+        if diagnostic.rule == 'syntax':
+            lines.append(f"[bold red]{escape(diagnostic.message)} {filename}[/bold red]")
+            if diagnostic.line is not None:
+                lines.append(f"  Error position: (Line {diagnostic.line}:Column {diagnostic.column})")
+        elif diagnostic.rule == 'schema':
+            if not schema_failed:
+                lines.append(f"[bold red]{filename}: Validation failed[/bold red]")
+                schema_failed = True
+            #-- Schema paths in the format of jsonschema's `absolute_schema_path`
+            lines.append(
+                f"[bold red]  * {escape(diagnostic.message)} at {escape(str(deque(diagnostic.schema_path)))}[/bold red]"
+            )
+            for message, schema_path in diagnostic.context:
+                lines.append(
+                    f"[bold red]\t\tContext: {escape(message)} at {escape(str(deque(schema_path)))}[/bold red]"
+                )
+        else:
+            lines.append(f"[bold red]{filename}: {escape(diagnostic.message)}[/bold red]")
+    return lines
+
+def printing_validation_file(file_result) -> None:
+    """Print the validation problems of a single report, used while the remaining reports are validated"""
+    for line in formatting_validation_file(file_result):
+        print(line)
+
+def printing_consistency(result) -> None:
+    """Print the problems between the reports"""
+    for message in result.consistency:
+        print(f"[bold red]{escape(message)}[/bold red]")
+
+def printing_validation(result) -> None:
+    """Print the closing lines of `validate`, the problems of the files are printed by `printing_validation_file`"""
+    printing_consistency(result)
+    if result.ok:
+        print("[green bold]>>> No validation errors found! <<<[/green bold]")
+
+#-- check --#
+def printing_check(linting, validation) -> None:
+    """Print the lint and validation results of `check`"""
+    for file_result in validation.files:
+        printing_validation_file(file_result)
+    printing_consistency(validation)
+
+    if linting.ok:
+        print("[green bold]>>> No linting errors found! <<<[/green bold]")
+    else:
+        Console().print(building_lint_table(linting))
+
+    if validation.ok:
+        print("[green bold]>>> No validation errors found! <<<[/green bold]")
+
+#-- profile --#
+def building_profile_table(records: list, memory: bool = False) -> Table:
+    """Table of the wall and CPU time per stage, see `Profiler.summary`"""
+    total_wall = sum(record.wall for record in records)
+    total_cpu = sum(record.cpu for record in records)
+
+    table = Table(title="Profile")
+    table.add_column("Stage", style="cyan", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Wall (s)", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("CPU (s)", justify="right")
+    if memory:
+        table.add_column("Peak (MiB)", justify="right")
+
+    for record in records:
+        row = [
+            record.name,
+            str(record.calls) if record.calls else "",
+            f"{record.wall:.3f}",
+            f"{record.wall / total_wall:.1%}" if total_wall else "",
+            f"{record.cpu:.3f}",
+        ]
+        if memory:
+            row.append(f"{record.peak / 2**20:.1f}" if record.calls else "")
+        table.add_row(*row)
+
+    table.add_section()
+    table.add_row("total", "", f"{total_wall:.3f}", "", f"{total_cpu:.3f}", *([""] if memory else []))
+    return table
+
+def printing_profile(profiler) -> None:
+    """Print the times per stage and the written dumps of `--profile`"""
+    Console().print(building_profile_table(profiler.summary(), memory=profiler.dumping_enabled))
+    written = profiler.dumping()
+    if written:
+        print(f"{len(written)} profile dumps written to {escape(str(profiler.dump_directory))}")
@@ -0,0 +1,414 @@
+""" Warm `reporting serve` process answering the CLI over a local socket
+
+The server keeps everything that is expensive to rebuild in memory: the imported libraries,
+the compiled schema validator, the parsed linter configuration, the parsed reports and check
+results (see `ReportCache.shared`) and the computed KPIs of every requested selection. The
+commands are posted as JSON to `/<command>`, the CLI acts as a thin client, see `_client`.
+
+The server owns its caches, the clients only choose whether they are used. All paths of a
+request must lie in the working tree the server was started in, and it only listens on loopback
+addresses or a Unix socket: anyone able to post to it can read the files of the tree. Requests
+naming the server by another host, e.g. web pages rebinding their DNS name to 127.0.0.1, are
+refused, and the only files written are new HTML plots.
+
+The requests are answered one after the other, so the warm state needs no locking.
+"""
+#=============#
+#== IMPORTS ==#
+#=============#
+#-- Std. libraries
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+import inspect
+import io
+import ipaddress
+import json
+import os
+import signal
+import socketserver
+import time
+import traceback
+
+#-- External libraries
+import rich
+
+#-- Internal libraries
+from cr_analysis._constants import (
+    current_year,
+    LINT_CACHE_FILE,
+    REPORT_CACHE_FILE,
+    REPORT_INDEX_FILE,
+    VALIDATION_CACHE_FILE,
+    VALIDATOR_CACHE_DIR
+)
+from cr_analysis._files import loading_yaml_to_pathlib_glob
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+#-- Parameters of the commands naming files, which must lie in the served working tree
+PATH_PARAMETERS = ('reports', 'schema_file', 'linter_config', 'corpus')
+
+#-- Parameter of the commands naming the file they write, see `WarmState.confining_destination`
+DESTINATION_PARAMETER = 'destination'
+
+#-- Selections whose KPIs are kept, the least recently requested one is dropped first
+MAX_SELECTIONS = 32
+
+#=============#
+#== CLASSES ==#
+#=============#
+
+#--
+class WarmState:
+    """State of the server shared by all requests, the commands are its `<command>ing` methods"""
+
+    def __init__(self, jobs: int = 1, root: Path | None = None):
+        self.jobs = jobs
+        self.root = Path.cwd().resolve() if root is None else Path(root).resolve()
+        self.started = time.time()
+        self.requests = 0
+        #-- (reports, year, center, role, cache) -> (signature of the report files, KPIResult)
+        self.kpis: OrderedDict = OrderedDict()
+        #-- Plots written by the server, which it may overwrite
+        self.written: set = set()
+
+    #--
+    def cache_file(self, cache_file: Path, cache: bool) -> Path | None:
+        """Cache of the server, relative paths are in its working tree, if the client wants the cache"""
+        return self.root / cache_file if cache else None
+
+    #--
+    def kpi_result(self, reports, year: int, center: str, role: str, cache: bool = True):
+        """Memoized KPIs of a selection, recomputed once any of the report files changed"""
+        from cr_analysis._kpi import KPIResult
+
+        yaml_files = loading_yaml_to_pathlib_glob(reports)
+        signature = tuple(
+            (str(filename), stat.st_mtime_ns, stat.st_size)
+            for filename, stat in ((filename, Path(filename).stat()) for filename in yaml_files)
+        )
+        key = (str(reports), year, center, role, cache)
+
+        known = self.kpis.get(key)
+        if known is not None and known[0] == signature:
+            self.kpis.move_to_end(key)
+            return known[1]
+
+        kpis = KPIResult(
+            reports=reports,
+            year=year,
+            center=center,
+            role=role,
+            cache_file=self.cache_file(REPORT_CACHE_FILE, cache),
+            jobs=self.jobs,
+            index_file=self.cache_file(REPORT_INDEX_FILE, cache)
+        )
+        self.kpis[key] = (signature, kpis)
+        self.kpis.move_to_end(key)
+        while len(self.kpis) > MAX_SELECTIONS:
+            self.kpis.popitem(last=False)
+        return kpis
+
+    #--
+    def confining(self, path: str) -> Path:
+        """`path` resolved in the working tree of the server.
+
+        :raises ValueError: if it points outside of the working tree, e.g. via `..` or a symlink.
+        """
+        resolved = (self.root / path).resolve()
+        if not resolved.is_relative_to(self.root):
+            raise ValueError(f"{path} is outside of the served directory {self.root}")
+        return resolved
+
+    #--
+    def confining_destination(self, path: str) -> Path:
+        """HTML file `path` in the working tree of the server, which a command may write.
+
+        :raises ValueError: if it is outside of the working tree, no `.html` file, or an existing
+                            file that was not written by this server.
+        """
+        resolved = self.confining(path)
+        if resolved.suffix != '.html':
+            raise ValueError(f"{path} is no .html file")
+        if resolved.exists() and resolved not in self.written:
+            raise ValueError(f"{path} already exists, the server only writes new files")
+        return resolved
+
+    #--
+    def statusing(self) -> dict:
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started,
+            'requests': self.requests,
+            'selections': len(self.kpis),
+        }
+
+    #--
+    def validating(
+        self,
+        reports,
+        schema_file: Path,
+        cache: bool = True,
+        corpus: Path | None = None
+    ) -> dict:
+        from cr_analysis._module_validation import reports_validation
+
+        result = reports_validation(
+            reports=reports,
+            schema_file=schema_file,
+            jobs=self.jobs,
+            cache_file=self.cache_file(VALIDATION_CACHE_FILE, cache),
+            corpus=corpus,
+            index_file=self.cache_file(REPORT_INDEX_FILE, cache),
+            validator_cache_dir=self.cache_file(VALIDATOR_CACHE_DIR, cache)
+        )
+        return {'result': result.to_dict()}
+
+    #--
+    def linting(
+        self,
+        reports,
+        linter_config: Path,
+        cache: bool = True,
+        max_errors: int | None = None
+    ) -> dict:
+        from cr_analysis._module_linting import reports_linting
+
+        result = reports_linting(
+            reports=reports,
+            linter_config=linter_config,
+            jobs=self.jobs,
+            cache_file=self.cache_file(LINT_CACHE_FILE, cache),
+            max_errors=max_errors
+        )
+        return {'result': result.to_dict()}
+
+    #--
+    def analysing(
+        self,
+        reports,
+        year: int = current_year,
+        center: str = 'all',
+        role: str = 'lead',
+        cache: bool = True,
+        plot: bool = False,
+        destination: Path = Path("reports.html"),
+        width: int | None = None,
+        color_system: str | None = None
+    ) -> dict:
+        from cr_analysis._module_analysis import reports_analysis
+
+        kpis = self.kpi_result(reports, year=year, center=center, role=role, cache=cache)
+
+        def analysing_kpis():
+            reports_analysis(reports=reports, kpis=kpis)
+            if plot:
+                from cr_gui.ui_plot import plot_html_analysis
+
+                plot_html_analysis(destination=destination, kpis=kpis)
+                self.written.add(destination)
+
+        return {'output': capturing(analysing_kpis, width=width, color_system=color_system)}
+
+    #--
+    def plotting(
+        self,
+        reports,
+        destination: Path = Path("reports.html"),
+        year: int = current_year,
+        center: str = 'all',
+        role: str = 'lead',
+        cache: bool = True
+    ) -> dict:
+        from cr_gui.ui_plot import plot_html_analysis
+
+        kpis = self.kpi_result(reports, year=year, center=center, role=role, cache=cache)
+        output = capturing(lambda: plot_html_analysis(destination=destination, kpis=kpis))
+        self.written.add(destination)
+
+        return {'output': output}
+
+#--
+class RequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP: `GET /status` and `POST /<command>` with the parameters of the command"""
+
+    COMMANDS = {
+        'validate': 'validating',
+        'lint': 'linting',
+        'analysis': 'analysing',
+        'plot': 'plotting',
+    }
+
+    #--
+    def checking_host(self) -> bool:
+        """Whether the request names the server by `localhost` or a loopback address, refuses it otherwise.
+
+        A web page whose DNS name was rebound to 127.0.0.1 reaches the server, but still sends its own name.
+        """
+        try:
+            hostname = urlsplit(f"//{self.headers.get('Host', '')}").hostname
+        except ValueError:
+            hostname = None
+        if hostname is None or not is_loopback(hostname):
+            self.responding(403, {'error': "Only requests to localhost or a loopback address are accepted"})
+            return False
+        return True
+
+    #--
+    def do_GET(self):
+        if not self.checking_host():
+            return
+        if self.path.strip('/') != 'status':
+            self.responding(404, {'error': f"Unknown path {self.path}"})
+            return
+        self.responding(200, self.server.state.statusing())
+
+    #--
+    def do_POST(self):
+        if not self.checking_host():
+            return
+        command = self.COMMANDS.get(self.path.strip('/'))
+        if command is None:
+            self.responding(404, {'error': f"Unknown command {self.path}"})
+            return
+
+        #-- Browsers post forms cross-site without preflight, but no JSON
+        if self.headers.get_content_type() != 'application/json':
+            self.responding(415, {'error': "Only application/json is accepted"})
+            return
+
+        state = self.server.state
+        method = getattr(state, command)
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            parameters = json.loads(self.rfile.read(length) or b'{}')
+            unknown = set(parameters) - set(inspect.signature(method).parameters)
+            if unknown:
+                raise ValueError(f"unknown parameters {', '.join(sorted(unknown))}")
+            for name in PATH_PARAMETERS:
+                value = parameters.get(name)
+                if isinstance(value, list):
+                    parameters[name] = [state.confining(filename) for filename in value]
+                elif value is not None:
+                    parameters[name] = state.confining(value)
+            if parameters.get(DESTINATION_PARAMETER) is not None:
+                parameters[DESTINATION_PARAMETER] = state.confining_destination(parameters[DESTINATION_PARAMETER])
+            reports = parameters.pop('reports')
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            self.responding(400, {'error': f"Invalid request: {error}"})
+            return
+
+        state.requests += 1
+        try:
+            response = method(reports, **parameters)
+        except Exception as error:
+            traceback.print_exc()
+            self.responding(500, {'error': f"{type(error).__name__}: {error}"})
+            return
+
+        self.responding(200, response)
+
+    #--
+    def responding(self, code: int, content: dict) -> None:
+        body = json.dumps(content).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    #--
+    def address_string(self) -> str:
+        #-- Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'local'
+
+#--
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    """`HTTPServer` listening on a Unix socket"""
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def capturing(function, width: int | None = None, color_system: str | None = None) -> str:
+    """Output of `function`, rendered for the terminal of the client"""
+    buffer = io.StringIO()
+    rich.reconfigure(
+        file=buffer,
+        width=width,
+        color_system=color_system,
+        force_terminal=color_system is not None
+    )
+    try:
+        with redirect_stdout(buffer):
+            function()
+    finally:
+        rich.reconfigure()
+
+    return buffer.getvalue()
+
+#--
+def is_loopback(host: str) -> bool:
+    """Whether `host` is `localhost` or a loopback address"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+#--
+def serving(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_file: Path | None = None,
+    jobs: int = 1
+) -> None:
+    """Answer the requests of the CLI until interrupted, on `host:port` or on the Unix socket `socket_file`.
+
+    :raises ValueError: if `host` is no loopback address.
+    """
+    if socket_file is None and not is_loopback(host):
+        raise ValueError(f"Refusing to serve on {host}, the server reads and writes the files of its clients")
+
+    if socket_file is not None:
+        socket_file = Path(socket_file)
+        if socket_file.is_socket():
+            #-- Left over by a server that was killed
+            socket_file.unlink()
+        server = UnixHTTPServer(str(socket_file), RequestHandler)
+        address = f"unix:{socket_file}"
+    else:
+        server = HTTPServer((host, port), RequestHandler)
+        address = f"http://{host}:{server.server_port}"
+
+    server.state = WarmState(jobs=jobs)
+
+    #-- Stop as on Ctrl+C when terminated, e.g. to remove the socket file
+    def stopping(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stopping)
+
+    print(f"Serving on {address}, stop with Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_file is not None:
+            socket_file.unlink(missing_ok=True)
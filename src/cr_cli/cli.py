@@ -3,32 +3,135 @@
 #== IMPORTS ==#
 #=============#
 #-- Std. libraries
+from importlib.util import find_spec
 from pathlib import Path
+import time
 
 #-- External libraries
 import typer
 from typing_extensions import Annotated
 
 #-- Internal libraries
-from cr_analysis import reports_validation
-from cr_analysis import reports_linting
-from cr_analysis import reports_analysis
-from cr_analysis._constants import current_year
-
-try:
-    from cr_gui import create_html_report
-    from cr_gui import plot_html_analysis
-    GUI = True
-except ImportError:
-    GUI = False
+#-- The commands import their modules themselves, so that e.g. `lint` does not import pandas
+from cr_analysis._constants import (
+    current_year,
+    REPORT_CACHE_FILE,
+    REPORT_INDEX_FILE,
+    VALIDATION_CACHE_FILE,
+    VALIDATOR_CACHE_DIR,
+    LINT_CACHE_FILE
+)
+
+#-- The GUI commands are only available with the plotting dependencies, found without importing them
+GUI = find_spec("plotly") is not None
 
 #=====================#
 #== Program routine ==#
 #=====================#
 app = typer.Typer()
 
+#-- Option shared by the commands working on single reports
+ChangedSince = Annotated[
+    str | None,
+    typer.Option(help="Only check the reports added or modified since this git revision."),
+]
+
+def selecting_changed(reports: Path, changed_since: str | None):
+    """The reports changed since the git revision `changed_since`, or all `reports` without a revision"""
+    if changed_since is None:
+        return reports
+
+    from cr_analysis._git import changed_reports
+
+    try:
+        changed = changed_reports(reports, changed_since)
+    except ValueError as error:
+        print(error)
+        raise typer.Exit(code=1)
+
+    if not changed:
+        print(f"No reports changed since {changed_since}.")
+        raise typer.Exit(code=0)
+
+    return changed
+
+#-- Option of the commands that can be answered by `reporting serve`
+Server = Annotated[
+    str | None,
+    typer.Option(help="Let a `reporting serve` process do the work: http://HOST:PORT or unix:PATH."),
+]
+
+def requesting_server(server: str, command: str, parameters: dict) -> dict:
+    """Response of a `reporting serve` process, exits if it cannot be reached or fails"""
+    from cr_cli._client import requesting
+
+    try:
+        return requesting(server, command, parameters)
+    except ValueError as error:
+        print(error)
+        raise typer.Exit(code=1)
+
+#-- Option of the commands that re-run on changed reports
+Watch = Annotated[
+    bool,
+    typer.Option(help="Keep running and re-check the reports whenever they change (inotify or polling)."),
+]
+
+def watching(reports: Path, function) -> None:
+    """Call `function` with the changed, new or deleted report files until interrupted"""
+    from cr_analysis._watch import watching_reports
+
+    print(f"Watching {reports} for changes, stop with Ctrl+C")
+    try:
+        for changed in watching_reports(reports):
+            print(f"\n>>> {time.strftime('%H:%M:%S')} changed: {', '.join(filename.name for filename in changed)} <<<")
+            try:
+                function(changed)
+            except typer.Exit:
+                pass
+            except Exception as error:
+                #-- e.g. a report saved half-way, the next change is processed again
+                print(f"Could not process the changes: {error}")
+    except KeyboardInterrupt:
+        pass
+
+def absolute(path) -> str | list | None:
+    """Path(s) as sent to the server, which may run in another directory"""
+    if path is None:
+        return None
+    if isinstance(path, (list, tuple)):
+        return [str(Path(filename).resolve()) for filename in path]
+    return str(Path(path).resolve())
+
 #== Typer CLI methods ==#
 
+#-- Options of all commands --#
+@app.callback()
+def reporting(
+    ctx: typer.Context,
+    profile: Annotated[
+        bool,
+        typer.Option(help="Print the wall and CPU time of every stage, e.g. parsing, KPIs or figures."),
+    ] = False,
+    profile_dump: Annotated[
+        Path | None,
+        typer.Option(
+            file_okay=False,
+            help="Write a cProfile dump and a tracemalloc snapshot per stage into this directory, implies --profile.",
+        ),
+    ] = None,
+):
+    """ Lints, validates and analyses the consultation reports. """
+    if not profile and profile_dump is None:
+        return
+
+    from cr_analysis._profile import disabling_profiler, enabling_profiler
+    from cr_cli._rendering import printing_profile
+
+    enabling_profiler(dump_directory=profile_dump)
+    #-- Also called when the command exits with an error code
+    ctx.call_on_close(lambda: printing_profile(disabling_profiler()))
+
 #-- validate --#
 @app.command()
 def validate(
@@ -42,10 +145,62 @@ def validate(
         ),
     ] = Path("./reports/"),
     schema_reference_file: Path = Path("./templates/consultation-report.schema.json"),
+    jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+    cache: Annotated[bool, typer.Option(help="Reuse the results of unchanged reports from the on-disk cache.")] = True,
+    changed_since: ChangedSince = None,
+    server: Server = None,
+    watch: Watch = False,
 ):
     """Validates the overall consistency of the presented reports."""
-    #-- Run function validation_reports
-    reports_validation(reports=reports,schema_file=schema_reference_file)
+    from cr_cli._rendering import printing_validation, printing_validation_file
+
+    def validating(selected, corpus):
+        if server is not None:
+            from cr_analysis._results import ValidationResult
+
+            response = requesting_server(server, 'validate', {
+                'reports': absolute(selected),
+                'schema_file': absolute(schema_reference_file),
+                'cache': cache,
+                'corpus': absolute(corpus),
+            })
+            result = ValidationResult.from_dict(response['result'])
+            for file_result in result.files:
+                printing_validation_file(file_result)
+        else:
+            from cr_analysis._module_validation import reports_validation
+
+            #-- Run function validation_reports
+            result = reports_validation(
+                reports=selected,
+                schema_file=schema_reference_file,
+                jobs=jobs,
+                cache_file=VALIDATION_CACHE_FILE if cache else None,
+                corpus=corpus,
+                index_file=REPORT_INDEX_FILE if cache else None,
+                on_result=printing_validation_file,
+                validator_cache_dir=VALIDATOR_CACHE_DIR if cache else None
+            )
+        printing_validation(result)
+        return result
+
+    result = validating(
+        selecting_changed(reports, changed_since),
+        corpus=None if changed_since is None else reports
+    )
+
+    if watch:
+        #-- Only the changed reports are validated, against all reports via the sidecar index
+        def revalidating(changed):
+            existing = [filename for filename in changed if filename.exists()]
+            if existing:
+                validating(existing, corpus=reports if reports.is_dir() else None)
+
+        watching(reports, revalidating)
+        return 0
+
+    if not result.ok:
+        raise typer.Exit(code=1)
 
 #-- lint --#
 @app.command()
@@ -59,11 +214,100 @@ def lint(
             readable=True,
         ),
     ] = Path("reports/"),
-    linter_config: Path = Path(".yamllint.yml")
+    linter_config: Path = Path(".yamllint.yml"),
+    jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+    cache: Annotated[bool, typer.Option(help="Reuse the results of unchanged reports from the on-disk cache.")] = True,
+    changed_since: ChangedSince = None,
+    max_errors: Annotated[
+        int | None,
+        typer.Option(min=1, help="Stop after this number of linting errors."),
+    ] = None,
+    server: Server = None,
+    watch: Watch = False,
 ):
     """ Checks if the yaml files are linted correctly."""
-    reports_linting(reports=reports,linter_config=linter_config)
+    from cr_cli._rendering import printing_lint_file, printing_linting
+
+    def linting(selected):
+        if server is not None:
+            from cr_analysis._results import LintResult
+
+            response = requesting_server(server, 'lint', {
+                'reports': absolute(selected),
+                'linter_config': absolute(linter_config),
+                'cache': cache,
+                'max_errors': max_errors,
+            })
+            result = LintResult.from_dict(response['result'])
+            for file_result in result.files:
+                printing_lint_file(file_result)
+        else:
+            from cr_analysis._module_linting import reports_linting
 
+            result = reports_linting(
+                reports=selected,
+                linter_config=linter_config,
+                jobs=jobs,
+                cache_file=LINT_CACHE_FILE if cache else None,
+                max_errors=max_errors,
+                on_result=printing_lint_file
+            )
+        printing_linting(result, max_errors=max_errors)
+        return result
+
+    result = linting(selecting_changed(reports, changed_since))
+
+    if watch:
+        #-- Only the changed reports are linted
+        def relinting(changed):
+            existing = [filename for filename in changed if filename.exists()]
+            if existing:
+                linting(existing)
+
+        watching(reports, relinting)
+        return 0
+
+    if not result.ok:
+        raise typer.Exit(code=1)
+
+#-- check --#
+@app.command()
+def check(
+    reports: Annotated[
+        Path,
+        typer.Option(
+            exists=True,
+            file_okay=True,
+            dir_okay=True,
+            readable=True,
+        ),
+    ] = Path("reports/"),
+    schema_reference_file: Path = Path("./templates/consultation-report.schema.json"),
+    linter_config: Path = Path(".yamllint.yml"),
+    year: int = current_year,
+    center: str = 'all',
+    role: Annotated[str, typer.Option(help="Role of the center: lead (first consultant), any (consultant) or experts.")] = 'lead',
+    jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+):
+    """ Lints, validates and analyses the reports in a single pass."""
+    from cr_analysis._module_analysis import reports_analysis
+    from cr_analysis._module_check import reports_check
+    from cr_cli._rendering import printing_check
+
+    linting, validation, kpis = reports_check(
+        reports=reports,
+        schema_file=schema_reference_file,
+        linter_config=linter_config,
+        year=year,
+        center=center,
+        role=role,
+        jobs=jobs
+    )
+    printing_check(linting, validation)
+    reports_analysis(reports=reports, kpis=kpis)
+
+    if not (linting.ok and validation.ok):
+        raise typer.Exit(code=1)
 
 #-- analysis --#
 @app.command()
@@ -79,9 +323,198 @@ def analysis(
     ] = Path("reports/"),
     year: int = current_year,
     center: str = 'all',
+    role: Annotated[str, typer.Option(help="Role of the center: lead (first consultant), any (consultant) or experts.")] = 'lead',
+    cache: Annotated[bool, typer.Option(help="Reuse parsed reports and the report index from the on-disk cache.")] = True,
+    jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+    compact: Annotated[bool, typer.Option(help="Compact in-memory representation (categorical vocabularies).")] = False,
+    store: Annotated[
+        Path | None,
+        typer.Option(
+            exists=True,
+            file_okay=False,
+            dir_okay=True,
+            readable=True,
+            help="Columnar store (see build-store) used instead of the reports.",
+        ),
+    ] = None,
+    all_years: Annotated[bool, typer.Option(help="Batch mode: analyse all years instead of --year.")] = False,
+    all_centers: Annotated[bool, typer.Option(help="Batch mode: analyse all centers instead of --center.")] = False,
+    output: Annotated[
+        Path | None,
+        typer.Option(dir_okay=False, help="Batch mode: write the combined KPI table as CSV."),
+    ] = None,
+    plot: Annotated[bool, typer.Option(help="Also create the HTML plots, sharing the loaded data and KPIs.")] = False,
+    destination: Annotated[Path, typer.Option(dir_okay=False, help="HTML file for --plot.")] = Path("reports.html"),
+    chunk_size: Annotated[
+        int | None,
+        typer.Option(min=1, help="Stream the reports in chunks of this size with bounded memory."),
+    ] = None,
+    changed_since: Annotated[
+        str | None,
+        typer.Option(help="Only analyse the reports added or modified since this git revision."),
+    ] = None,
+    server: Server = None,
+    watch: Watch = False,
     ):
     """ Extract most import information for reporting. """
-    reports_analysis(reports=reports, year=year, center=center)
+    from cr_analysis._kpi import KPIResult, StreamingKPIResult
+    from cr_analysis._module_analysis import reports_analysis, reports_batch_analysis
+
+    if changed_since is not None and store is not None:
+        print("--changed-since works on the report files and cannot be combined with --store.")
+        raise typer.Exit(code=1)
+    if watch and (store is not None or all_years or all_centers or changed_since is not None):
+        print("--watch cannot be combined with --store, --all-years, --all-centers or --changed-since.")
+        raise typer.Exit(code=1)
+    reports = selecting_changed(reports, changed_since)
+
+    if server is not None:
+        if store is not None or all_years or all_centers or chunk_size is not None or compact:
+            print("--server cannot be combined with --store, --all-years, --all-centers, --chunk-size or --compact.")
+            raise typer.Exit(code=1)
+
+        import rich
+
+        def requesting_analysis(changed=()):
+            console = rich.get_console()
+            response = requesting_server(server, 'analysis', {
+                'reports': absolute(reports),
+                'year': year,
+                'center': center,
+                'role': role,
+                'cache': cache,
+                'plot': plot,
+                #-- The server refuses destinations it may not write, only name one when plotting
+                'destination': absolute(destination) if plot else None,
+                'width': console.width,
+                'color_system': console.color_system,
+            })
+            print(response['output'], end="")
+
+        requesting_analysis()
+        if watch:
+            #-- The server notices the changed reports itself
+            watching(reports, requesting_analysis)
+        return 0
+
+    if all_years or all_centers:
+        #-- Batch mode, loading the reports only once
+        reports_batch_analysis(
+            reports=reports,
+            years=None if all_years else [year],
+            centers=None if all_centers else [center],
+            role=role,
+            destination=output,
+            cache_file=REPORT_CACHE_FILE if cache else None,
+            jobs=jobs,
+            store=store,
+            compact=compact
+        )
+        return 0
+
+    if plot and not GUI:
+        print("The GUI dependencies are required for --plot: poetry install --with gui")
+        raise typer.Exit(code=1)
+
+    if watch:
+        from cr_analysis._state import IncrementalKPIState
+
+        #-- Only the shards of the changed reports are aggregated again
+        incremental = IncrementalKPIState(reports=reports, year=year, center=center, role=role, jobs=jobs)
+
+        def reanalysing(changed=()):
+            incremental.updating(changed)
+            kpis = StreamingKPIResult(reports=reports, year=year, center=center, role=role, state=incremental.state)
+            reports_analysis(reports=reports, kpis=kpis)
+            if plot:
+                from cr_gui.ui_plot import plot_html_analysis
+
+                plot_html_analysis(destination=destination, kpis=kpis)
+
+        reanalysing()
+        watching(reports, reanalysing)
+        return 0
+
+    if chunk_size is not None:
+        kpis = StreamingKPIResult(
+            reports=reports,
+            year=year,
+            center=center,
+            role=role,
+            jobs=jobs,
+            index_file=REPORT_INDEX_FILE if cache else None,
+            chunk_size=chunk_size
+        )
+    else:
+        kpis = KPIResult(
+            reports=reports,
+            year=year,
+            center=center,
+            role=role,
+            cache_file=REPORT_CACHE_FILE if cache else None,
+            jobs=jobs,
+            store=store,
+            index_file=REPORT_INDEX_FILE if cache else None,
+            compact=compact
+        )
+    reports_analysis(reports=reports, kpis=kpis)
+
+    if plot:
+        from cr_gui.ui_plot import plot_html_analysis
+
+        plot_html_analysis(destination=destination, kpis=kpis)
+
+    return 0
+
+#-- build-store --#
+@app.command("build-store")
+def build_store(
+    reports: Annotated[
+        Path,
+        typer.Option(
+            exists=True,
+            file_okay=True,
+            dir_okay=True,
+            readable=True,
+        ),
+    ] = Path("reports/"),
+    destination: Path = Path("reports.store"),
+    fmt: Annotated[str, typer.Option("--format", help="Table format: parquet|arrow")] = 'parquet',
+    cache: Annotated[bool, typer.Option(help="Reuse parsed reports from the on-disk cache.")] = True,
+    jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+):
+    """ Compiles the reports into a columnar store (Parquet or Arrow IPC). """
+    from cr_analysis._module_store import reports_store
+
+    reports_store(
+        reports=reports,
+        store=destination,
+        fmt=fmt,
+        cache_file=REPORT_CACHE_FILE if cache else None,
+        jobs=jobs
+    )
+
+    return 0
+
+#-- serve --#
+@app.command()
+def serve(
+    host: Annotated[str, typer.Option(help="Loopback address to listen on, e.g. 127.0.0.1 or ::1.")] = "127.0.0.1",
+    port: Annotated[int, typer.Option(help="TCP port to listen on, 0 picks a free port.")] = 8765,
+    socket: Annotated[
+        Path | None,
+        typer.Option(dir_okay=False, help="Listen on this Unix socket instead of a TCP port."),
+    ] = None,
+    jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+):
+    """ Keeps the reports, schema, linter configuration and KPIs warm for `--server` clients. """
+    from cr_cli._server import serving
+
+    try:
+        serving(host=host, port=port, socket_file=socket, jobs=jobs)
+    except ValueError as error:
+        print(error)
+        raise typer.Exit(code=1)
 
     return 0
 
@@ -94,6 +527,8 @@ if GUI:
         """
         Creates a report via a HTML interface 
         """
+        from cr_gui.utils import create_html_report
+
         create_html_report()
 
         return 0
@@ -120,13 +555,77 @@ if GUI:
         ] = Path("reports/"),
         year: int = current_year,
         center: str = 'all',
+        role: Annotated[str, typer.Option(help="Role of the center: lead (first consultant), any (consultant) or experts.")] = 'lead',
+        cache: Annotated[bool, typer.Option(help="Reuse parsed reports and the report index from the on-disk cache.")] = True,
+        jobs: Annotated[int, typer.Option(help="Number of worker processes, 0 uses all cores.")] = 1,
+        compact: Annotated[bool, typer.Option(help="Compact in-memory representation (categorical vocabularies).")] = False,
+        store: Annotated[
+            Path | None,
+            typer.Option(
+                exists=True,
+                file_okay=False,
+                dir_okay=True,
+                readable=True,
+                help="Columnar store (see build-store) used instead of the reports.",
+            ),
+        ] = None,
+        server: Server = None,
+        watch: Watch = False,
     ):
         """
         Creates a HTML with plots based on the CLI analysis output.
         """    
+        if watch and (store is not None or compact):
+            print("--watch cannot be combined with --store or --compact.")
+            raise typer.Exit(code=1)
+
+        if server is not None:
+            if store is not None or compact:
+                print("--server cannot be combined with --store or --compact.")
+                raise typer.Exit(code=1)
+
+            def requesting_plot(changed=()):
+                response = requesting_server(server, 'plot', {
+                    'reports': absolute(reports),
+                    'destination': absolute(destination),
+                    'year': year,
+                    'center': center,
+                    'role': role,
+                    'cache': cache,
+                })
+                print(response['output'], end="")
+
+            requesting_plot()
+            if watch:
+                watching(reports, requesting_plot)
+            return 0
+
+        from cr_gui.ui_plot import plot_html_analysis
+
+        if watch:
+            from cr_analysis._kpi import StreamingKPIResult
+            from cr_analysis._state import IncrementalKPIState
+
+            incremental = IncrementalKPIState(reports=reports, year=year, center=center, role=role, jobs=jobs)
+
+            def replotting(changed=()):
+                incremental.updating(changed)
+                kpis = StreamingKPIResult(reports=reports, year=year, center=center, role=role, state=incremental.state)
+                plot_html_analysis(destination=destination, kpis=kpis)
+
+            replotting()
+            watching(reports, replotting)
+            return 0
+
         plot_html_analysis(
             destination=destination,
             reports=reports,
             year=year,
-            center=center
+            center=center,
+            cache_file=REPORT_CACHE_FILE if cache else None,
+            jobs=jobs,
+            store=store,
+            index_file=REPORT_INDEX_FILE if cache else None,
+            role=role,
+            compact=compact
         )
@@ -1,6 +1,23 @@
+from importlib import import_module as _import_module
 from typing import Tuple as _Tuple
-from .utils import create_html_report
-from .ui_plot import plot_html_analysis
+
+#-- Imported on first access, so that the plotting libraries are only loaded when plotting
+_SYMBOL_MODULES = {
+    'create_html_report': '.utils',
+    'plot_html_analysis': '.ui_plot',
+}
+
+def __getattr__(name: str):
+    if name not in _SYMBOL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(_import_module(_SYMBOL_MODULES[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_SYMBOL_MODULES))
 
 #: specifying importable symbols
 __all__: _Tuple[str, ...] = (
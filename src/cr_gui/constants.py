@@ -1,23 +1,7 @@
-consultant_centers = [
-    "AWI, Alfred-Wegener-Institut, Bremerhaven",
-    "CISPA, Helmholtz-Zentrum für Informationssicherheit, Saarbrücken",
-    "DESY, Deutsches Elektronen-Synchrotron, Hamburg",
-    "DKFZ, Deutsches Krebsforschungszentrum, Heidelberg",
-    "DLR, Deutsches Zentrum für Luft- und Raumfahrt, Köln",
-    "DZNE, Deutsches Zentrum für Neurodegenerative Erkrankungen e. V., Bonn",
-    "FZJ, Forschungszentrum Jülich, Jülich",
-    "GEOMAR, Helmholtz-Zentrum für Ozeanforschung Kiel, Kiel",
-    "GFZ, Helmholtz-Zentrum Potsdam, Potsdam",
-    "GSI, Helmholtzzentrum für Schwerionenforschung, Darmstadt",
-    "Hereon, Helmholtz-Zentrum Hereon, Geesthacht",
-    "HMGU, Helmholtz-Zentrum München, Neuherberg bei München",
-    "HZB, Helmholtz-Zentrum Berlin",
-    "HZDR, Helmholtz-Zentrum Dresden-Rossendorf",
-    "HZI, Helmholtz-Zentrum für Infektionsforschung, Braunschweig",
-    "KIT, Karlsruher Institut für Technologie, Karlsruhe",
-    "MDC, Max-Delbrück-Centrum, Berlin-Buch",
-    "UFZ, Helmholtz-Zentrum für Umweltforschung, Leipzig",
-]
+from typing import Tuple as _Tuple
+
+#-- Re-exported for the GUI, the centers are defined next to their abbreviations used by the analysis
+from cr_analysis._constants import consultant_centers
 
 consultation_roles = ["Technical domain", "Tool", "Scientific domain", "Organisation"]
 
@@ -48,3 +32,11 @@ available_communication_platforms = [
     "Telefon",
     "Zoom",
 ]
+
+#: specifying importable symbols
+__all__: _Tuple[str, ...] = (
+    'available_communication_platforms',
+    'consultant_centers',
+    'consultation_roles',
+    'consulting_types',
+)
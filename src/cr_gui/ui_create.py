@@ -8,6 +8,7 @@ from streamlit_tags import st_tags
 import yaml
 
 #-- Internal modules libraries
+from cr_analysis._consistency import checking_new_report
 from cr_gui.constants import (
     consultant_centers,
     consultation_roles,
@@ -320,8 +321,13 @@ def main():
 
     if st.button("Submit"):
         report_file = Path(f"./reports/{filename}")
+        #-- Duplicated ticket numbers, links or project names and mismatching filenames
+        problems = checking_new_report(data, report_file, corpus=Path("./reports"))
         if report_file.exists():
             st.toast(f"{str(report_file)} already existent! Please check!")
+        elif problems:
+            for problem in problems:
+                st.error(problem)
         else:
             st.write("Report submitted!")
             st.write(data)  # Display the collected data
@@ -7,6 +7,13 @@ The generated report is saved as an HTML file with the specified `destination` p
 Args:
     destination (Path, optional): The destination path for the generated HTML report. Defaults to 'reports.html'
     reports (Path, optional): The directory containing YAML files with the necessary data to generate the report. Defaults to 'reports/'
+    cache_file (Path, optional): On-disk cache of parsed reports. Defaults to None, i.e. no caching
+    jobs (int, optional): Number of processes parsing the reports. Defaults to 1
+    store (Path, optional): Columnar store (see `reporting build-store`) used instead of `reports`. Defaults to None
+    index_file (Path, optional): Sidecar index used to skip reports not matching year and center. Defaults to None
+    role (str, optional): Role of the center in a report: lead (first consultant), any (consultant) or experts. Defaults to 'lead'
+    compact (bool, optional): Intern strings and use categorical vocabularies to save memory. Defaults to False
+    kpis (KPIResult, optional): Already (partially) computed KPIs, e.g. shared with the CLI analysis. Defaults to None
 
 Note:
     - Ensure that the specified `reports_dir` exists and contains YAML files with the necessary data.
@@ -20,14 +27,8 @@ import plotly.express as px
 import plotly.offline as pyo
 
 #: Internal modules, libraries
-from cr_analysis._utils import (
-    loading_data,
-    counting_affiliations,
-    counting_occurrence,
-    counting_main_types,
-    workload_distribution,
-    tickets_per_month
-)
+from cr_analysis._kpi import KPIResult
+from cr_analysis._profile import profiled
 from cr_analysis._constants import current_year
 
 #------------------#
@@ -38,23 +39,60 @@ def plot_html_analysis(
     destination: Path = Path('reports.html'),
     reports: Path = Path('reports/'),
     year: int = current_year,
-    center: str = 'all'
+    center: str = 'all',
+    cache_file: Path | None = None,
+    jobs: int = 1,
+    store: Path | None = None,
+    index_file: Path | None = None,
+    role: str = 'lead',
+    compact: bool = False,
+    kpis: KPIResult | None = None
 ) -> None:
     """Creates the plotly output for HTML"""
     #---- Program routine ----------------------------#
-    df = loading_data(reports=reports, year=year, center=center)
+    if kpis is None:
+        kpis = KPIResult(
+            reports=reports,
+            year=year,
+            center=center,
+            role=role,
+            cache_file=cache_file,
+            jobs=jobs,
+            store=store,
+            index_file=index_file,
+            compact=compact
+        )
+    year = kpis.year
+    center = kpis.center
+
+    tickets = kpis.tickets
+    workload_mean=round(kpis.workload_mean,2)
+    workload_median=round(kpis.workload_median,2)
+
+    plot_divs = plotting_figures(kpis)
+    writing_html(
+        destination,
+        plot_divs,
+        year=year,
+        center=center,
+        tickets=tickets,
+        workload_mean=workload_mean,
+        workload_median=workload_median
+    )
 
-    tickets = len(df)
-    workload_mean=round(df['final_workload'].mean(),2)
-    workload_median=round(df['final_workload'].median(),2)
+#--
+@profiled("figures")
+def plotting_figures(kpis: KPIResult) -> tuple:
+    """Plotly divs of the seven plots, the KPIs are computed on first use"""
+    year = kpis.year
+    center = kpis.center
 
     if center == 'all':
 
         #== PLOT 1: Affiliation counts of consultants ==#
         myinput = "consultants"
 
-        data = counting_affiliations(
-                dataframe=df,
+        data = kpis.affiliations(
                 column=myinput,
                 output='relative'
             )
@@ -78,8 +116,7 @@ def plot_html_analysis(
         #== PLOT 2: Affiliation counts of experts ==#
         myinput = "experts"
 
-        data = counting_affiliations(
-                dataframe=df,
+        data = kpis.affiliations(
                 column=myinput,
                 output='relative'
         )
@@ -108,8 +145,7 @@ def plot_html_analysis(
         myinput1 = "consultants"
         myinput2 = "experts"
 
-        data = counting_affiliations(
-                dataframe=df,
+        data = kpis.affiliations(
                 column=myinput1,
                 add=myinput2,
                 output='relative'
@@ -141,8 +177,7 @@ def plot_html_analysis(
         plot3_div = ""
 
     #== PLOT 4: Request Types ==#
-    data = counting_occurrence(
-            dataframe=df,
+    data = kpis.occurrence(
             column="request_types",
             output='relative'
         )
@@ -168,8 +203,7 @@ def plot_html_analysis(
     )
 
     #== PLOT 5: Main Request Types ==#
-    data = counting_main_types(
-            dataframe=df,
+    data = kpis.main_types(
             output='relative'
     )
     #-- DataFrame with two columns 'index' and 'count'
@@ -193,7 +227,7 @@ def plot_html_analysis(
     )
 
     #== PLOT 6: Average workload ==#
-    data = workload_distribution(df=df)
+    data = kpis.workload
 
     plot6 = px.pie(
         data,
@@ -213,7 +247,7 @@ def plot_html_analysis(
     )
 
     #== PLOT 7: Ticket request distribution per month ==#
-    plot7 = px.bar(tickets_per_month(dataframe=df))
+    plot7 = px.bar(kpis.months)
 
     plot7.update_layout(
         title="",
@@ -229,6 +263,21 @@ def plot_html_analysis(
         include_plotlyjs=False
     )
 
+    return plot1_div, plot2_div, plot3_div, plot4_div, plot5_div, plot6_div, plot7_div
+
+#--
+@profiled("html")
+def writing_html(
+    destination: Path,
+    plot_divs: tuple,
+    year: int,
+    center: str,
+    tickets: int,
+    workload_mean: float,
+    workload_median: float
+) -> None:
+    """Write the HTML report with the plots of `plotting_figures`"""
+    plot1_div, plot2_div, plot3_div, plot4_div, plot5_div, plot6_div, plot7_div = plot_divs
 
     #== Create the HTML output ==#
     html_report = f"""
@@ -0,0 +1,58 @@
+"""Fixtures shared by the tests"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from pathlib import Path
+import shutil
+
+#: External modules, libraries
+import pytest
+
+#: Internal modules, libraries
+from cr_analysis._cache import SHARED_CACHES
+
+#===============#
+#== CONSTANTS ==#
+#===============#
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_REPORTS = ROOT / "reports"
+SCHEMA_FILE = ROOT / "templates" / "consultation-report.schema.json"
+LINTER_CONFIG = ROOT / ".yamllint.yml"
+
+#-- Sample report copied under the ticket number of the original, see `reports`
+DUPLICATED_REPORT = "56083_BlairWitchProject.yml"
+
+#==============#
+#== FIXTURES ==#
+#==============#
+
+#--
+@pytest.fixture
+def reports(tmp_path) -> Path:
+    """Copy of the sample reports plus a follow-up report reusing the ticket number of another one.
+
+    The follow-up differs in the affiliations and tags, so a mix-up of the two reports changes the KPIs.
+    """
+    directory = tmp_path / "reports"
+    shutil.copytree(SAMPLE_REPORTS, directory)
+
+    content = (directory / DUPLICATED_REPORT).read_text(encoding="utf-8")
+    content = (
+        content
+        .replace("Acme Corp., Germany", "HZDR")
+        .replace("Advent Corp., Worcestershire", "HZB")
+        .replace("  - MongoDB\n", "  - Rust\n")
+    )
+    (directory / "56083_BlairWitchProjectFollowUp.yml").write_text(content, encoding="utf-8")
+
+    return directory
+
+#--
+@pytest.fixture(autouse=True)
+def clearing_shared_caches():
+    """Every test starts without the caches of the previous ones in memory, as a new process would"""
+    SHARED_CACHES.clear()
+    yield
+    SHARED_CACHES.clear()
@@ -0,0 +1,120 @@
+"""Cached parse and check results are stored as data only and reused only while nothing changed"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+import datetime
+import json
+
+#: External modules, libraries
+import pytest
+
+#: Internal modules, libraries
+from cr_analysis import _validator
+from cr_analysis._cache import SHARED_CACHES, ResultCache, decoding_value, encoding_value
+from cr_analysis._module_linting import reports_linting
+from cr_analysis._module_validation import reports_validation
+from cr_analysis._results import Diagnostic
+
+from conftest import LINTER_CONFIG, SCHEMA_FILE
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def validating(reports, cache_file, schema_file=SCHEMA_FILE) -> tuple:
+    """Validation result and the result cache of a run in a new process"""
+    SHARED_CACHES.clear()
+    result = reports_validation(reports=reports, schema_file=schema_file, cache_file=cache_file, index_file=None)
+    cache, = (cache for cache in SHARED_CACHES.values() if isinstance(cache, ResultCache))
+    return result, cache
+
+#===========#
+#== TESTS ==#
+#===========#
+
+#--
+def test_values_survive_the_json_cache():
+    value = {
+        'start_date': datetime.date(2021, 7, 1),
+        'sent': datetime.datetime(2021, 7, 1, 12, 30),
+        2021: ('tuple', None, 1.5),
+        'tagged': {'__date__': 'not a date'},
+        'diagnostics': [Diagnostic("message", rule='schema', line=3, schema_path=('tags', 0), context=(("sub", ("a",)),))],
+    }
+
+    assert json.loads(json.dumps(encoding_value(value)), object_hook=decoding_value) == value
+
+#--
+def test_unsupported_values_are_not_cached():
+    with pytest.raises(TypeError):
+        encoding_value({'binary': b"\x00"})
+
+#--
+def test_validation_results_are_reused(reports, tmp_path):
+    cache_file = tmp_path / "validation.json"
+
+    first, cache = validating(reports, cache_file)
+    assert cache.misses == len(first.files)
+
+    second, cache = validating(reports, cache_file)
+    assert (cache.hits, cache.misses) == (len(first.files), 0)
+    assert second.to_dict() == first.to_dict()
+
+    #-- Plain JSON, nothing is unpickled
+    assert json.loads(cache_file.read_text(encoding="utf-8"))['entries']
+
+#--
+def test_broken_cache_is_rebuilt(reports, tmp_path):
+    cache_file = tmp_path / "validation.json"
+    cache_file.write_bytes(b"\x80\x04not json")
+
+    result, cache = validating(reports, cache_file)
+
+    assert cache.misses == len(result.files)
+    assert json.loads(cache_file.read_text(encoding="utf-8"))['entries']
+
+#--
+def test_schema_change_invalidates_validation_results(reports, tmp_path):
+    cache_file = tmp_path / "validation.json"
+    validating(reports, cache_file)
+
+    schema = json.loads(SCHEMA_FILE.read_text(encoding="utf-8"))
+    schema['properties']['funding'] = {'type': 'string'}
+    schema['required'].append('funding')
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps(schema), encoding="utf-8")
+
+    result, cache = validating(reports, cache_file, schema_file=schema_file)
+
+    assert (cache.hits, cache.misses) == (0, len(result.files))
+    assert all(
+        any("'funding' is a required property" in diagnostic.message for diagnostic in file_result.diagnostics)
+        for file_result in result.files
+    )
+
+#--
+def test_validator_change_invalidates_validation_results(reports, tmp_path, monkeypatch):
+    pytest.importorskip("fastjsonschema")
+    cache_file = tmp_path / "validation.json"
+    first, _ = validating(reports, cache_file)
+
+    monkeypatch.setattr(_validator, "fastjsonschema", None)
+    second, cache = validating(reports, cache_file)
+
+    assert (cache.hits, cache.misses) == (0, len(second.files))
+    assert second.to_dict() == first.to_dict()
+
+#--
+def test_lint_results_are_reused(reports, tmp_path):
+    cache_file = tmp_path / "lint.json"
+
+    first = reports_linting(reports=reports, linter_config=LINTER_CONFIG, cache_file=cache_file)
+    SHARED_CACHES.clear()
+    second = reports_linting(reports=reports, linter_config=LINTER_CONFIG, cache_file=cache_file)
+    cache, = SHARED_CACHES.values()
+
+    assert (cache.hits, cache.misses) == (len(first.files), 0)
+    assert second.to_dict() == first.to_dict()
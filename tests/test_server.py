@@ -0,0 +1,145 @@
+"""`reporting serve` only answers local clients and only touches the files of its working tree"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: Std. libraries
+from http.client import HTTPConnection
+from http.server import HTTPServer
+import json
+import shutil
+import threading
+
+#: External modules, libraries
+import pytest
+
+#: Internal modules, libraries
+from cr_cli._server import RequestHandler, WarmState, is_loopback, serving
+
+from conftest import LINTER_CONFIG
+
+#==============#
+#== FIXTURES ==#
+#==============#
+
+#--
+@pytest.fixture
+def server(reports):
+    """Address of a server whose working tree holds the `reports` and the linter configuration"""
+    root = reports.parent
+    shutil.copy(LINTER_CONFIG, root / LINTER_CONFIG.name)
+
+    httpd = HTTPServer(("127.0.0.1", 0), RequestHandler)
+    httpd.state = WarmState(root=root)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def posting(server, command: str, parameters: dict, headers: dict | None = None) -> tuple:
+    """Status and content of the response to a command"""
+    connection = HTTPConnection(*server, timeout=60)
+    try:
+        connection.request(
+            'POST',
+            f"/{command}",
+            body=json.dumps(parameters).encode('utf-8'),
+            headers={'Content-Type': 'application/json', **(headers or {})}
+        )
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+#===========#
+#== TESTS ==#
+#===========#
+
+#--
+def test_paths_are_confined_to_the_working_tree(tmp_path):
+    root = tmp_path / "tree"
+    (root / "reports").mkdir(parents=True)
+    (root / "escape").symlink_to(tmp_path)
+    state = WarmState(root=root)
+
+    assert state.confining("reports") == root / "reports"
+    for path in ("..", "../secret.yml", str(tmp_path / "secret.yml"), "escape/secret.yml"):
+        with pytest.raises(ValueError):
+            state.confining(path)
+
+#--
+def test_destination_is_a_new_html_file(tmp_path):
+    (tmp_path / "existing.html").touch()
+    state = WarmState(root=tmp_path)
+
+    assert state.confining_destination("new.html") == tmp_path / "new.html"
+    for path in ("existing.html", "reports.yml", "../new.html"):
+        with pytest.raises(ValueError):
+            state.confining_destination(path)
+
+    #-- Plots of the server itself may be written again
+    state.written.add(tmp_path / "existing.html")
+    assert state.confining_destination("existing.html") == tmp_path / "existing.html"
+
+#--
+def test_lint_request(server, reports):
+    status, content = posting(server, 'lint', {'reports': str(reports), 'linter_config': LINTER_CONFIG.name})
+
+    assert status == 200
+    assert len(content['result']['files']) == len(list(reports.glob("*.yml")))
+
+#--
+@pytest.mark.parametrize("parameters", [
+    {'reports': "..", 'linter_config': LINTER_CONFIG.name},
+    {'reports': "reports", 'linter_config': str(LINTER_CONFIG)},
+    {'reports': "reports", 'linter_config': LINTER_CONFIG.name, 'cache_file': "/tmp/cache.json"},
+])
+def test_request_outside_of_the_working_tree_is_refused(server, parameters):
+    status, content = posting(server, 'lint', parameters)
+
+    assert status == 400
+    assert 'error' in content
+
+#--
+def test_plot_destination_must_be_new(server, reports):
+    (reports.parent / "existing.html").touch()
+
+    for destination in ("existing.html", "plot.txt"):
+        status, _ = posting(server, 'plot', {'reports': "reports", 'destination': destination})
+        assert status == 400
+
+    assert (reports.parent / "existing.html").stat().st_size == 0
+    assert not (reports.parent / "plot.txt").exists()
+
+#--
+def test_foreign_host_is_refused(server, reports):
+    parameters = {'reports': "reports", 'linter_config': LINTER_CONFIG.name}
+
+    status, _ = posting(server, 'lint', parameters, headers={'Host': f"attacker.example:{server[1]}"})
+    assert status == 403
+
+    for host in ("localhost", f"127.0.0.1:{server[1]}", f"[::1]:{server[1]}"):
+        status, _ = posting(server, 'lint', parameters, headers={'Host': host})
+        assert status == 200
+
+#--
+def test_form_posts_are_refused(server):
+    status, _ = posting(server, 'lint', {'reports': "reports"}, headers={'Content-Type': 'text/plain'})
+
+    assert status == 415
+
+#--
+def test_loopback_addresses():
+    assert all(map(is_loopback, ("localhost", "127.0.0.1", "127.0.0.2", "::1")))
+    assert not any(map(is_loopback, ("0.0.0.0", "::", "192.168.1.1", "example.org", "")))
+
+#--
+def test_serving_refuses_public_addresses():
+    with pytest.raises(ValueError):
+        serving(host="0.0.0.0", port=0)
@@ -0,0 +1,66 @@
+"""The columnar store answers the same KPIs as the YAML reports it was built from"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: External modules, libraries
+import pytest
+
+pytest.importorskip("pyarrow")
+
+#: Internal modules, libraries
+from cr_analysis._kpi import KPIResult
+from cr_analysis._store import writing_store
+from cr_analysis._utils import loading_yaml_to_dataframe
+
+#===============#
+#== FUNCTIONS ==#
+#===============#
+
+#--
+def summarizing(kpis: KPIResult) -> dict:
+    """The KPIs shown by `reporting analysis` and `reporting plot`, comparable with `==`"""
+    return {
+        'tickets': kpis.tickets,
+        'affiliations': kpis.affiliations('consultants', add='experts', output='absolute').sort_index().to_dict(),
+        'clients': kpis.affiliations('clients', output='absolute').sort_index().to_dict(),
+        'roles': kpis.occurrence('used_consultation_roles', output='absolute').sort_index().to_dict(),
+        'tags': kpis.occurrence('tags', output='absolute').sort_index().to_dict(),
+        'types': kpis.main_types(output='absolute').sort_index().to_dict(),
+        'months': kpis.months.to_dict(),
+        'workload': kpis.workload.to_dict(),
+    }
+
+#===========#
+#== TESTS ==#
+#===========#
+
+#--
+@pytest.mark.parametrize("year, center", [
+    (None, 'all'),
+    (2020, 'all'),
+    (2021, 'all'),
+    (None, 'HZDR'),
+    (2020, 'HZDR'),
+])
+def test_store_matches_reports_with_duplicated_ticket(reports, tmp_path, year, center):
+    store = tmp_path / "reports.store"
+    writing_store(loading_yaml_to_dataframe(reports), store)
+
+    expected = summarizing(KPIResult(reports=reports, year=year, center=center))
+    stored = summarizing(KPIResult(reports=reports, year=year, center=center, store=store))
+
+    assert expected['tickets'] > 0
+    assert stored == expected
+
+#--
+def test_duplicated_ticket_keeps_its_own_affiliations(reports, tmp_path):
+    store = tmp_path / "reports.store"
+    writing_store(loading_yaml_to_dataframe(reports), store)
+
+    kpis = KPIResult(reports=reports, year=2020, center='HZDR', store=store)
+
+    assert kpis.tickets == 1
+    assert kpis.affiliations('clients', output='absolute').to_dict() == {'HZB': 1}
+    assert 'Rust' in kpis.occurrence('tags', output='absolute')
+    assert 'MongoDB' not in kpis.occurrence('tags', output='absolute')
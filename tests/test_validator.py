@@ -0,0 +1,52 @@
+"""The compiled schema validator is only cached where asked to and only run if it is unchanged"""
+#=============#
+#== IMPORTS ==#
+#=============#
+
+#: External modules, libraries
+import pytest
+
+fastjsonschema = pytest.importorskip("fastjsonschema")
+
+#: Internal modules, libraries
+from cr_analysis._validator import compiling_schema
+
+from conftest import SCHEMA_FILE
+
+#===========#
+#== TESTS ==#
+#===========#
+
+#--
+def test_compiled_validator_is_cached(tmp_path):
+    schema_text = SCHEMA_FILE.read_text(encoding="utf-8")
+
+    compiling_schema(schema_text, cache_dir=tmp_path)
+    stored, = tmp_path.glob("*.py")
+    compiling_schema(schema_text, cache_dir=tmp_path)
+
+    assert list(tmp_path.glob("*.py")) == [stored]
+
+#--
+def test_nothing_is_written_without_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    assert compiling_schema(SCHEMA_FILE.read_text(encoding="utf-8")) is not None
+    assert not any(tmp_path.iterdir())
+
+#--
+def test_tampered_validator_is_not_run(tmp_path):
+    schema_text = SCHEMA_FILE.read_text(encoding="utf-8")
+    compiling_schema(schema_text, cache_dir=tmp_path)
+    stored, = tmp_path.glob("*.py")
+    original = stored.read_text(encoding="utf-8")
+
+    marker = tmp_path / "executed"
+    stored.write_text(f"open({str(marker)!r}, 'w').close()\n" + original, encoding="utf-8")
+
+    validate = compiling_schema(schema_text, cache_dir=tmp_path)
+
+    assert not marker.exists()
+    assert stored.read_text(encoding="utf-8") == original
+    with pytest.raises(fastjsonschema.JsonSchemaException):
+        validate({})